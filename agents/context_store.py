@@ -0,0 +1,161 @@
+# agents/context_store.py
+"""
+Bounded, inspectable context for the agents, replacing CrewAI's memory=True.
+
+Each agent has a ContextStore of short notes from earlier calls (e.g. "headline →
+topics" from the tagger). A prompt carries only the notes most relevant to it (keyword
+overlap, newest first among equals) within a fixed token budget, so prompt size stays
+flat over long runs. A note that gets selected counts as freshly used. Once the store
+exceeds its own budget, the least recently used notes are evicted. snapshot() shows
+what is stored and exactly what the last call carried.
+"""
+import re
+import threading
+from typing import Dict, FrozenSet, List, Optional
+
+from config.settings import AGENT_CONTEXT_ENABLED, AGENT_CONTEXT_TOKENS, AGENT_CONTEXT_STORE_TOKENS
+from pipeline.tokens import estimate_tokens
+
+_WORD_RE = re.compile(r"[a-z0-9]{4,}")
+_STOPWORDS = frozenset("that this with from have were will been their which about after also into over than said".split())
+_HEADER = "Notes from your earlier work (for consistency; do not repeat them in your answer):"
+
+
+def _keywords(text: str) -> FrozenSet[str]:
+    return frozenset(word for word in _WORD_RE.findall(text.lower()) if word not in _STOPWORDS)
+
+
+class ContextEntry:
+    __slots__ = ("text", "tokens", "keywords", "added", "last_used", "uses")
+
+    def __init__(self, text: str, sequence: int):
+        self.text = text
+        self.tokens = estimate_tokens(text)
+        self.keywords = _keywords(text)
+        self.added = sequence
+        self.last_used = sequence
+        self.uses = 0
+
+
+class ContextStore:
+    """
+    One agent's notes. Thread-safe.
+
+    Args:
+        agent_name: Agent identifier (e.g. "tagger")
+        call_tokens: Most note tokens added to one prompt
+        max_tokens: Most note tokens kept in the store
+    """
+
+    def __init__(self, agent_name: str, call_tokens: int = AGENT_CONTEXT_TOKENS, max_tokens: int = AGENT_CONTEXT_STORE_TOKENS):
+        self.agent_name = agent_name
+        self.call_tokens = call_tokens
+        self.max_tokens = max_tokens
+        self._entries: Dict[str, ContextEntry] = {} # Text -> entry, so repeated notes are stored once
+        self._tokens = 0
+        self._sequence = 0
+        self._lock = threading.Lock()
+        self.evicted = 0
+        self.last_call: Dict = {"task": None, "tokens": 0, "notes": []}
+
+    def add(self, notes: List[str]):
+        """Stores notes from a finished call, evicting the least recently used beyond max_tokens."""
+        with self._lock:
+            for text in notes:
+                text = " ".join(text.split())
+                if not text:
+                    continue
+                self._sequence += 1
+                entry = self._entries.get(text)
+                if entry is not None:
+                    entry.last_used = self._sequence
+                    continue
+                entry = ContextEntry(text, self._sequence)
+                self._entries[text] = entry
+                self._tokens += entry.tokens
+            if self._tokens > self.max_tokens:
+                for entry in sorted(self._entries.values(), key=lambda e: e.last_used):
+                    if self._tokens <= self.max_tokens:
+                        break
+                    del self._entries[entry.text]
+                    self._tokens -= entry.tokens
+                    self.evicted += 1
+
+    def select(self, query: str, task: Optional[str] = None) -> List[str]:
+        """
+        Picks the notes sharing the most keywords with `query` (newest first among equals)
+        until call_tokens is reached. Notes with no overlap are never sent.
+        """
+        query_keywords = _keywords(query)
+        with self._lock:
+            scored = []
+            for entry in self._entries.values():
+                overlap = len(entry.keywords & query_keywords)
+                if overlap:
+                    scored.append((overlap / len(entry.keywords), entry.last_used, entry))
+            scored.sort(key=lambda item: (item[0], item[1]), reverse=True)
+            selected, used = [], estimate_tokens(_HEADER)
+            for _, _, entry in scored:
+                if used + entry.tokens > self.call_tokens:
+                    continue
+                selected.append(entry)
+                used += entry.tokens
+            self._sequence += 1
+            for entry in selected:
+                entry.last_used = self._sequence
+                entry.uses += 1
+            notes = [entry.text for entry in selected]
+            self.last_call = {"task": task, "tokens": used if notes else 0, "notes": notes}
+        return notes
+
+    def with_context(self, prompt: str, task: Optional[str] = None) -> str:
+        """`prompt` preceded by its relevant notes, or unchanged when none apply."""
+        notes = self.select(prompt, task)
+        if not notes:
+            return prompt
+        return _HEADER + "\n" + "\n".join(f"- {note}" for note in notes) + "\n\n" + prompt
+
+    def snapshot(self) -> Dict:
+        """Stored notes (most recently used first), token totals and what the last call carried."""
+        with self._lock:
+            entries = sorted(self._entries.values(), key=lambda e: e.last_used, reverse=True)
+            return {
+                "agent": self.agent_name,
+                "stored_tokens": self._tokens,
+                "max_tokens": self.max_tokens,
+                "call_tokens": self.call_tokens,
+                "evicted": self.evicted,
+                "last_call": dict(self.last_call),
+                "entries": [{"text": e.text, "tokens": e.tokens, "uses": e.uses} for e in entries],
+            }
+
+
+_stores: Dict[str, ContextStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_context_store(agent_name: str) -> Optional[ContextStore]:
+    """The process-wide store for an agent, or None when agent context is disabled."""
+    if not AGENT_CONTEXT_ENABLED or AGENT_CONTEXT_TOKENS <= 0:
+        return None
+    with _stores_lock:
+        if agent_name not in _stores:
+            _stores[agent_name] = ContextStore(agent_name)
+        return _stores[agent_name]
+
+
+def context_snapshot() -> Dict[str, Dict]:
+    """snapshot() of every agent store used so far."""
+    with _stores_lock:
+        stores = dict(_stores)
+    return {name: store.snapshot() for name, store in stores.items()}
+
+
+def context_report() -> str:
+    lines = []
+    for name, snapshot in context_snapshot().items():
+        lines.append(
+            f"{name:<12} {len(snapshot['entries']):>4} notes, {snapshot['stored_tokens']}/{snapshot['max_tokens']} tokens stored, "
+            f"{snapshot['evicted']} evicted, last call carried {snapshot['last_call']['tokens']} tokens"
+        )
+    return "\n".join(lines) or "No agent context used."
@@ -1,18 +1,16 @@
 # agents/linker_agent.py
 from crewai import Agent
-from langchain_anthropic import ChatAnthropic
-from config.settings import ANTHROPIC_API_KEY, LLM_MODEL_NAME, LLM_TEMPERATURE
+from config.settings import ANTHROPIC_API_KEY, LLM_MODEL_NAME
+from agents.llm import build_llm
+from agents.router import model_for
+from tools.archive_tools import related_articles_tool
 
 class LinkerAgents:
-    def __init__(self):
-        # Initialize the LLM with Claude settings from config
+    def __init__(self, tier=None):
+        # Initialize the LLM with Claude settings from config (shared response cache)
         if ANTHROPIC_API_KEY is None or LLM_MODEL_NAME is None:
             raise ValueError("ANTHROPIC_API_KEY or LLM_MODEL_NAME not set for LinkerAgent.")
-        self.llm = ChatAnthropic(
-            model=LLM_MODEL_NAME,
-            temperature=LLM_TEMPERATURE,
-            api_key=ANTHROPIC_API_KEY
-        )
+        self.llm = build_llm("linker", model=model_for("linker", tier=tier)) # Routed tier unless `tier` ("fast"/"strong") is given
 
     def linker_agent(self):
         return Agent(
@@ -25,10 +23,10 @@ class LinkerAgents:
                 "how various events contribute to a broader understanding of UPSC General Studies topics. "
                 "You provide valuable insights into the multi-dimensional nature of current affairs."
             ),
-            tools=[], # Linking is an internal LLM task based on provided summaries/articles
+            tools=[related_articles_tool], # Nearest past articles from the local archive; linking itself is done by the LLM
             llm=self.llm,
             verbose=True,
             allow_delegation=False, # This agent performs its own linking analysis
             max_iter=3,
-            memory=True
+            memory=False # Past articles reach the linker through the archive (See_Also), not agent memory
         )
\ No newline at end of file
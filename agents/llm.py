@@ -0,0 +1,278 @@
+# agents/llm.py
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Generator, Optional, Sequence, Tuple
+from uuid import UUID
+
+import anthropic
+from langchain_anthropic import ChatAnthropic
+from langchain_core.caches import BaseCache
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.load import dumps, loads
+from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.outputs import Generation
+
+from config.settings import (
+    ANTHROPIC_API_KEY,
+    LLM_MODEL_NAME,
+    LLM_TEMPERATURE,
+    LLM_MAX_OUTPUT_TOKENS,
+    CACHE_DIR,
+    LLM_CACHE_ENABLED,
+    LLM_CACHE_TTL_SECONDS,
+    LLM_CACHE_MAX_ENTRIES,
+    LLM_MAX_RETRIES,
+)
+from tools.cache import DiskCache, make_cache_key
+from pipeline.tokens import estimate_tokens, response_usage, token_ledger
+from tools.rate_limit import get_limiter, limited_call, limited_stream
+from tools.tracing import tracer
+
+# One store for every agent; per-agent caches only namespace the statistics
+_llm_store: Optional[DiskCache] = None
+_agent_caches: Dict[str, "AgentLLMCache"] = {}
+_llm_factory: Optional[Callable[[str], Any]] = None
+
+
+def get_llm_store() -> DiskCache:
+    """Returns the on-disk store shared by all agent LLM caches."""
+    global _llm_store
+    if _llm_store is None:
+        _llm_store = DiskCache(
+            os.path.join(CACHE_DIR, "llm.sqlite3"),
+            ttl_seconds=LLM_CACHE_TTL_SECONDS,
+            max_entries=LLM_CACHE_MAX_ENTRIES,
+        )
+    return _llm_store
+
+
+class AgentLLMCache(BaseCache):
+    """
+    LangChain cache that stores LLM generations in the shared on-disk store.
+
+    The key combines LangChain's `llm_string` (model, temperature and other call
+    parameters) with the serialized prompt, which already contains the agent's
+    system prompt/backstory, so identical calls from any run are answered locally.
+    Works with any LangChain chat model, e.g. FakeListChatModel(cache=AgentLLMCache("tagger")).
+    """
+
+    def __init__(self, agent_name: str, store: Optional[DiskCache] = None):
+        self.agent_name = agent_name
+        self.store = store if store is not None else get_llm_store() # An empty DiskCache is falsy
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[Sequence[Generation]]:
+        cached = self.store.get(make_cache_key("llm", llm_string, prompt))
+        tracer.count("upsc_llm_cache_lookups_total", agent=self.agent_name, result="miss" if cached is None else "hit")
+        if cached is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return [loads(generation) for generation in cached]
+
+    def update(self, prompt: str, llm_string: str, return_val: Sequence[Generation]) -> None:
+        self.store.set(make_cache_key("llm", llm_string, prompt), [dumps(generation) for generation in return_val])
+
+    def clear(self, **kwargs: Any) -> None:
+        self.store.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hits / lookups if lookups else 0.0}
+
+
+class TracingCallbackHandler(BaseCallbackHandler):
+    """
+    Records every LLM call of an agent as an "llm.call" span with its latency and
+    token usage. Works for CrewAI's executor as well as complete(), since both go
+    through the chat model's callbacks. Cache hits never reach the model and are
+    counted by AgentLLMCache instead.
+    """
+
+    def __init__(self, agent_name: str):
+        self.agent_name = agent_name
+        self._started: Dict[UUID, float] = {}
+        self._lock = threading.Lock()
+
+    def on_chat_model_start(self, serialized, messages, *, run_id: UUID, **kwargs: Any) -> None:
+        with self._lock:
+            self._started[run_id] = time.perf_counter()
+
+    def on_llm_end(self, response, *, run_id: UUID, **kwargs: Any) -> None:
+        with self._lock:
+            started = self._started.pop(run_id, None)
+        if started is None:
+            return
+        attributes = {"agent": self.agent_name}
+        generations = [generation for batch in response.generations for generation in batch]
+        usage = response_usage(generations[0].message) if generations and hasattr(generations[0], "message") else None
+        if usage:
+            attributes.update(input_tokens=usage["input_tokens"], output_tokens=usage["output_tokens"])
+        tracer.record("llm.call", time.perf_counter() - started, **attributes)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        with self._lock:
+            started = self._started.pop(run_id, None)
+        if started is not None:
+            tracer.record("llm.call", time.perf_counter() - started, agent=self.agent_name, failed=True)
+
+
+class RateLimitedChatMixin:
+    """
+    Sends a LangChain chat model's provider calls through the shared per-provider
+    AdaptiveLimiter, so every agent draws from one request budget. Cache hits are
+    answered before _generate() and never consume it.
+    """
+
+    rate_limit_provider = "anthropic"
+    retryable_errors = (anthropic.APIConnectionError, anthropic.InternalServerError)
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        generate = super(RateLimitedChatMixin, self)._generate
+        return limited_call(
+            get_limiter(self.rate_limit_provider),
+            lambda: generate(messages, stop=stop, run_manager=run_manager, **kwargs),
+            LLM_MAX_RETRIES,
+            retryable=self.retryable_errors,
+        )
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        stream = super(RateLimitedChatMixin, self)._stream
+        return limited_stream(
+            get_limiter(self.rate_limit_provider),
+            lambda: stream(messages, stop=stop, run_manager=run_manager, **kwargs),
+            LLM_MAX_RETRIES,
+            retryable=self.retryable_errors,
+        )
+
+
+class RateLimitedChatAnthropic(RateLimitedChatMixin, ChatAnthropic):
+    """ChatAnthropic whose 429s and retries are handled by the shared limiter instead of the SDK."""
+
+
+def get_agent_cache(agent_name: str) -> AgentLLMCache:
+    """Returns the (process-wide) LLM cache for the named agent."""
+    if agent_name not in _agent_caches:
+        _agent_caches[agent_name] = AgentLLMCache(agent_name)
+    return _agent_caches[agent_name]
+
+
+def llm_cache_stats() -> Dict[str, dict]:
+    """Returns LLM cache hit/miss counters and hit rate for every agent that has made calls."""
+    return {name: cache.stats() for name, cache in _agent_caches.items()}
+
+
+def set_llm_factory(factory: Optional[Callable[[str, str], Any]]):
+    """
+    Makes build_llm() return `factory(agent_name, model)` instead of a ChatAnthropic client,
+    e.g. to run the pipeline offline against benchmarks.fake_llm. Pass None to restore.
+    """
+    global _llm_factory
+    _llm_factory = factory
+
+
+def build_llm(agent_name: str, model: str = LLM_MODEL_NAME) -> ChatAnthropic:
+    """
+    Creates the Claude client for an agent, wired to the shared response cache.
+
+    Args:
+        agent_name: Short agent identifier used to report cache statistics (e.g. "tagger")
+        model: Anthropic model name (see agents.router.model_for for the per-agent tier)
+
+    Returns:
+        Configured ChatAnthropic instance (or the set_llm_factory() stand-in)
+    """
+    if _llm_factory is not None:
+        llm = _llm_factory(agent_name, model)
+    else:
+        llm = RateLimitedChatAnthropic(
+            model=model,
+            temperature=LLM_TEMPERATURE,
+            max_tokens=LLM_MAX_OUTPUT_TOKENS,
+            api_key=ANTHROPIC_API_KEY,
+            cache=get_agent_cache(agent_name) if LLM_CACHE_ENABLED else False,
+            max_retries=0, # Retries go through the limiter, which honours Retry-After for every agent
+        )
+    if tracer.enabled:
+        llm.callbacks = [*(llm.callbacks or []), TracingCallbackHandler(agent_name)]
+    return llm
+
+
+def agent_system_prompt(agent) -> str:
+    """Renders a CrewAI agent's persona the way CrewAI's role-playing prompt does."""
+    return f"You are {agent.role}. {agent.backstory}\nYour personal goal is: {agent.goal}"
+
+
+def complete_with_usage(llm, agent, prompt: str, task: str = "adhoc", context=None) -> Tuple[str, Dict[str, int]]:
+    """
+    Like complete(), but also returns the call's {'input_tokens', 'output_tokens'}
+    (estimated when the model does not report usage). With a `context` store
+    (agents.context_store) the prompt is preceded by its relevant notes.
+    """
+    system_prompt = agent_system_prompt(agent)
+    if context is not None:
+        prompt = context.with_context(prompt, task)
+    with tracer.span("llm.complete", task=task) as span:
+        if context is not None:
+            span.set(context_tokens=context.last_call["tokens"])
+        response = llm.invoke([SystemMessage(content=system_prompt), HumanMessage(content=prompt)])
+    return response.content, _record_usage(task, response, system_prompt, prompt, response.content)
+
+
+def _record_usage(task: str, response, system_prompt: str, prompt: str, text: str) -> Dict[str, int]:
+    """Books a call's reported token usage, or an estimate when the model gives none."""
+    usage = response_usage(response) if response is not None else None
+    if usage:
+        token_ledger.record(task, usage["input_tokens"], usage["output_tokens"])
+    else:
+        usage = {"input_tokens": estimate_tokens(system_prompt) + estimate_tokens(prompt), "output_tokens": estimate_tokens(text)}
+        token_ledger.record(task, usage["input_tokens"], usage["output_tokens"], estimated=True)
+    return usage
+
+
+def _chunk_text(chunk) -> str:
+    """Text of a streamed message chunk (Anthropic chunks may carry a list of content blocks)."""
+    if isinstance(chunk.content, str):
+        return chunk.content
+    return "".join(block.get("text", "") for block in chunk.content if isinstance(block, dict) and block.get("type") == "text")
+
+
+def stream_with_usage(llm, agent, prompt: str, task: str = "adhoc", context=None) -> Generator[str, None, Dict[str, int]]:
+    """
+    Like complete_with_usage(), but yields the response text piece by piece as the model
+    produces it. The generator's return value (`usage = yield from ...`) is the token usage.
+    Streamed calls bypass the LLM response cache.
+    """
+    system_prompt = agent_system_prompt(agent)
+    if context is not None:
+        prompt = context.with_context(prompt, task)
+    response, parts = None, []
+    with tracer.span("llm.stream", task=task) as span:
+        if context is not None:
+            span.set(context_tokens=context.last_call["tokens"])
+        for chunk in llm.stream([SystemMessage(content=system_prompt), HumanMessage(content=prompt)]):
+            response = chunk if response is None else response + chunk
+            text = _chunk_text(chunk)
+            if text:
+                parts.append(text)
+                yield text
+    return _record_usage(task, response, system_prompt, prompt, "".join(parts))
+
+
+def complete(llm, agent, prompt: str, task: str = "adhoc") -> str:
+    """
+    Runs a single prompt against an agent's LLM without the CrewAI executor loop.
+    Meant for tool-free agents (tagger, summarizer, linker) where one call suffices.
+
+    Args:
+        llm: LangChain chat model, usually the agent factory's `llm`
+        agent: CrewAI Agent whose role, goal and backstory form the system prompt
+        prompt: Task prompt
+        task: Name the call's tokens are accounted under (e.g. "tag")
+
+    Returns:
+        The model's text response
+    """
+    return complete_with_usage(llm, agent, prompt, task)[0]
@@ -1,17 +1,13 @@
 # agents/news_fetcher_agent.py
 from crewai import Agent
-from langchain_anthropic import ChatAnthropic
-from config.settings import ANTHROPIC_API_KEY, LLM_MODEL_NAME, LLM_TEMPERATURE
-from tools.search_tools import upsc_news_search_tool # Updated import
+from agents.llm import build_llm
+from agents.router import model_for
+from tools.search_tools import upsc_news_search_tool, upsc_news_feed_tool, upsc_planned_search_tool
 
 class NewsFetcherAgents:
-    def __init__(self):
-        # Initialize the LLM with Claude settings from config
-        self.llm = ChatAnthropic(
-            model=LLM_MODEL_NAME,
-            temperature=LLM_TEMPERATURE,
-            api_key=ANTHROPIC_API_KEY
-        )
+    def __init__(self, tier=None):
+        # Initialize the LLM with Claude settings from config (shared response cache)
+        self.llm = build_llm("fetcher", model=model_for("fetcher", tier=tier)) # Routed tier unless `tier` ("fast"/"strong") is given
 
     def news_fetcher_agent(self):
         return Agent(
@@ -25,10 +21,10 @@ class NewsFetcherAgents:
                 "You focus on topics like governance, economy, environment, science & technology, "
                 "international relations, history, geography, and social issues that are crucial for UPSC preparation."
             ),
-            tools=[upsc_news_search_tool], # Use the CrewAI-compatible tool
+            tools=[upsc_news_feed_tool, upsc_planned_search_tool, upsc_news_search_tool], # Feeds first (no Serper requests), then the budgeted syllabus searches
             llm=self.llm,
             verbose=True,
             allow_delegation=False,
             max_iter=3, # Limit iterations to prevent infinite loops
-            memory=True # Enable memory for better context retention
+            memory=False # Each search task is self-contained; nothing needs to carry over between calls
         )
\ No newline at end of file
@@ -0,0 +1,193 @@
+# agents/router.py
+"""
+Model tiering: each agent or task is routed to the fast (Haiku) or strong (Sonnet)
+model via LLM_ROUTES. Work done on the fast tier is validated item by item, and only
+the items it got wrong (invalid output, missing fields, low reported confidence) are
+redone by the strong model. Latency, tokens and cost are recorded per route.
+"""
+import threading
+import time
+from collections import defaultdict
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from agents.context_store import get_context_store
+from agents.llm import build_llm, complete_with_usage, stream_with_usage
+from config.settings import (
+    LLM_MODEL_NAME,
+    LLM_FAST_MODEL_NAME,
+    LLM_ROUTES,
+    ROUTER_ENABLED,
+    MODEL_PRICES,
+)
+
+FAST, STRONG = "fast", "strong"
+MODEL_TIERS = {FAST: LLM_FAST_MODEL_NAME, STRONG: LLM_MODEL_NAME}
+
+
+def route_tier(agent_name: str, task: Optional[str] = None) -> str:
+    """The tier for a task (if routed) or else its agent; unrouted work goes to the strong model."""
+    if not ROUTER_ENABLED:
+        return STRONG
+    tier = LLM_ROUTES.get(task) if task else None
+    tier = tier or LLM_ROUTES.get(agent_name, STRONG)
+    return tier if tier in MODEL_TIERS else STRONG
+
+
+def model_for(agent_name: str, task: Optional[str] = None, tier: Optional[str] = None) -> str:
+    """Model name for an agent/task, or for an explicit `tier`."""
+    return MODEL_TIERS[tier or route_tier(agent_name, task)]
+
+
+def call_cost(model: str, input_tokens: int, output_tokens: int) -> float:
+    """USD cost of one call from MODEL_PRICES (0 for unpriced models)."""
+    input_price, output_price = MODEL_PRICES.get(model, (0.0, 0.0))
+    return (input_tokens * input_price + output_tokens * output_price) / 1_000_000
+
+
+class ModelRouter:
+    """
+    Sends prompts to the routed tier and escalates rejected items. Thread-safe;
+    one LLM client is built per (agent, tier) and reused.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._llms: Dict[Tuple[str, str], object] = {}
+        self._stats: Dict[Tuple[str, str], Dict] = defaultdict(
+            lambda: {"calls": 0, "failures": 0, "items": 0, "escalated_items": 0, "input_tokens": 0, "output_tokens": 0, "cost": 0.0, "latencies": []}
+        )
+
+    def llm(self, agent_name: str, tier: str):
+        key = (agent_name, tier)
+        with self._lock:
+            if key not in self._llms:
+                self._llms[key] = build_llm(agent_name, model=MODEL_TIERS[tier])
+            return self._llms[key]
+
+    def complete(self, agent_name: str, agent, prompt: str, task: str, tier: Optional[str] = None, items: int = 1) -> str:
+        """
+        Runs one prompt on the routed (or given) tier and records its latency, tokens and cost.
+
+        Args:
+            agent_name: Agent identifier used for routing (e.g. "tagger")
+            agent: CrewAI Agent providing the system prompt
+            prompt: Task prompt
+            task: Task name for routing and token accounting (e.g. "tag")
+            tier: FAST or STRONG to override the route
+            items: Number of articles the prompt covers, for per-item figures
+        """
+        tier = tier or route_tier(agent_name, task)
+        stats_key = (task, tier)
+        start = time.perf_counter()
+        try:
+            text, usage = complete_with_usage(self.llm(agent_name, tier), agent, prompt, task=task, context=get_context_store(agent_name))
+        except Exception:
+            with self._lock:
+                self._stats[stats_key]["failures"] += 1
+            raise
+        self._record(stats_key, items, usage, time.perf_counter() - start)
+        return text
+
+    def stream(self, agent_name: str, agent, prompt: str, task: str, tier: Optional[str] = None, items: int = 1) -> Iterator[str]:
+        """
+        Like complete(), but yields the response text as the model streams it. The call
+        is recorded once the stream is exhausted; there is no per-item escalation.
+        """
+        tier = tier or route_tier(agent_name, task)
+        stats_key = (task, tier)
+        start = time.perf_counter()
+        try:
+            usage = yield from stream_with_usage(self.llm(agent_name, tier), agent, prompt, task=task, context=get_context_store(agent_name))
+        except Exception:
+            with self._lock:
+                self._stats[stats_key]["failures"] += 1
+            raise
+        self._record(stats_key, items, usage, time.perf_counter() - start)
+
+    def _record(self, stats_key: Tuple[str, str], items: int, usage: Dict[str, int], latency: float):
+        with self._lock:
+            stats = self._stats[stats_key]
+            stats["calls"] += 1
+            stats["items"] += items
+            stats["input_tokens"] += usage["input_tokens"]
+            stats["output_tokens"] += usage["output_tokens"]
+            stats["cost"] += call_cost(MODEL_TIERS[stats_key[1]], usage["input_tokens"], usage["output_tokens"])
+            stats["latencies"].append(latency)
+
+    def run_items(
+        self,
+        agent_name: str,
+        agent,
+        task: str,
+        items: List[Dict],
+        make_prompt: Callable[[List[Dict]], str],
+        parse: Callable[[List[Dict], str], List[Dict]],
+        accept: Callable[[Dict], bool],
+        note: Optional[Callable[[Dict], str]] = None,
+    ) -> List[Dict]:
+        """
+        Processes `items` with one prompt on the routed tier. When that is the fast tier,
+        items whose output fails `accept` (or all of them, if the call failed) are sent
+        again, together, to the strong model.
+
+        Args:
+            make_prompt: Builds the prompt for a list of items
+            parse: Turns a response into one output per item, aligned with the items
+                (None for an item the response has no output for)
+            accept: Whether an item's fast-tier output is good enough to keep; items
+                without an output are always rejected
+            note: Renders an accepted output as a note for the agent's context store
+
+        Returns:
+            One output dict per item, in input order
+        """
+        tier = route_tier(agent_name, task)
+        try:
+            outputs = parse(items, self.complete(agent_name, agent, make_prompt(items), task, tier, len(items)))
+        except Exception:
+            if tier == STRONG:
+                raise
+            outputs = [{} for _ in items]
+        rejected = [i for i, output in enumerate(outputs) if output is None or not accept(output)] if tier == FAST else []
+        if rejected:
+            retry = [items[i] for i in rejected]
+            with self._lock:
+                self._stats[(task, FAST)]["escalated_items"] += len(rejected)
+            strong_outputs = parse(retry, self.complete(agent_name, agent, make_prompt(retry), task, STRONG, len(retry)))
+            for i, output in zip(rejected, strong_outputs):
+                outputs[i] = output
+        context = get_context_store(agent_name)
+        if note is not None and context is not None:
+            context.add([note(output) for output in outputs if output is not None and accept(output)])
+        return outputs
+
+    def stats(self) -> Dict[str, Dict]:
+        """Per route ("task@tier"): calls, items, escalations, tokens, cost and latency percentiles."""
+        with self._lock:
+            snapshot = {key: dict(stats, latencies=sorted(stats["latencies"])) for key, stats in self._stats.items()}
+        report = {}
+        for (task, tier), stats in sorted(snapshot.items()):
+            latencies = stats.pop("latencies")
+            stats["model"] = MODEL_TIERS[tier]
+            stats["cost"] = round(stats["cost"], 6)
+            stats["p50_s"] = round(latencies[len(latencies) // 2], 3) if latencies else 0.0
+            stats["p95_s"] = round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 3) if latencies else 0.0
+            report[f"{task}@{tier}"] = stats
+        return report
+
+    def report(self) -> str:
+        lines = []
+        total = 0.0
+        for route, stats in self.stats().items():
+            total += stats["cost"]
+            escalated = f", {stats['escalated_items']} escalated" if stats["escalated_items"] else ""
+            lines.append(
+                f"{route:<18} {stats['calls']:>4} calls, {stats['items']:>5} items{escalated}, "
+                f"p50 {stats['p50_s']:.2f}s, p95 {stats['p95_s']:.2f}s, ${stats['cost']:.4f}"
+            )
+        lines.append(f"{'total':<18} ${total:.4f}")
+        return "\n".join(lines)
+
+
+# Process-wide router shared by the pipelines
+model_router = ModelRouter()
@@ -1,16 +1,13 @@
 # agents/summarizer_agent.py
 from crewai import Agent
-from langchain_anthropic import ChatAnthropic
-from config.settings import ANTHROPIC_API_KEY, LLM_MODEL_NAME, LLM_TEMPERATURE, UPSC_GS_TOPICS
+from config.settings import UPSC_GS_TOPICS
+from agents.llm import build_llm
+from agents.router import model_for
 
 class SummarizerAgents:
-    def __init__(self):
-        # Initialize the LLM with Claude settings from config
-        self.llm = ChatAnthropic(
-            model=LLM_MODEL_NAME,
-            temperature=LLM_TEMPERATURE,
-            api_key=ANTHROPIC_API_KEY
-        )
+    def __init__(self, tier=None):
+        # Initialize the LLM with Claude settings from config (shared response cache)
+        self.llm = build_llm("summarizer", model=model_for("summarizer", tier=tier)) # Routed tier unless `tier` ("fast"/"strong") is given
 
     def summarizer_agent(self):
         return Agent(
@@ -28,5 +25,5 @@ class SummarizerAgents:
             verbose=True,
             allow_delegation=False,
             max_iter=3,
-            memory=True
+            memory=False # Context is carried explicitly by agents.context_store, within a token budget
         )
\ No newline at end of file
@@ -1,15 +1,13 @@
 # agents/tagger_agent.py
 from crewai import Agent
-from langchain_anthropic import ChatAnthropic
-from config.settings import ANTHROPIC_API_KEY, LLM_MODEL_NAME, LLM_TEMPERATURE, UPSC_GS_TOPICS
+from config.settings import COMPACT_TOPIC_CODES
+from agents.llm import build_llm
+from agents.router import model_for
+from knowledge.topic_codes import legend_prompt
 
 class TaggerAgents:
-    def __init__(self):
-        self.llm = ChatAnthropic(
-            model=LLM_MODEL_NAME,
-            temperature=LLM_TEMPERATURE,
-            api_key=ANTHROPIC_API_KEY
-        )
+    def __init__(self, tier=None):
+        self.llm = build_llm("tagger", model=model_for("tagger", tier=tier)) # Routed tier unless `tier` ("fast"/"strong") is given
 
     def upsc_tagger_agent(self):
         return Agent(
@@ -21,6 +19,8 @@ class TaggerAgents:
                 "of the predefined UPSC General Studies topics to it. You are meticulous "
                 "and ensure that every classification is highly relevant and comprehensive. "
                 "You understand the nuances of each GS topic and how current events relate to them."
+                # The legend lives in the system prompt so task prompts can refer to topics by code
+                + (legend_prompt() if COMPACT_TOPIC_CODES else "")
             ),
             # This agent doesn't need external tools; its "tool" is its internal knowledge of UPSC topics
             tools=[],
@@ -28,7 +28,7 @@ class TaggerAgents:
             verbose=True,
             allow_delegation=False, # This agent performs its own classification
             max_iter=3,
-            memory=True
+            memory=False # Context is carried explicitly by agents.context_store, within a token budget
         )
 
 # We won't add an additional agent here unless we need another type of tagger.
\ No newline at end of file
@@ -0,0 +1,112 @@
+# benchmarks/bench_archive.py
+"""
+Builds a synthetic multi-year archive in pipeline.archive_index and times typical
+queries: ranked full text, phrases, topic/source/date filters, and the same with
+facet counts. Article text follows a Zipf word distribution (like real news), with a
+few syllabus phrases mixed in. Usage:
+python -m benchmarks.bench_archive --articles 100000 --years 3
+"""
+import argparse
+import itertools
+import os
+import random
+import sys
+import tempfile
+import time
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+SOURCES = ["The Hindu", "The Indian Express", "Press Information Bureau (PIB)", "Business Standard", "The Economic Times"]
+PHRASES = ["panchayati raj", "gram sabha", "repo rate", "tiger reserve", "monsoon session", "fiscal deficit", "supreme court", "green hydrogen"]
+
+
+class ZipfText:
+    """Random text over a synthetic vocabulary with Zipf-distributed word frequencies."""
+
+    def __init__(self, rng: random.Random, vocabulary: int = 30000, exponent: float = 1.1):
+        letters = "abcdefghijklmnopqrstuvwxyz"
+        self.rng = rng
+        self.words = ["".join(rng.choice(letters) for _ in range(rng.randint(4, 9))) for _ in range(vocabulary)]
+        self.cum_weights = list(itertools.accumulate(1 / (rank ** exponent) for rank in range(1, vocabulary + 1)))
+
+    def words_of(self, n: int) -> str:
+        words = self.rng.choices(self.words, cum_weights=self.cum_weights, k=n)
+        if self.rng.random() < 0.05:
+            words.insert(self.rng.randrange(len(words) + 1), self.rng.choice(PHRASES))
+        return " ".join(words)
+
+
+def percentile(values, q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))] if values else 0.0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark archive search")
+    parser.add_argument("--articles", type=int, default=100000)
+    parser.add_argument("--years", type=float, default=3.0)
+    parser.add_argument("--body-words", type=int, default=300)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    path = os.path.join(tempfile.mkdtemp(prefix="upsc-archive-"), "archive_index.sqlite3")
+    from config.settings import UPSC_GS_TOPICS
+    from knowledge.topic_codes import short_topic_name
+    from pipeline.archive_index import ArchiveIndex, days_ago
+
+    rng = random.Random(args.seed)
+    text = ZipfText(rng)
+    index = ArchiveIndex(path)
+    now = time.time()
+    start = time.perf_counter()
+    batch = []
+    for i in range(args.articles):
+        published = now - rng.random() * args.years * 365 * 86400
+        batch.append({
+            "Title": text.words_of(10).title(),
+            "URL": f"https://news.example/{i}",
+            "Source": rng.choice(SOURCES),
+            "Date": time.strftime("%b %d, %Y", time.localtime(published)),
+            "Summary": text.words_of(60),
+            "Body": text.words_of(args.body_words),
+            "UPSC_Topics": [short_topic_name(rng.choice(UPSC_GS_TOPICS))],
+        })
+        if len(batch) == 2000:
+            index.add(batch)
+            batch = []
+    index.add(batch)
+    index.optimize()
+    build = time.perf_counter() - start
+    size_mb = sum(os.path.getsize(os.path.join(os.path.dirname(path), f)) for f in os.listdir(os.path.dirname(path))) / 1e6
+
+    # Query words from below the stop-word-like head of the vocabulary, as users would type them
+    def word():
+        return text.words[rng.randrange(100, 5000)]
+
+    scenarios = {
+        "one word": lambda: dict(query=word()),
+        "two words": lambda: dict(query=f"{word()} {word()}"),
+        "phrase": lambda: dict(query=f'"{rng.choice(PHRASES)}"'),
+        "word + topic + 90 days": lambda: dict(query=word(), topics=[rng.choice(["polity", "economy", "environment"])], since=days_ago(90)),
+        "topic + source, newest": lambda: dict(topics=[rng.choice(["polity", "security"])], sources=[rng.choice(SOURCES)]),
+        "phrase + facets": lambda: dict(query=f'"{rng.choice(PHRASES)}"', facets=True),
+    }
+    print(f"Indexed {len(index)} articles over {args.years:g} years in {build:.1f}s ({size_mb:.0f} MB)")
+    for name, make in scenarios.items():
+        latencies, totals = [], []
+        for _ in range(args.queries):
+            results = index.search(**make())
+            latencies.append(results.elapsed_ms)
+            totals.append(results.total)
+        print(
+            f"{name:<24} p50 {percentile(latencies, 0.5):7.2f} ms  p95 {percentile(latencies, 0.95):7.2f} ms"
+            f"  median matches {percentile(totals, 0.5)}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+# benchmarks/bench_extract.py
+"""
+Exercises tools.article_extractor against a local HTML server: a cold pass that
+downloads and parses every page, then a revalidation pass that should be answered
+with 304s. Checks the per-site connection cap and that boilerplate is stripped.
+Serves synthetic article pages, or the *.html files of --html-dir. Usage:
+python -m benchmarks.bench_extract --pages 200 --latency 0.05
+"""
+import argparse
+import glob
+import os
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from collections import defaultdict
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+STORY_MARKER = "The ministry said the programme"
+BOILERPLATE_MARKER = "Subscribe to our newsletter"
+
+
+def synthetic_page(i: int) -> str:
+    """An article page wrapped in the navigation, scripts and footer real news sites carry."""
+    paragraphs = "".join(
+        f"<p>{STORY_MARKER} {i} would reach {j * 7 + i} districts in phase {j}, with the Centre bearing most of the cost.</p>"
+        for j in range(1, 9)
+    )
+    return (
+        f"<html><head><title>Story {i}</title><script>window.ads = '<p>{BOILERPLATE_MARKER}</p>';</script></head><body>"
+        f"<header><p>{BOILERPLATE_MARKER} and get the morning briefing every day.</p></header>"
+        "<nav><a href='/'>Home</a> <a href='/india'>India</a></nav>"
+        f"<article><h1>Story {i}</h1><p>By Staff Reporter</p>{paragraphs}</article>"
+        f"<aside><p>{BOILERPLATE_MARKER}: trending stories you may have missed this week.</p></aside>"
+        "<footer><p>Copyright 2026. All rights reserved by the publisher and its licensors.</p></footer>"
+        "</body></html>"
+    )
+
+
+class PageHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    pages = {} # path -> HTML
+    latency = 0.05
+    lock = threading.Lock()
+    active = defaultdict(int) # Host header -> requests in flight
+    peak = defaultdict(int)
+    statuses = defaultdict(int)
+
+    def do_GET(self):
+        host = self.headers.get("Host", "")
+        # Count requests while they are being "processed"; once the response is written the
+        # client may already reuse the connection before this thread gets to decrement
+        with self.lock:
+            self.active[host] += 1
+            self.peak[host] = max(self.peak[host], self.active[host])
+        time.sleep(self.latency)
+        with self.lock:
+            self.active[host] -= 1
+        html = self.pages.get(self.path)
+        if html is None:
+            self._respond(404, b"")
+            return
+        body = html.encode("utf-8")
+        etag = f'"{zlib.crc32(body):08x}"'
+        if self.headers.get("If-None-Match") == etag:
+            self._respond(304, b"", etag)
+            return
+        self._respond(200, body, etag)
+
+    def _respond(self, status: int, body: bytes, etag: str = None):
+        with self.lock:
+            self.statuses[status] += 1
+        self.send_response(status)
+        if etag:
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", formatdate(0, usegmt=True))
+        if status == 200:
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark article body extraction")
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds of simulated server latency")
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--per-host", type=int, default=2)
+    parser.add_argument("--processes", type=int, default=2)
+    parser.add_argument("--html-dir", help="Serve these *.html fixtures instead of synthetic pages")
+    args = parser.parse_args(argv)
+
+    # Settings are read at import time: isolate the body cache and always revalidate on the second pass
+    os.environ["UPSC_CACHE_DIR"] = tempfile.mkdtemp(prefix="upsc-extract-")
+    os.environ["EXTRACT_FRESH_SECONDS"] = "0"
+    from tools.article_extractor import ArticleExtractor
+
+    if args.html_dir:
+        files = sorted(glob.glob(os.path.join(args.html_dir, "*.html")))
+        pages = {}
+        for i, path in enumerate(files):
+            with open(path, encoding="utf-8", errors="replace") as f:
+                pages[f"/article/{i}"] = f.read()
+    else:
+        pages = {f"/article/{i}": synthetic_page(i) for i in range(args.pages)}
+    handler = type("ConfiguredPageHandler", (PageHandler,), {"pages": pages, "latency": args.latency})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_address[1]
+    # Two host names for the same server, so the per-host cap is visible per site
+    articles = [
+        {"Title": f"Story {i}", "URL": f"http://{'127.0.0.1' if i % 2 else 'localhost'}:{port}/article/{i}"}
+        for i in range(len(pages))
+    ]
+
+    extractor = ArticleExtractor(max_workers=args.workers, per_host=args.per_host, processes=args.processes)
+    start = time.perf_counter()
+    cold = extractor.extract_many(articles)
+    cold_time = time.perf_counter() - start
+    start = time.perf_counter()
+    warm = extractor.extract_many([{k: v for k, v in article.items() if k != "Body"} for article in cold])
+    warm_time = time.perf_counter() - start
+    extractor.close()
+    server.shutdown()
+
+    extracted = sum(1 for article in cold if article["Body"])
+    print(f"Cold pass:  {cold_time:.2f}s for {len(articles)} pages, {extracted} with a body")
+    print(f"Revalidate: {warm_time:.2f}s, statuses {dict(handler.statuses)}")
+    print(f"Peak connections per host: {dict(handler.peak)} (cap {args.per_host})")
+    ok = max(handler.peak.values(), default=0) <= args.per_host and [a["Body"] for a in warm] == [a["Body"] for a in cold]
+    if not args.html_dir:
+        ok = ok and all(STORY_MARKER in a["Body"] and BOILERPLATE_MARKER not in a["Body"] for a in cold)
+    print("✅ Extraction, per-host cap and revalidation behave as expected." if ok else "❌ Extraction check failed.")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
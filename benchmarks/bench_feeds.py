@@ -0,0 +1,79 @@
+# benchmarks/bench_feeds.py
+"""
+Polls synthetic RSS/Atom feeds (benchmarks.feed_stub) with tools.feed_collector three
+times: cold, unchanged (every feed should answer 304 and yield nothing), and after a
+few feeds publish new items (only those items should come back). Compares each poll
+with the slowest single feed. Usage:
+python -m benchmarks.bench_feeds --feeds 50 --latency 0.2
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from benchmarks.feed_stub import FeedLibrary, feed_urls, start_feed_server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark feed polling")
+    parser.add_argument("--feeds", type=int, default=50)
+    parser.add_argument("--hosts", type=int, default=10, help="Servers the feeds are spread over")
+    parser.add_argument("--items", type=int, default=20, help="Items per feed")
+    parser.add_argument("--latency", type=float, default=0.2, help="Seconds of latency of the slowest feed")
+    parser.add_argument("--publish", type=int, default=5, help="Feeds that publish before the last poll")
+    parser.add_argument("--workers", type=int, default=32)
+    parser.add_argument("--processes", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    # Settings are read at import time: isolate the feed state
+    os.environ["FEEDS_STATE_PATH"] = os.path.join(tempfile.mkdtemp(prefix="upsc-feeds-"), "feeds.sqlite3")
+    from tools.feed_collector import FeedCollector
+
+    library = FeedLibrary(args.feeds, items_per_feed=args.items, latency=args.latency)
+    servers = [start_feed_server(library) for _ in range(max(1, args.hosts))]
+    collector = FeedCollector(feed_urls(servers, args.feeds), max_workers=args.workers, processes=args.processes)
+
+    def timed_poll(label: str):
+        library.statuses.clear()
+        before = dict(collector.stats)
+        start = time.perf_counter()
+        items = collector.poll()
+        elapsed = time.perf_counter() - start
+        print(
+            f"{label:<10} {elapsed:5.2f}s ({elapsed / args.latency:4.1f}x slowest feed)  {len(items):>5} new items  "
+            f"statuses {dict(library.statuses)}  parsed {collector.stats['items'] - before.get('items', 0)} items"
+        )
+        return items, elapsed, dict(library.statuses)
+
+    cold, _, _ = timed_poll("Cold")
+    unchanged, _, unchanged_statuses = timed_poll("Unchanged")
+    published = random.Random(args.seed).sample(range(args.feeds), min(args.publish, args.feeds))
+    for n in published:
+        library.publish(n, count=3)
+    fresh, fresh_time, fresh_statuses = timed_poll("Published")
+    collector.close()
+    for server in servers:
+        server.shutdown()
+
+    expected_stories = {f"{n}/{args.items + i}" for n in published for i in range(3)}
+    ok = (
+        len(cold) == args.feeds * args.items
+        and not unchanged
+        and unchanged_statuses == {304: args.feeds}
+        and fresh_statuses == {200: len(published), 304: args.feeds - len(published)}
+        and sorted(item["URL"].rsplit("/story/", 1)[-1] for item in fresh) == sorted(expected_stories)
+        and fresh_time < 3 * args.latency + 0.5
+    )
+    print("✅ Polling is bounded by the slowest feed and yields each item once." if ok else "❌ Feed polling check failed.")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
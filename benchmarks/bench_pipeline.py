@@ -0,0 +1,257 @@
+# benchmarks/bench_pipeline.py
+"""
+End-to-end pipeline benchmark against offline stand-ins for Serper and Anthropic.
+
+Drives fetch → dedupe → tag → summarize → link at several article counts, each in a
+fresh process (so peak RSS is per size and caches start cold), and prints a JSON
+report with per-stage latency percentiles, throughput and peak RSS. Usage:
+python -m benchmarks.bench_pipeline --sizes 10 100 1000 --output bench.json
+"""
+import argparse
+import json
+import math
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+
+class StageTimer:
+    """Collects per-call latencies by stage; safe to use from worker threads."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    def time(self, stage: str, fn, *args):
+        start = time.perf_counter()
+        try:
+            return fn(*args)
+        except Exception:
+            with self._lock:
+                self.errors[stage] += 1
+            raise
+        finally:
+            with self._lock:
+                self.samples[stage].append(time.perf_counter() - start)
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of already sorted values."""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, max(0, math.ceil(q / 100 * len(sorted_values)) - 1))]
+
+
+def summarize_samples(samples: List[float]) -> Dict[str, float]:
+    values = sorted(samples)
+    return {
+        "calls": len(values),
+        "total_s": round(sum(values), 4),
+        "mean_ms": round(1000 * sum(values) / len(values), 2) if values else 0.0,
+        "p50_ms": round(1000 * percentile(values, 50), 2),
+        "p90_ms": round(1000 * percentile(values, 90), 2),
+        "p99_ms": round(1000 * percentile(values, 99), 2),
+        "max_ms": round(1000 * values[-1], 2) if values else 0.0,
+    }
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def run_once(args) -> Dict:
+    """Benchmarks one article count in this process. Must run before anything imports config.settings."""
+    workdir = tempfile.mkdtemp(prefix="upsc-bench-")
+    # Settings are read at import time: isolate caches and indexes, and point Serper at the stub
+    os.environ.update({
+        "UPSC_CACHE_DIR": os.path.join(workdir, "cache"),
+        "VECTOR_INDEX_DIR": os.path.join(workdir, "vector_index"),
+        "LLM_CACHE_ENABLED": "false",
+        "EXTRACT_ENABLED": "false", # Fixture URLs have no pages behind them
+        "SERPER_API_KEY": os.environ.get("SERPER_API_KEY") or "benchmark",
+        "SERPER_BACKOFF_SECONDS": "0.01",
+        "SERPER_NUM_RESULTS": str(args.per_query),
+        "ROUTER_ENABLED": "false" if args.no_router else "true",
+        # The client-side budgets match the simulated provider limits (0 = unlimited)
+        "RATE_LIMIT_ENABLED": "false" if args.no_limiter else "true",
+        "SERPER_RATE_LIMIT_RPS": str(args.serper_rate_limit),
+        "ANTHROPIC_RATE_LIMIT_RPM": str(args.llm_rate_limit * 60),
+        "ANTHROPIC_MAX_CONCURRENCY": str(args.workers),
+    })
+    from benchmarks.serper_stub import start_stub_server
+
+    server = start_stub_server(latency=args.serper_latency, error_rate=args.serper_error_rate, rate_limit=args.serper_rate_limit)
+    os.environ["SERPER_API_URL"] = f"http://127.0.0.1:{server.server_address[1]}/news"
+    from benchmarks.fixtures import load_fixtures # Imports config.settings, so only now
+    fixtures = load_fixtures(args.fixtures_dir)
+    server.RequestHandlerClass.fixtures = fixtures
+
+    from concurrent.futures import ThreadPoolExecutor
+    from agents.linker_agent import LinkerAgents
+    from agents.llm import complete, set_llm_factory
+    from agents.context_store import context_snapshot
+    from agents.router import model_router
+    from benchmarks.fake_llm import fake_llm_factory
+    from knowledge.vector_index import VectorIndex
+    from pipeline.dedup import dedupe_articles
+    from pipeline.batcher import call_with_split
+    from pipeline.fanout import ArticleProcessor, untagged, unsummarized
+    from pipeline.formatting import format_summaries_for_linking
+    from pipeline.tasks import build_prompt, LINK_DESCRIPTION, LINK_EXPECTED_OUTPUT
+    from pipeline.tokens import token_ledger
+    from tools.rate_limit import limiter_stats
+    from tools.serper_client import search_articles
+
+    set_llm_factory(fake_llm_factory(
+        fixtures, latency=args.llm_latency, jitter=args.llm_jitter, error_rate=args.llm_error_rate, rate_limit=args.llm_rate_limit,
+        fast_speedup=args.fast_speedup, fast_weak_rate=args.fast_weak_rate,
+    ))
+    timer = StageTimer()
+    size = args.single
+    queries = [f"benchmark query {i}" for i in range(math.ceil(size / args.per_query))]
+    stage_wall: Dict[str, float] = {}
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        results = executor.map(lambda q: timer.time("fetch", search_articles, q), queries)
+        articles = [article for result in results for article in result][:size]
+    stage_wall["fetch"] = time.perf_counter() - start
+
+    t = time.perf_counter()
+    articles = timer.time("dedupe", dedupe_articles, articles)
+    stage_wall["dedupe"] = time.perf_counter() - t
+
+    processor = ArticleProcessor()
+    if args.batch_size > 0:
+        units = [articles[i:i + args.batch_size] for i in range(0, len(articles), args.batch_size)]
+    else:
+        units = processor.pack(articles)
+
+    def process(unit):
+        tagged = call_with_split(lambda batch: timer.time("tag", processor.tag, batch), unit, untagged, stage="tagging")
+        summaries = call_with_split(lambda batch: timer.time("summarize", processor.summarize, batch), tagged, unsummarized, stage="summarization")
+        return tagged, summaries
+
+    t = time.perf_counter()
+    tagged, summaries = [], []
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        for unit_tagged, unit_summaries in executor.map(process, units):
+            tagged.extend(unit_tagged)
+            summaries.extend(unit_summaries)
+    stage_wall["tag+summarize"] = time.perf_counter() - t
+
+    t = time.perf_counter()
+    archive = VectorIndex()
+    topics_by_url = {item.get("URL"): item.get("UPSC_Topics", []) for item in tagged}
+    linked = [{**summary, "UPSC_Topics": topics_by_url.get(summary.get("URL"), [])} for summary in summaries]
+    for item, related in zip(linked, timer.time("archive_query", archive.query_many, linked)):
+        item["See_Also"] = related
+    linker_agents = LinkerAgents()
+    linker_agent = linker_agents.linker_agent()
+    prompt = build_prompt(LINK_DESCRIPTION, LINK_EXPECTED_OUTPUT, format_summaries_for_linking(linked))
+    try:
+        timer.time("link", complete, linker_agents.llm, linker_agent, prompt, "link")
+    except Exception:
+        pass
+    timer.time("archive_add", archive.add, linked)
+    stage_wall["link"] = time.perf_counter() - t
+    wall = time.perf_counter() - start
+    server.shutdown()
+
+    return {
+        "articles": size,
+        "processed": len(summaries),
+        "units": len(units),
+        "summarized": sum(1 for s in summaries if s.get("Summary")),
+        "wall_s": round(wall, 3),
+        "throughput_articles_per_s": round(len(summaries) / wall, 2) if wall else 0.0,
+        "peak_rss_mb": peak_rss_mb(),
+        "stage_wall_s": {stage: round(seconds, 3) for stage, seconds in stage_wall.items()},
+        "stages": {stage: summarize_samples(samples) for stage, samples in timer.samples.items()},
+        "errors": dict(timer.errors),
+        "tokens": token_ledger.totals(),
+        "rate_limits": limiter_stats(),
+        "routes": model_router.stats(),
+        "context": {
+            agent: {key: snapshot[key] for key in ("stored_tokens", "max_tokens", "evicted")}
+            for agent, snapshot in context_snapshot().items()
+        },
+        "serper_429s": server.RequestHandlerClass.bucket.rejected if server.RequestHandlerClass.bucket else 0,
+    }
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=project_root, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the pipeline offline")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000], help="Article counts to benchmark")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--batch-size", type=int, default=0, help="Articles per tag+summarize unit (0 = packed to the token budget)")
+    parser.add_argument("--per-query", type=int, default=10, help="Articles returned per Serper query")
+    parser.add_argument("--serper-latency", type=float, default=0.05)
+    parser.add_argument("--serper-error-rate", type=float, default=0.0)
+    parser.add_argument("--llm-latency", type=float, default=0.2)
+    parser.add_argument("--llm-jitter", type=float, default=0.05)
+    parser.add_argument("--llm-error-rate", type=float, default=0.0)
+    parser.add_argument("--serper-rate-limit", type=float, default=0.0, help="Stub requests/s before 429s (0 = unlimited)")
+    parser.add_argument("--llm-rate-limit", type=float, default=0.0, help="Fake Claude requests/s before 429s (0 = unlimited)")
+    parser.add_argument("--no-limiter", action="store_true", help="Disable the client-side limiter to compare error rates")
+    parser.add_argument("--no-router", action="store_true", help="Send every agent to the strong model to compare cost and latency")
+    parser.add_argument("--fast-speedup", type=float, default=3.0, help="How much quicker the fake fast-tier model answers")
+    parser.add_argument("--fast-weak-rate", type=float, default=0.1, help="Share of articles the fake fast-tier model gets wrong")
+    parser.add_argument("--fixtures-dir", default=os.path.join(project_root, "output"))
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    parser.add_argument("--single", type=int, help=argparse.SUPPRESS) # Internal: run one size in this process
+    args = parser.parse_args(argv)
+
+    if args.single is not None:
+        print(json.dumps(run_once(args)))
+        return 0
+
+    passthrough = list(argv if argv is not None else sys.argv[1:])
+    results = []
+    for size in args.sizes:
+        # A fresh interpreter per size: isolated peak RSS, cold caches, no state carried over
+        child = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_pipeline", *passthrough, "--single", str(size)],
+            cwd=project_root, capture_output=True, text=True,
+        )
+        if child.returncode != 0:
+            print(child.stderr, file=sys.stderr)
+            return child.returncode
+        results.append(json.loads(child.stdout.strip().splitlines()[-1]))
+        print(f"{size:>6} articles: {results[-1]['throughput_articles_per_s']} articles/s, peak RSS {results[-1]['peak_rss_mb']} MB", file=sys.stderr)
+
+    report = {
+        "revision": git_revision(),
+        "python": sys.version.split()[0],
+        "config": {key: value for key, value in vars(args).items() if key not in ("single", "output", "sizes")},
+        "results": results,
+    }
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+# benchmarks/bench_search.py
+"""
+Compares one-by-one NewsSearchTool calls with the pooled batch API against the
+local Serper stand-in. Runs in a fresh interpreter, so the settings point at the stub
+even when the caller (e.g. `python main.py bench search`) has already loaded them.
+Usage: python -m benchmarks.bench_search --queries 40
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from benchmarks.serper_stub import start_stub_server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark Serper batch searching")
+    parser.add_argument("--queries", type=int, default=40)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS) # Internal: benchmark in this process
+    args = parser.parse_args(argv)
+
+    if not args.child:
+        passthrough = list(argv if argv is not None else sys.argv[1:])
+        return subprocess.run([sys.executable, "-m", "benchmarks.bench_search", *passthrough, "--child"], cwd=project_root).returncode
+
+    server = start_stub_server(latency=args.latency)
+    # Settings are read at import time, so configure the environment before importing the tool.
+    # The key is overridden too: the stub ignores it, and a real one must never leave the machine.
+    os.environ["SERPER_API_URL"] = f"http://127.0.0.1:{server.server_address[1]}/news"
+    os.environ["SERPER_API_KEY"] = "benchmark"
+    # A throwaway cache keeps stub results out of the user's CACHE_DIR.
+    cache_dir = tempfile.TemporaryDirectory()
+    os.environ["UPSC_CACHE_DIR"] = cache_dir.name
+    # The Serper budget (5 RPS) would otherwise pace the sequential pass, as in bench_pipeline --no-limiter.
+    os.environ["RATE_LIMIT_ENABLED"] = "false"
+    from tools.search_tools import upsc_news_search_tool
+    from tools.serper_client import serper_cache
+
+    queries = [(f"UPSC topic {i}", "in", "en") for i in range(args.queries)]
+
+    start = time.perf_counter()
+    sequential = [upsc_news_search_tool._run(*q) for q in queries]
+    sequential_time = time.perf_counter() - start
+
+    serper_cache.clear() # Otherwise the batched pass is answered from what the sequential pass cached
+    start = time.perf_counter()
+    batched = upsc_news_search_tool.search_many(queries, max_workers=args.workers)
+    batched_time = time.perf_counter() - start
+
+    server.shutdown()
+    cache_dir.cleanup()
+    errors = [result for result in sequential + batched if result.startswith("Error")]
+    if errors:
+        print(f"❌ {len(errors)} of {len(sequential) + len(batched)} searches failed, e.g. {errors[0]}")
+        return 1
+    if sequential != batched:
+        print("❌ Batch results must match sequential results in input order.")
+        return 1
+    print(f"Sequential: {sequential_time:.2f}s for {len(queries)} queries")
+    print(f"Batched ({args.workers} workers): {batched_time:.2f}s ({sequential_time / batched_time:.1f}x faster)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
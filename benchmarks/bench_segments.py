@@ -0,0 +1,88 @@
+# benchmarks/bench_segments.py
+"""
+Builds a synthetic multi-year segment archive (pipeline.segments) and times appends,
+random reads by URL, whole-day reads and compaction, with peak RSS, to show that
+per-record costs stay flat as the archive grows. Usage:
+python -m benchmarks.bench_segments --articles 200000 --years 3
+"""
+import argparse
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from benchmarks.bench_archive import SOURCES, ZipfText, percentile
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the segment archive")
+    parser.add_argument("--articles", type=int, default=200000)
+    parser.add_argument("--years", type=float, default=3.0)
+    parser.add_argument("--batch", type=int, default=50, help="Records per append (about one pipeline run)")
+    parser.add_argument("--rewrite-share", type=float, default=0.1, help="Share of appends that re-store an existing article")
+    parser.add_argument("--reads", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    from pipeline.segments import SegmentArchive
+
+    rng = random.Random(args.seed)
+    text = ZipfText(rng)
+    archive = SegmentArchive(tempfile.mkdtemp(prefix="upsc-segments-"))
+    now = time.time()
+    append_latencies, batch, checkpoints = [], [], []
+    for i in range(args.articles):
+        n = rng.randrange(i) if i and rng.random() < args.rewrite_share else i
+        published = now - rng.random() * args.years * 365 * 86400
+        batch.append({
+            "Title": text.words_of(10).title(),
+            "URL": f"https://news.example/{n}",
+            "Source": rng.choice(SOURCES),
+            "Date": time.strftime("%b %d, %Y", time.localtime(published)),
+            "Summary": text.words_of(60),
+            "UPSC_Topics": ["Polity and Governance"],
+        })
+        if len(batch) == args.batch:
+            start = time.perf_counter()
+            archive.append(batch)
+            append_latencies.append((time.perf_counter() - start) / len(batch))
+            batch = []
+        if (i + 1) % max(1, args.articles // 4) == 0:
+            checkpoints.append((i + 1, percentile(append_latencies[-200:], 0.5) * 1e6))
+    archive.append(batch)
+
+    get_latencies = []
+    for _ in range(args.reads):
+        url = f"https://news.example/{rng.randrange(args.articles)}"
+        start = time.perf_counter()
+        archive.get(url)
+        get_latencies.append((time.perf_counter() - start) * 1e6)
+    day_latencies, day_sizes = [], []
+    for _ in range(100):
+        start = time.perf_counter()
+        records = archive.day(now - rng.random() * args.years * 365 * 86400)
+        day_latencies.append((time.perf_counter() - start) * 1e3)
+        day_sizes.append(len(records))
+
+    stats = archive.stats()
+    print(f"Archived {stats['records']} articles ({stats['entries']} appends) in {stats['segments']} {stats['codec']} segments, {stats['bytes'] / 1e6:.0f} MB")
+    for appended, p50 in checkpoints:
+        print(f"append p50 after {appended:>8} records: {p50:7.1f} µs/record")
+    print(f"get by URL     p50 {percentile(get_latencies, 0.5):7.1f} µs  p95 {percentile(get_latencies, 0.95):7.1f} µs")
+    print(f"read one day   p50 {percentile(day_latencies, 0.5):7.2f} ms  p95 {percentile(day_latencies, 0.95):7.2f} ms  (median {percentile(day_sizes, 0.5)} records)")
+    start = time.perf_counter()
+    result = archive.compact()
+    print(f"compact        {time.perf_counter() - start:7.2f} s  ({result['before']['bytes'] / 1e6:.0f} MB → {result['after']['bytes'] / 1e6:.0f} MB)")
+    print(f"peak RSS       {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MB")
+    archive.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
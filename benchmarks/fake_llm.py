@@ -0,0 +1,190 @@
+# benchmarks/fake_llm.py
+"""
+Offline stand-in for ChatAnthropic used by the benchmarks.
+
+It answers the tagger, summarizer and linker prompts in the shapes the pipeline
+expects, after a configurable latency, and fails a configurable share of calls.
+With `rate_limit` set it also enforces a provider-side request rate, answering
+excess calls with a 429 and Retry-After, and like the real client it goes
+through the shared "anthropic" limiter. Clients built for the fast (Haiku) tier answer
+sooner but get a configurable share of articles wrong (no topics, low confidence or an
+empty summary), which exercises the router's escalation. Streamed calls deliver the
+first chunk after `first_chunk_share` of the latency and the rest spread over the
+remainder. Install it for every agent with agents.llm.set_llm_factory(fake_llm_factory(...)).
+"""
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from types import SimpleNamespace
+from typing import Any, Callable, Iterator, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from pydantic import PrivateAttr
+
+from agents.llm import RateLimitedChatMixin
+from benchmarks.fixtures import Fixtures
+from knowledge.topic_codes import TOPIC_CODES
+from pipeline.tokens import estimate_tokens
+
+_TITLE_RE = re.compile(r"Title: (.*)")
+_URL_RE = re.compile(r"URL: (.*)")
+_CODES_RE = re.compile(r"Allowed codes: ([A-Z0-9., ]+)\.")
+
+
+class FakeLLMError(Exception):
+    """Simulated provider failure."""
+
+
+class FakeRateLimitError(Exception):
+    """Simulated 429, shaped like anthropic.RateLimitError (status_code and response headers)."""
+
+    status_code = 429
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Simulated rate limit; retry after {retry_after:.2f}s")
+        self.response = SimpleNamespace(status_code=429, headers={"retry-after": f"{retry_after:.3f}"})
+
+
+class _ProviderBucket:
+    """The simulated provider's own token bucket, shared by every fake client in the process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.rate = 0.0
+        self.tokens = 0.0
+        self.updated_at = time.monotonic()
+
+    def admit(self, rate: float) -> Optional[float]:
+        """Takes a token at `rate` requests/s; returns the Retry-After delay when none is left."""
+        with self._lock:
+            now = time.monotonic()
+            if rate != self.rate:
+                self.rate, self.tokens = rate, max(1.0, rate)
+            self.tokens = min(max(1.0, rate), self.tokens + (now - self.updated_at) * rate)
+            self.updated_at = now
+            if self.tokens < 1:
+                return (1 - self.tokens) / rate
+            self.tokens -= 1
+            return None
+
+
+_provider_bucket = _ProviderBucket()
+
+
+class FakeAnthropicModel(BaseChatModel):
+    """Chat model that simulates Claude's latency, failures and rate limit and answers from fixtures."""
+
+    latency: float = 0.5 # Mean seconds per call
+    jitter: float = 0.2 # Uniform +/- spread around the mean
+    error_rate: float = 0.0 # Share of calls that raise FakeLLMError
+    rate_limit: float = 0.0 # Simulated provider limit in requests/s across all fake clients (0 = unlimited)
+    weak_rate: float = 0.0 # Share of articles answered badly, as a weaker model would
+    first_chunk_share: float = 0.2 # Share of the latency before a stream's first chunk
+    chunk_chars: int = 40 # Characters per streamed chunk
+    seed: int = 0
+    fixtures: Any = None
+    calls: int = 0
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-anthropic"
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager=None, **kwargs) -> ChatResult:
+        latency = self._admit(messages)
+        time.sleep(latency)
+        self._maybe_fail()
+        text = self._respond(messages[-1].content)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=text, usage_metadata=self._usage(messages, text)))])
+
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager=None, **kwargs) -> Iterator[ChatGenerationChunk]:
+        latency = self._admit(messages)
+        time.sleep(latency * self.first_chunk_share)
+        self._maybe_fail()
+        text = self._respond(messages[-1].content)
+        pieces = [text[i:i + self.chunk_chars] for i in range(0, len(text), self.chunk_chars)] or [""]
+        pause = latency * (1 - self.first_chunk_share) / len(pieces)
+        for i, piece in enumerate(pieces):
+            if i:
+                time.sleep(pause)
+            usage = self._usage(messages, text) if i == len(pieces) - 1 else None
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=piece, usage_metadata=usage))
+            if run_manager is not None:
+                run_manager.on_llm_new_token(piece, chunk=chunk)
+            yield chunk
+
+    def _admit(self, messages: List[BaseMessage]) -> float:
+        """Applies the simulated rate limit and returns this call's latency in seconds."""
+        if self.rate_limit > 0:
+            retry_after = _provider_bucket.admit(self.rate_limit)
+            if retry_after is not None:
+                raise FakeRateLimitError(retry_after)
+        rng = random.Random(zlib.crc32(messages[-1].content.encode("utf-8")) ^ self.seed)
+        return max(0.0, self.latency + rng.uniform(-self.jitter, self.jitter))
+
+    def _maybe_fail(self):
+        with self._lock:
+            self.calls += 1
+            call_number = self.calls
+        if random.Random(self.seed * 1000003 + call_number).random() < self.error_rate:
+            raise FakeLLMError("Simulated provider error")
+
+    @staticmethod
+    def _usage(messages: List[BaseMessage], text: str) -> dict:
+        input_tokens = sum(estimate_tokens(message.content) for message in messages)
+        return {"input_tokens": input_tokens, "output_tokens": estimate_tokens(text), "total_tokens": input_tokens + estimate_tokens(text)}
+
+    def _weak(self, url: str) -> bool:
+        return random.Random(zlib.crc32(url.encode("utf-8")) ^ self.seed).random() < self.weak_rate
+
+    def _respond(self, prompt: str) -> str:
+        articles = list(zip(_TITLE_RE.findall(prompt), _URL_RE.findall(prompt)))
+        if "UPSC_Topics" in prompt:
+            allowed = _CODES_RE.search(prompt)
+            codes = [c.strip() for c in allowed.group(1).split(",")] if allowed else list(TOPIC_CODES.values())
+            return json.dumps([
+                {"Title": title, "URL": url, "UPSC_Topics": [], "Confidence": 0.2} if self._weak(url) else
+                {"Title": title, "URL": url, "UPSC_Topics": [codes[zlib.crc32(url.encode("utf-8")) % len(codes)]], "Confidence": 0.9}
+                for title, url in articles
+            ])
+        if "'Summary'" in prompt:
+            fixtures: Fixtures = self.fixtures
+            return json.dumps([
+                {"Title": title, "URL": url, "Summary": "" if self._weak(url) else fixtures.summary_for(url, title) if fixtures else f"{title}."}
+                for title, url in articles
+            ])
+        return "\n".join(f"- {title} relates to the other articles on the same GS topic." for title, _ in articles)
+
+
+class FakeChatModel(RateLimitedChatMixin, FakeAnthropicModel):
+    """FakeAnthropicModel behind the shared limiter, mirroring agents.llm.RateLimitedChatAnthropic."""
+
+
+def fake_llm_factory(
+    fixtures: Optional[Fixtures] = None,
+    latency: float = 0.5,
+    jitter: float = 0.2,
+    error_rate: float = 0.0,
+    seed: int = 0,
+    rate_limit: float = 0.0,
+    fast_speedup: float = 3.0,
+    fast_weak_rate: float = 0.1,
+) -> Callable[[str, str], FakeChatModel]:
+    """
+    Returns a build_llm() replacement creating one FakeChatModel per agent and model.
+    Models named like Haiku are `fast_speedup` times quicker and answer `fast_weak_rate` of articles badly.
+    """
+    def factory(agent_name: str, model: str = "") -> FakeChatModel:
+        fast = "haiku" in model.lower()
+        speedup = fast_speedup if fast else 1.0
+        return FakeChatModel(
+            latency=latency / speedup, jitter=jitter / speedup, error_rate=error_rate, rate_limit=rate_limit,
+            weak_rate=fast_weak_rate if fast else 0.0,
+            seed=seed + zlib.crc32(f"{agent_name}:{model}".encode("utf-8")), fixtures=fixtures,
+        )
+    return factory
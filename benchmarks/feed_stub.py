@@ -0,0 +1,148 @@
+# benchmarks/feed_stub.py
+"""
+Local HTTP server with synthetic RSS 2.0 and Atom feeds, for exercising
+tools.feed_collector without the network.
+
+Feeds live at /feed/<n>.xml (even n RSS, odd n Atom) and answer conditional GETs
+with 304 until publish() adds items. Each feed has its own latency, spread between
+half of and the full --latency, so the slowest feed is known. Run it directly
+(python -m benchmarks.feed_stub --feeds 50) and point NEWS_FEEDS_FILE at the JSON
+file it writes.
+"""
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+import zlib
+from collections import defaultdict
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Tuple
+from xml.sax.saxutils import escape
+
+
+class FeedLibrary:
+    """The feeds' items and modification times; thread-safe."""
+
+    def __init__(self, feeds: int, items_per_feed: int = 20, latency: float = 0.1):
+        self.lock = threading.Lock()
+        self.latencies = [latency * (0.5 + 0.5 * n / max(1, feeds - 1)) for n in range(feeds)]
+        self.items = defaultdict(list) # Feed number -> [(item number, published)], newest first
+        self.modified = {}
+        self.statuses = defaultdict(int)
+        now = time.time()
+        for n in range(feeds):
+            self.items[n] = [(i, now - (items_per_feed - i) * 600) for i in range(items_per_feed)][::-1]
+            self.modified[n] = now
+
+    def publish(self, n: int, count: int = 1):
+        """Adds `count` new items to feed `n`, published now."""
+        with self.lock:
+            now = time.time()
+            start = max(i for i, _ in self.items[n]) + 1 if self.items[n] else 0
+            self.items[n] = [(i, now) for i in range(start + count - 1, start - 1, -1)] + self.items[n]
+            self.modified[n] = now
+
+    def render(self, n: int, base_url: str) -> bytes:
+        with self.lock:
+            items = list(self.items[n])
+        if n % 2 == 0:
+            body = "".join(
+                f"<item><title>Feed {n} story {i}: Cabinet clears scheme &amp; reforms</title>"
+                f"<link>{base_url}/story/{n}/{i}</link><guid isPermaLink=\"false\">feed-{n}-{i}</guid>"
+                f"<description>{escape('<p>The Union Cabinet approved the scheme for phase ' + str(i) + '.</p>')}</description>"
+                f"<pubDate>{formatdate(published, usegmt=True)}</pubDate></item>"
+                for i, published in items
+            )
+            return f'<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel><title>Feed {n}</title>{body}</channel></rss>'.encode("utf-8")
+        body = "".join(
+            f"<entry><title>Feed {n} story {i}: Monsoon session begins</title>"
+            f'<link rel="alternate" href="{base_url}/story/{n}/{i}"/><id>urn:feed-{n}-{i}</id>'
+            f"<summary>Parliament convenes for session {i}.</summary>"
+            f"<updated>{time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(published))}</updated></entry>"
+            for i, published in items
+        )
+        return f'<?xml version="1.0" encoding="UTF-8"?><feed xmlns="http://www.w3.org/2005/Atom"><title>Feed {n}</title>{body}</feed>'.encode("utf-8")
+
+
+class FeedHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    library: FeedLibrary = None
+
+    def do_GET(self):
+        try:
+            n = int(self.path.rsplit("/", 1)[-1].split(".")[0])
+            latency = self.library.latencies[n]
+        except (ValueError, IndexError):
+            self._respond(404)
+            return
+        time.sleep(latency)
+        last_modified = formatdate(self.library.modified[n], usegmt=True)
+        body = self.library.render(n, f"http://{self.headers.get('Host', '127.0.0.1')}")
+        etag = f'"{zlib.crc32(body):08x}"'
+        if self.headers.get("If-None-Match") == etag or (
+            "If-None-Match" not in self.headers and self.headers.get("If-Modified-Since") == last_modified
+        ):
+            self._respond(304, etag=etag, last_modified=last_modified)
+            return
+        self._respond(200, body, etag, last_modified, "application/rss+xml" if n % 2 == 0 else "application/atom+xml")
+
+    def _respond(self, status: int, body: bytes = b"", etag: str = None, last_modified: str = None, content_type: str = None):
+        with self.library.lock:
+            self.library.statuses[status] += 1
+        self.send_response(status)
+        if etag:
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", last_modified)
+        if content_type:
+            self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass # Keep benchmark output clean
+
+
+def start_feed_server(library: FeedLibrary, port: int = 0) -> ThreadingHTTPServer:
+    """Starts the feed server on a background thread and returns it."""
+    handler = type("ConfiguredFeedHandler", (FeedHandler,), {"library": library})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def feed_urls(servers: List[ThreadingHTTPServer], feeds: int) -> List[Tuple[str, str]]:
+    """
+    (source, URL) pairs for every feed, as FeedCollector takes them. Feeds are spread
+    round-robin over `servers` (each its own host:port, like separate publishers).
+    """
+    ports = [server.server_address[1] for server in servers]
+    return [(f"Stub Source {n % 5}", f"http://127.0.0.1:{ports[n % len(ports)]}/feed/{n}.xml") for n in range(feeds)]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local RSS/Atom feed server")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--feeds", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.1, help="Seconds of latency of the slowest feed")
+    parser.add_argument("--publish-every", type=float, default=30.0, help="Seconds between new items in a random feed")
+    args = parser.parse_args()
+    library = FeedLibrary(args.feeds, latency=args.latency)
+    server = start_feed_server(library, args.port)
+    feeds_file = os.path.join(tempfile.gettempdir(), "upsc_stub_feeds.json")
+    with open(feeds_file, "w", encoding="utf-8") as f:
+        grouped = defaultdict(list)
+        for source, url in feed_urls([server], args.feeds):
+            grouped[source].append(url)
+        json.dump(grouped, f, indent=2)
+    print(f"Feed stub serving {args.feeds} feeds; use NEWS_FEEDS_FILE={feeds_file}")
+    try:
+        while True:
+            time.sleep(args.publish_every)
+            library.publish(int(time.time()) % args.feeds)
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,66 @@
+# benchmarks/import_time.py
+"""
+Measures how long `import main` takes with `python -X importtime` and fails when it
+exceeds the budget or pulls in an agent framework. Usage:
+python -m benchmarks.import_time --budget-ms 300
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Frameworks that only the LLM subcommands may load
+HEAVY_MODULES = ("crewai", "langchain", "langchain_core", "langchain_anthropic", "anthropic", "sentence_transformers")
+
+
+def measure(module: str = "main"):
+    """
+    Imports `module` in a fresh interpreter with -X importtime.
+
+    Returns:
+        (total import time in ms, [(cumulative ms, module name)] slowest first, heavy modules loaded)
+    """
+    probe = (
+        f"import {module}, sys, json; "
+        f"print(json.dumps(sorted({{m.split('.')[0] for m in sys.modules}} & set({list(HEAVY_MODULES)!r}))))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe],
+        cwd=project_root, capture_output=True, text=True, check=True,
+    )
+    entries = []
+    for line in result.stderr.splitlines():
+        # "import time:      self [us] |  cumulative | imported package"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        entries.append((int(cumulative) / 1000, name[1:].rstrip()))
+    # Top-level imports are the unindented entries; their cumulative times add up to the total
+    total = sum(ms for ms, name in entries if not name.startswith(" "))
+    slowest = sorted(((ms, name.strip()) for ms, name in entries), reverse=True)
+    return total, slowest, json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check the CLI's import-time budget")
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--budget-ms", type=float, default=300.0)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    total, slowest, heavy = measure(args.module)
+    print(f"import {args.module}: {total:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    for ms, name in slowest[:args.top]:
+        print(f"  {ms:8.1f} ms  {name}")
+    ok = total <= args.budget_ms and not heavy
+    if heavy:
+        print(f"❌ Heavy frameworks loaded at import time: {', '.join(heavy)}")
+    print("✅ Within the import-time budget." if ok else "❌ Import-time budget exceeded.")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
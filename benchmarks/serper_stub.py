@@ -0,0 +1,115 @@
+# benchmarks/serper_stub.py
+"""
+Local HTTP stand-in for google.serper.dev used by the benchmarks.
+
+Run it directly (python -m benchmarks.serper_stub --port 8765) and point the
+tool at it with SERPER_API_URL=http://127.0.0.1:8765/news. With --rate-limit it
+throttles like the real API: requests beyond the limit get a 429 with Retry-After.
+"""
+import argparse
+import json
+import random
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def _fake_news(query: str, num: int, fixtures=None) -> dict:
+    """Builds a deterministic Serper-shaped response for a query, from benchmarks.fixtures if given."""
+    return {
+        "searchParameters": {"q": query, "type": "news"},
+        "news": [
+            fixtures.serper_article(query, i) if fixtures is not None else {
+                "title": f"{query} - article {i}",
+                "link": f"https://example.org/{zlib.crc32(query.encode('utf-8'))}/{i}",
+                "snippet": f"Stand-in description {i} for '{query}'.",
+                "date": f"{i} hours ago",
+                "source": "Serper Stub",
+            }
+            for i in range(1, num + 1)
+        ],
+    }
+
+
+class TokenBucket:
+    """Server-side request limit: `rate` requests per second with one second of burst."""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.tokens = max(1.0, rate)
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+        self.rejected = 0
+
+    def admit(self):
+        """Takes a token; returns None if admitted, else the seconds until one is available."""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(max(1.0, self.rate), self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+            if self.tokens < 1:
+                self.rejected += 1
+                return (1 - self.tokens) / self.rate
+            self.tokens -= 1
+            return None
+
+
+class SerperStubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1" # Keep-alive, like the real API
+    latency = 0.05
+    error_rate = 0.0 # Share of requests answered with a retryable 503
+    fixtures = None
+    bucket = None # TokenBucket when the stub enforces a rate limit
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        retry_after = self.bucket.admit() if self.bucket is not None else None
+        if retry_after is not None:
+            self.send_response(429)
+            self.send_header("Retry-After", f"{retry_after:.3f}")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        time.sleep(self.latency)
+        if self.error_rate and random.random() < self.error_rate:
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = json.dumps(_fake_news(payload.get("q", ""), int(payload.get("num", 10)), self.fixtures)).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass # Keep benchmark output clean
+
+
+def start_stub_server(port: int = 0, latency: float = 0.05, error_rate: float = 0.0, fixtures=None, rate_limit: float = 0.0) -> ThreadingHTTPServer:
+    """Starts the stand-in server on a background thread and returns it."""
+    handler = type(
+        "ConfiguredSerperStubHandler", (SerperStubHandler,),
+        {"latency": latency, "error_rate": error_rate, "fixtures": fixtures, "bucket": TokenBucket(rate_limit) if rate_limit > 0 else None},
+    )
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local Serper API stand-in")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds of simulated server latency")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="Requests per second before answering 429 (0 = unlimited)")
+    args = parser.parse_args()
+    server = start_stub_server(args.port, args.latency, rate_limit=args.rate_limit)
+    print(f"Serper stub listening on http://127.0.0.1:{server.server_address[1]}/news")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
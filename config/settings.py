@@ -8,8 +8,18 @@ ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
 SERPER_API_KEY = os.getenv("SERPER_API_KEY")
 
 # --- LLM Configuration ---
-LLM_MODEL_NAME = "claude-3-5-sonnet-20240620" # Or "claude-3-haiku-20240307" for a faster, cheaper option
+LLM_MODEL_NAME = "claude-3-5-sonnet-20240620" # Strong tier; agents routed "fast" in LLM_ROUTES use LLM_FAST_MODEL_NAME
 LLM_TEMPERATURE = 0.2 # Lower temperature for more factual/less creative output
+LLM_MAX_OUTPUT_TOKENS = int(os.getenv("LLM_MAX_OUTPUT_TOKENS", "4096")) # max_tokens per response; batches are sized to stay below it
+LLM_FAST_MODEL_NAME = os.getenv("LLM_FAST_MODEL_NAME", "claude-3-haiku-20240307") # Cheap tier for agents and tasks routed "fast"
+
+# --- Serper API Configuration ---
+SERPER_API_URL = os.getenv("SERPER_API_URL", "https://google.serper.dev/news") # Override to point at a local stand-in for benchmarks
+SERPER_TIMEOUT = float(os.getenv("SERPER_TIMEOUT", "10")) # Seconds per HTTP request
+SERPER_MAX_RETRIES = int(os.getenv("SERPER_MAX_RETRIES", "3")) # Retries on timeouts, connection errors, 429 and 5xx
+SERPER_BACKOFF_SECONDS = float(os.getenv("SERPER_BACKOFF_SECONDS", "0.5")) # Base delay for exponential backoff
+SERPER_MAX_WORKERS = int(os.getenv("SERPER_MAX_WORKERS", "8")) # Concurrent requests (and pooled connections) for batch searches
+SERPER_NUM_RESULTS = int(os.getenv("SERPER_NUM_RESULTS", "10")) # Articles requested per query
 
 # Add any other global configurations here
 NEWS_SOURCES = [
@@ -34,5 +44,146 @@ UPSC_GS_TOPICS = [
     "Ethics, Integrity, and Aptitude (Not directly news-based, but current events can provide case studies)"
 ]
 
+# --- Pipeline Configuration ---
+PIPELINE_MODE = os.getenv("UPSC_PIPELINE_MODE", "sequential") # "sequential" (single crew), "parallel" (per-article fan-out) or "streaming"
+PIPELINE_MAX_WORKERS = int(os.getenv("UPSC_PIPELINE_MAX_WORKERS", "4")) # Concurrent tag+summarize units in parallel mode
+PIPELINE_BATCH_SIZE = int(os.getenv("UPSC_PIPELINE_BATCH_SIZE", "0")) # Articles per tag+summarize unit; 0 packs units by BATCH_TOKEN_BUDGET
+BATCH_TOKEN_BUDGET = int(os.getenv("UPSC_BATCH_TOKEN_BUDGET", "6000")) # Target prompt tokens per tag/summarize call when packing by tokens
+BATCH_MAX_ARTICLES = int(os.getenv("UPSC_BATCH_MAX_ARTICLES", "20")) # Upper bound on articles per packed call
+PIPELINE_QUEUE_SIZE = int(os.getenv("UPSC_PIPELINE_QUEUE_SIZE", "16")) # Max records buffered between streaming stages
+PIPELINE_LINK_WINDOW = int(os.getenv("UPSC_PIPELINE_LINK_WINDOW", "50")) # Recent records the streaming linker compares against
+PIPELINE_PROGRESSIVE = os.getenv("UPSC_PIPELINE_PROGRESSIVE", "false").lower() == "true" # Sequential mode: stream summaries/links into OUTPUT_DIR as they are generated
+
 OUTPUT_DIR = "output" # Directory to save processed news
-os.makedirs(OUTPUT_DIR, exist_ok=True) # Create output directory if it doesn't exist
\ No newline at end of file
+os.makedirs(OUTPUT_DIR, exist_ok=True) # Create output directory if it doesn't exist
+
+# --- Caching ---
+CACHE_DIR = os.getenv("UPSC_CACHE_DIR", os.path.join(OUTPUT_DIR, "cache")) # On-disk caches, kept across runs
+SERPER_CACHE_TTL_SECONDS = float(os.getenv("SERPER_CACHE_TTL_SECONDS", str(6 * 60 * 60))) # Roughly one news cycle
+SERPER_CACHE_MAX_ENTRIES = int(os.getenv("SERPER_CACHE_MAX_ENTRIES", "5000")) # Least recently used entries are evicted beyond this
+
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true" # Reuse responses for identical agent prompts
+LLM_CACHE_TTL_SECONDS = float(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 60 * 60))) # Drop cached generations after a week
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "20000"))
+
+# --- Near-duplicate detection ---
+DEDUP_THRESHOLD = float(os.getenv("DEDUP_THRESHOLD", "0.6")) # Estimated Jaccard similarity above which articles are duplicates
+DEDUP_NUM_PERM = int(os.getenv("DEDUP_NUM_PERM", "64")) # MinHash signature length
+DEDUP_BANDS = int(os.getenv("DEDUP_BANDS", "16")) # LSH bands; must divide DEDUP_NUM_PERM
+DEDUP_INDEX_PATH = os.getenv("DEDUP_INDEX_PATH", os.path.join(OUTPUT_DIR, "dedup_index.sqlite3")) # Signatures of previously processed articles
+DEDUP_DROP_SEEN = os.getenv("DEDUP_DROP_SEEN", "false").lower() == "true" # Drop articles that near-duplicate a different article from an earlier run
+
+# --- Article linking ---
+VECTOR_INDEX_DIR = os.getenv("VECTOR_INDEX_DIR", os.path.join(OUTPUT_DIR, "vector_index")) # Persistent embeddings of past summaries
+VECTOR_DIM = int(os.getenv("VECTOR_DIM", "256")) # Hashed TF-IDF embedding size
+VECTOR_EMBEDDING_MODEL = os.getenv("VECTOR_EMBEDDING_MODEL") # Optional sentence-transformers model name, e.g. "all-MiniLM-L6-v2"
+LINK_TOP_K = int(os.getenv("LINK_TOP_K", "3")) # Historical articles handed to the linker per item
+
+# --- Prompt size ---
+COMPACT_TOPIC_CODES = os.getenv("COMPACT_TOPIC_CODES", "true").lower() == "true" # Refer to GS topics by short codes (legend in the tagger's system prompt)
+
+# --- Rule-based pre-classifier ---
+CLASSIFIER_ENABLED = os.getenv("CLASSIFIER_ENABLED", "true").lower() == "true" # Tag clear-cut articles without an LLM call
+CLASSIFIER_CONFIDENT_SCORE = float(os.getenv("CLASSIFIER_CONFIDENT_SCORE", "4.0")) # Minimum keyword score to skip the LLM
+CLASSIFIER_MARGIN = float(os.getenv("CLASSIFIER_MARGIN", "2.0")) # Best topic must outscore the runner-up by this factor
+CLASSIFIER_MAX_CANDIDATES = int(os.getenv("CLASSIFIER_MAX_CANDIDATES", "4")) # Topics offered to the LLM for ambiguous articles
+
+# --- Incremental runs ---
+ARTICLE_STORE_PATH = os.getenv("ARTICLE_STORE_PATH", os.path.join(OUTPUT_DIR, "articles.sqlite3")) # Per-article fetch/tag/summary/link state
+ARTICLE_STORE_WINDOW_HOURS = float(os.getenv("ARTICLE_STORE_WINDOW_HOURS", "24")) # Articles seen within this window make up the rebuilt outputs
+ARCHIVE_INDEX_ENABLED = os.getenv("ARCHIVE_INDEX_ENABLED", "true").lower() == "true" # Add processed articles to the searchable archive
+ARCHIVE_INDEX_PATH = os.getenv("ARCHIVE_INDEX_PATH", os.path.join(OUTPUT_DIR, "archive_index.sqlite3")) # Full-text + facet index behind `main.py search`
+SEGMENT_ARCHIVE_ENABLED = os.getenv("SEGMENT_ARCHIVE_ENABLED", "true").lower() == "true" # Append processed articles to the compressed segment archive
+SEGMENT_ARCHIVE_DIR = os.getenv("SEGMENT_ARCHIVE_DIR", os.path.join(OUTPUT_DIR, "segments")) # Segment files and their mmap offset indexes (`main.py archive`)
+SEGMENT_MAX_BYTES = int(os.getenv("SEGMENT_MAX_BYTES", str(64 * 1024 * 1024))) # A new segment file is started beyond this size
+SEGMENT_COMPRESSION_LEVEL = int(os.getenv("SEGMENT_COMPRESSION_LEVEL", "3")) # zstd level per record (gzip is used when zstandard is not installed)
+
+# --- Checkpoints ---
+CHECKPOINT_DIR = os.getenv("CHECKPOINT_DIR", os.path.join(OUTPUT_DIR, "checkpoints")) # Last output of each crew stage, keyed by a hash of its input
+PIPELINE_RESUME = os.getenv("UPSC_PIPELINE_RESUME", "false").lower() == "true" # Reuse checkpoints whose input is unchanged instead of re-running the stage
+
+# --- Tracing ---
+TRACING_ENABLED = os.getenv("UPSC_TRACING", "false").lower() == "true" # Record spans for Serper requests, LLM calls and pipeline stages
+TRACE_DIR = os.getenv("UPSC_TRACE_DIR", os.path.join(OUTPUT_DIR, "traces")) # JSON-lines traces and the metrics.prom snapshot
+
+# --- Rate limiting ---
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true" # Share one adaptive budget per provider across all agents and tools
+SERPER_RATE_LIMIT_RPS = float(os.getenv("SERPER_RATE_LIMIT_RPS", "5")) # Serper requests per second for the whole process (0 = unlimited)
+SERPER_LATENCY_TARGET_SECONDS = float(os.getenv("SERPER_LATENCY_TARGET_SECONDS", "5")) # Slower responses shrink the Serper concurrency window
+ANTHROPIC_RATE_LIMIT_RPM = float(os.getenv("ANTHROPIC_RATE_LIMIT_RPM", "50")) # Claude requests per minute for the whole process (0 = unlimited)
+ANTHROPIC_MAX_CONCURRENCY = int(os.getenv("ANTHROPIC_MAX_CONCURRENCY", "8")) # Upper bound for concurrent Claude calls
+LLM_LATENCY_TARGET_SECONDS = float(os.getenv("LLM_LATENCY_TARGET_SECONDS", "120")) # Slower responses shrink the Claude concurrency window
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "4")) # Retries on 429/529 (after Retry-After) and transient API errors
+
+# --- Article bodies ---
+EXTRACT_ENABLED = os.getenv("EXTRACT_ENABLED", "false").lower() == "true" # Download new articles' pages so summaries use the body, not the snippet (see `fetch --bodies`)
+EXTRACT_MAX_WORKERS = int(os.getenv("EXTRACT_MAX_WORKERS", "16")) # Concurrent page downloads
+EXTRACT_PER_HOST = int(os.getenv("EXTRACT_PER_HOST", "2")) # Concurrent connections to any one news site
+EXTRACT_PROCESSES = int(os.getenv("EXTRACT_PROCESSES", str(min(4, os.cpu_count() or 1)))) # HTML parser processes (0 = parse in the downloading thread)
+EXTRACT_TIMEOUT = float(os.getenv("EXTRACT_TIMEOUT", "10")) # Seconds per page request
+EXTRACT_MAX_BYTES = int(os.getenv("EXTRACT_MAX_BYTES", str(2 * 1024 * 1024))) # Larger pages are truncated
+EXTRACT_MAX_CHARS = int(os.getenv("EXTRACT_MAX_CHARS", "4000")) # Body characters kept per article, bounding the summarizer prompt
+EXTRACT_FRESH_SECONDS = float(os.getenv("EXTRACT_FRESH_SECONDS", str(6 * 60 * 60))) # Younger cached pages are reused without revalidating
+EXTRACT_CACHE_MAX_ENTRIES = int(os.getenv("EXTRACT_CACHE_MAX_ENTRIES", "5000"))
+EXTRACT_USER_AGENT = os.getenv("EXTRACT_USER_AGENT", "Mozilla/5.0 (compatible; UPSCNewsAssistant/1.0)")
+
+# --- News feeds ---
+NEWS_FEEDS = { # RSS/Atom feeds per NEWS_SOURCES entry, polled by tools.feed_collector
+    "The Hindu": [
+        "https://www.thehindu.com/news/national/feeder/default.rss",
+        "https://www.thehindu.com/business/Economy/feeder/default.rss",
+        "https://www.thehindu.com/news/international/feeder/default.rss",
+        "https://www.thehindu.com/sci-tech/energy-and-environment/feeder/default.rss",
+    ],
+    "The Indian Express": [
+        "https://indianexpress.com/section/india/feed/",
+        "https://indianexpress.com/section/explained/feed/",
+    ],
+    "Press Information Bureau (PIB)": [
+        "https://pib.gov.in/RssMain.aspx?ModId=6&Lang=1&Regid=3",
+    ],
+    "Business Standard": [
+        "https://www.business-standard.com/rss/economy-102.rss",
+    ],
+    "The Economic Times": [
+        "https://economictimes.indiatimes.com/news/economy/rssfeeds/1373380680.cms",
+    ],
+}
+NEWS_FEEDS_FILE = os.getenv("NEWS_FEEDS_FILE") # Optional JSON file {source: [feed URLs]} used instead of NEWS_FEEDS
+FEEDS_ENABLED = os.getenv("FEEDS_ENABLED", "false").lower() == "true" # Headless fetches also poll NEWS_FEEDS (see `fetch --feeds`)
+FEEDS_MAX_WORKERS = int(os.getenv("FEEDS_MAX_WORKERS", "32")) # Feeds polled concurrently
+FEEDS_PER_HOST = int(os.getenv("FEEDS_PER_HOST", "4")) # Concurrent connections to any one feed host
+FEEDS_PROCESSES = int(os.getenv("FEEDS_PROCESSES", str(min(4, os.cpu_count() or 1)))) # Feed parser processes (0 = parse in the polling thread)
+FEEDS_TIMEOUT = float(os.getenv("FEEDS_TIMEOUT", "10")) # Seconds per feed request
+FEEDS_MAX_BYTES = int(os.getenv("FEEDS_MAX_BYTES", str(5 * 1024 * 1024))) # Larger feeds are truncated
+FEEDS_MAX_AGE_HOURS = float(os.getenv("FEEDS_MAX_AGE_HOURS", "48")) # On a feed's first poll, older items are skipped
+FEEDS_STATE_PATH = os.getenv("FEEDS_STATE_PATH", os.path.join(CACHE_DIR, "feeds.sqlite3")) # Validators and high-water marks per feed
+
+# --- Query planning ---
+QUERY_PLANNER_ENABLED = os.getenv("QUERY_PLANNER_ENABLED", "true").lower() == "true" # Headless fetches without --topic search the planned syllabus queries (knowledge.query_planner)
+QUERY_BUDGET = int(os.getenv("QUERY_BUDGET", "12")) # Serper requests per planned run
+QUERY_EXPLORE_SHARE = float(os.getenv("QUERY_EXPLORE_SHARE", "0.25")) # Share of the budget kept for queries without recent history
+QUERY_MIN_YIELD = float(os.getenv("QUERY_MIN_YIELD", "1.0")) # Queries averaging fewer new articles per request are dropped until re-explored
+QUERY_MERGE_OVERLAP = float(os.getenv("QUERY_MERGE_OVERLAP", "0.5")) # Share of a query's results usually found first by a better query, above which it is merged into that one
+QUERY_REEXPLORE_RUNS = int(os.getenv("QUERY_REEXPLORE_RUNS", "10")) # Dropped and merged queries are tried again after this many runs
+QUERY_YIELD_DECAY = float(os.getenv("QUERY_YIELD_DECAY", "0.5")) # Weight of the latest run in a query's average yield
+QUERY_SEEN_RUNS = int(os.getenv("QUERY_SEEN_RUNS", "30")) # Articles found in this many recent runs don't count towards a query's yield
+QUERY_STATS_PATH = os.getenv("QUERY_STATS_PATH", os.path.join(CACHE_DIR, "queries.sqlite3")) # Per-query yield and overlap history
+
+# --- Model routing ---
+ROUTER_ENABLED = os.getenv("ROUTER_ENABLED", "true").lower() == "true" # Use the fast model where routed, escalating rejected outputs to LLM_MODEL_NAME
+LLM_ROUTES = dict( # "fast" or "strong" per agent or task name; task routes take precedence
+    (name.strip(), tier.strip())
+    for name, _, tier in (pair.partition("=") for pair in os.getenv("LLM_ROUTES", "fetcher=fast,tagger=fast,summarizer=strong,linker=strong").split(","))
+    if tier
+)
+ROUTER_MIN_CONFIDENCE = float(os.getenv("ROUTER_MIN_CONFIDENCE", "0.6")) # Fast-model tags reporting less confidence are redone by the strong model
+MODEL_PRICES = { # USD per million input/output tokens, for the per-route cost report
+    "claude-3-5-sonnet-20240620": (3.00, 15.00),
+    "claude-3-haiku-20240307": (0.25, 1.25),
+}
+
+# --- Agent context ---
+AGENT_CONTEXT_ENABLED = os.getenv("AGENT_CONTEXT_ENABLED", "true").lower() == "true" # Carry notes from earlier calls into tag/summarize prompts (replaces CrewAI memory)
+AGENT_CONTEXT_TOKENS = int(os.getenv("AGENT_CONTEXT_TOKENS", "400")) # Most context tokens added to any one prompt
+AGENT_CONTEXT_STORE_TOKENS = int(os.getenv("AGENT_CONTEXT_STORE_TOKENS", "8000")) # Notes kept per agent; least recently useful ones are evicted beyond this
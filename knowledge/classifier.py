@@ -0,0 +1,144 @@
+# knowledge/classifier.py
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from config.settings import (
+    UPSC_GS_TOPICS,
+    CLASSIFIER_CONFIDENT_SCORE,
+    CLASSIFIER_MARGIN,
+    CLASSIFIER_MAX_CANDIDATES,
+)
+from knowledge.upsc_syllabus import UPSC_CATEGORIES, SUBJECT_GS_TOPIC, SUBJECT_NEWS_KEYWORDS
+from knowledge.topic_codes import short_topic_name
+
+# Syllabus wording that says nothing about the topic on its own
+_GENERIC_PHRASES = frozenset({
+    "issues", "issues related to", "role", "role of", "effects", "their effects", "general", "basics", "concepts",
+    "types", "structure", "functioning", "organization", "powers", "etc", "others", "india", "indian", "world",
+    "development", "growth", "changes", "important", "various", "other", "related", "physical", "social", "economic",
+    "status", "dimensions", "content", "function", "utility", "application", "mechanisms", "performance",
+})
+_SPLIT_RE = re.compile(r"[(),/]|&| and | in | of | on | with | through | between | to |;")
+
+
+def _trie_pattern(phrases: List[str]) -> str:
+    """
+    Builds a regex alternation shaped like a character trie, so the engine follows
+    one branch per input position instead of trying every phrase in turn.
+    """
+    trie: Dict = {}
+    for phrase in phrases:
+        node = trie
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[""] = {} # End of a phrase
+
+    def render(node: Dict) -> str:
+        branches = [re.escape(char) + render(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        if "" in node: # A phrase may end here, so the rest is optional
+            return "(?:" + "|".join(branches) + ")?"
+        return branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+
+    return render(trie)
+
+
+def _phrases(text: str) -> List[str]:
+    phrases = []
+    for part in _SPLIT_RE.split(f" {text} "):
+        phrase = " ".join(part.lower().replace("'s", "").split())
+        if len(phrase) >= 3 and phrase not in _GENERIC_PHRASES:
+            phrases.append(phrase)
+    return phrases
+
+
+@dataclass
+class Classification:
+    """Outcome of the rule-based pre-classifier for one article."""
+    scores: Dict[str, float] # Short GS topic name -> score
+    subtopics: List[str] # Matched syllabus leaves, strongest first
+    confident: bool
+    topics: List[str] = field(default_factory=list) # Assigned short topic names when confident
+    candidates: List[str] = field(default_factory=list) # Full UPSC_GS_TOPICS entries to offer the LLM otherwise
+
+
+class SyllabusClassifier:
+    """
+    Keyword/phrase matcher compiled once from the UPSC syllabus tree.
+
+    Every syllabus leaf, subject name, GS topic parenthetical and curated news keyword
+    becomes a phrase in a single precompiled regex. Each phrase carries weights towards
+    GS topics (longer, more specific phrases weigh more), so scoring an article is one
+    regex scan plus a few dictionary additions.
+    """
+
+    def __init__(self):
+        # phrase -> list of (gs topic index, weight, syllabus leaf or None)
+        self._nodes: Dict[str, List[Tuple[int, float, Optional[str]]]] = {}
+
+        for paper in UPSC_CATEGORIES.values():
+            for subject, leaves in paper.items():
+                topic = SUBJECT_GS_TOPIC.get(subject)
+                if topic is None:
+                    continue
+                for phrase in _phrases(subject.replace("_", " ")):
+                    self._add(phrase, topic, 1.5, None)
+                for leaf in leaves:
+                    for phrase in _phrases(leaf):
+                        self._add(phrase, topic, 1.0, leaf)
+                for keyword in SUBJECT_NEWS_KEYWORDS.get(subject, []):
+                    self._add(keyword.lower(), topic, 1.0, None)
+        for topic, description in enumerate(UPSC_GS_TOPICS):
+            for phrase in _phrases(description):
+                self._add(phrase, topic, 1.0, None)
+
+        self._pattern = re.compile(r"\b" + _trie_pattern(list(self._nodes)) + r"\b", re.IGNORECASE)
+
+    def _add(self, phrase: str, topic: int, node_weight: float, leaf: Optional[str]):
+        weight = node_weight * (1.0 + 0.5 * (len(phrase.split()) - 1)) # Multi-word phrases are more specific
+        nodes = self._nodes.setdefault(phrase, [])
+        if (topic, weight, leaf) not in nodes:
+            nodes.append((topic, weight, leaf))
+
+    def classify(self, text: str) -> Classification:
+        """Scores text against the GS topics and decides whether the LLM is needed."""
+        topic_scores = [0.0] * len(UPSC_GS_TOPICS)
+        leaf_scores: Dict[str, float] = {}
+        for phrase in {m.group(0).lower() for m in self._pattern.finditer(text)}:
+            best_per_topic: Dict[int, float] = {}
+            for topic, weight, leaf in self._nodes[phrase]:
+                best_per_topic[topic] = max(best_per_topic.get(topic, 0.0), weight)
+                if leaf:
+                    leaf_scores[leaf] = leaf_scores.get(leaf, 0.0) + weight
+            for topic, weight in best_per_topic.items():
+                topic_scores[topic] += weight
+
+        ranked = sorted(range(len(topic_scores)), key=lambda i: topic_scores[i], reverse=True)
+        best = topic_scores[ranked[0]]
+        runner_up = topic_scores[ranked[1]] if len(ranked) > 1 else 0.0
+        confident = best >= CLASSIFIER_CONFIDENT_SCORE and best >= CLASSIFIER_MARGIN * runner_up
+        matched = [i for i in ranked if topic_scores[i] > 0]
+        return Classification(
+            scores={short_topic_name(UPSC_GS_TOPICS[i]): topic_scores[i] for i in matched},
+            subtopics=sorted(leaf_scores, key=leaf_scores.get, reverse=True),
+            confident=confident,
+            topics=[short_topic_name(UPSC_GS_TOPICS[ranked[0]])] if confident else [],
+            # Nothing matched: the LLM has to choose from the full list
+            candidates=[UPSC_GS_TOPICS[i] for i in (matched[:CLASSIFIER_MAX_CANDIDATES] or ranked)],
+        )
+
+    def classify_article(self, article: Dict) -> Classification:
+        return self.classify(f"{article.get('Title', '')}. {article.get('Description', '')}")
+
+
+_classifier: Optional[SyllabusClassifier] = None
+
+
+def get_classifier() -> SyllabusClassifier:
+    """Returns the process-wide classifier, compiling it on first use."""
+    global _classifier
+    if _classifier is None:
+        _classifier = SyllabusClassifier()
+    return _classifier
@@ -0,0 +1,351 @@
+# knowledge/query_planner.py
+"""
+Plans the Serper searches of a run from the UPSC syllabus instead of free-form queries.
+
+Every leaf of UPSC_CATEGORIES becomes a candidate query. After each run the planner
+records, per query, its yield (results that no earlier query of the run returned and
+that no run of the last QUERY_SEEN_RUNS found) and its overlap (the share of its
+results that each earlier query of the run had already returned). The next plan
+spends a fixed request budget deterministically:
+
+- a query whose results a higher-yield query usually returns first is merged into
+  it (the survivor stands for both syllabus leaves, and only it is searched);
+- a query averaging less than QUERY_MIN_YIELD new articles per request is dropped;
+- the rest are ranked by average yield, with QUERY_EXPLORE_SHARE of the budget kept
+  for queries never run, or not run for QUERY_REEXPLORE_RUNS runs (dropped and merged
+  ones included), so the history keeps up with the news.
+
+The same history and budget always give the same plan.
+"""
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from config.settings import (
+    QUERY_BUDGET,
+    QUERY_EXPLORE_SHARE,
+    QUERY_MIN_YIELD,
+    QUERY_MERGE_OVERLAP,
+    QUERY_REEXPLORE_RUNS,
+    QUERY_YIELD_DECAY,
+    QUERY_SEEN_RUNS,
+    QUERY_STATS_PATH,
+    SERPER_MAX_WORKERS,
+    SERPER_NUM_RESULTS,
+)
+from knowledge.upsc_syllabus import UPSC_CATEGORIES
+from pipeline.dedup import article_id
+
+
+@dataclass
+class PlannedQuery:
+    """One search of a plan and the syllabus leaves it stands for."""
+    query: str
+    subject: str
+    leaves: List[str] = field(default_factory=list)
+    reason: str = "" # "yield" (ranked by history) or "explore" (no recent history)
+
+
+@dataclass
+class QueryPlan:
+    """The searches of one run, and what happened to the other candidates."""
+    queries: List[PlannedQuery]
+    merged: Dict[str, str] = field(default_factory=dict) # Query -> the query it was merged into
+    dropped: List[str] = field(default_factory=list) # Low-yield queries
+    deferred: List[str] = field(default_factory=list) # Over budget this run
+
+
+def leaf_query(leaf: str) -> str:
+    """Search text for a syllabus leaf: its wording without the parenthetical details."""
+    return f"{leaf.split('(')[0].strip().replace(' & ', ' and ')} India news"
+
+
+def query_key(query: str) -> str:
+    """History key of a query; the same normalization as tools.serper_client.normalize_query."""
+    return " ".join(query.lower().split())
+
+
+def syllabus_queries() -> List[PlannedQuery]:
+    """
+    One candidate query per distinct syllabus leaf. Subjects take turns (first leaf of
+    every subject, then every second leaf, ...), so exploring the list in order covers
+    the whole syllabus early instead of one subject at a time.
+    """
+    by_subject: Dict[str, List[PlannedQuery]] = {}
+    seen: Dict[str, PlannedQuery] = {}
+    for paper in UPSC_CATEGORIES.values():
+        for subject, leaves in paper.items():
+            for leaf in leaves:
+                query = leaf_query(leaf)
+                if query_key(query) in seen: # The same leaf under several papers
+                    seen[query_key(query)].leaves.append(leaf)
+                    continue
+                seen[query_key(query)] = PlannedQuery(query, subject.replace("_", " "), [leaf])
+                by_subject.setdefault(subject, []).append(seen[query_key(query)])
+    queues = list(by_subject.values())
+    return [queue[i] for i in range(max(map(len, queues))) for queue in queues if i < len(queue)]
+
+
+class QueryStats:
+    """
+    Per-query history (requests, average yield, overlaps), the articles found by recent
+    runs and per-run totals, stored in SQLite. Thread-safe.
+    """
+
+    def __init__(self, path: str = QUERY_STATS_PATH):
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS queries ("
+            " query TEXT PRIMARY KEY,"
+            " requests INTEGER NOT NULL DEFAULT 0,"
+            " results INTEGER NOT NULL DEFAULT 0,"
+            " unique_results INTEGER NOT NULL DEFAULT 0,"
+            " yield REAL NOT NULL DEFAULT 0,"
+            " last_run INTEGER NOT NULL DEFAULT 0,"
+            " overlaps TEXT NOT NULL DEFAULT '{}')" # Earlier query -> average share of this query's results it returned first
+        )
+        self._conn.execute("CREATE TABLE IF NOT EXISTS found (id TEXT PRIMARY KEY, run INTEGER NOT NULL)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS found_run ON found (run)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS runs ("
+            " run INTEGER PRIMARY KEY,"
+            " finished_at REAL,"
+            " requests INTEGER,"
+            " articles INTEGER,"
+            " unique_articles INTEGER,"
+            " new_articles INTEGER)"
+        )
+
+    def queries(self) -> Dict[str, Dict]:
+        """History per normalized query: {'requests', 'results', 'unique_results', 'yield', 'last_run', 'overlaps'}."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT query, requests, results, unique_results, yield, last_run, overlaps FROM queries"
+            ).fetchall()
+        return {
+            row[0]: {"requests": row[1], "results": row[2], "unique_results": row[3], "yield": row[4], "last_run": row[5], "overlaps": json.loads(row[6])}
+            for row in rows
+        }
+
+    def last_run(self) -> int:
+        """Number of the latest recorded run (0 before the first)."""
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(MAX(run), 0) FROM runs").fetchone()[0]
+
+    def runs(self, limit: int = 10) -> List[Dict]:
+        """The latest runs' totals, newest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT run, finished_at, requests, articles, unique_articles, new_articles FROM runs ORDER BY run DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [dict(zip(("run", "finished_at", "requests", "articles", "unique_articles", "new_articles"), row)) for row in rows]
+
+    def found_before(self, ids: List[str]) -> set:
+        """The IDs among `ids` that one of the last QUERY_SEEN_RUNS runs found."""
+        found = set()
+        with self._lock:
+            for start in range(0, len(ids), 500): # Stay below SQLite's bound-parameter limit
+                chunk = ids[start:start + 500]
+                found.update(row[0] for row in self._conn.execute(
+                    f"SELECT id FROM found WHERE id IN ({','.join('?' * len(chunk))})", chunk
+                ))
+        return found
+
+    def record_run(self, run: int, outcomes: Dict[str, Dict], requests: int, articles: int, found: List[str], new_articles: int):
+        """
+        Stores one run in a single transaction.
+
+        Args:
+            outcomes: Normalized query -> {'results': count, 'unique': count new to the run,
+                'fresh': count new to the run and to recent runs, 'overlaps': {earlier query:
+                share of the results it returned first}}, for queries actually requested
+            found: IDs of every article the run found
+        """
+        history = self.queries()
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                for key, outcome in outcomes.items():
+                    previous = history.get(key)
+                    if previous is None:
+                        average, overlaps = float(outcome["fresh"]), outcome["overlaps"]
+                        totals = (1, outcome["results"], outcome["unique"])
+                    else:
+                        average = QUERY_YIELD_DECAY * outcome["fresh"] + (1 - QUERY_YIELD_DECAY) * previous["yield"]
+                        overlaps = dict(previous["overlaps"])
+                        for other, share in outcome["overlaps"].items():
+                            overlaps[other] = QUERY_YIELD_DECAY * share + (1 - QUERY_YIELD_DECAY) * overlaps.get(other, share)
+                        totals = (previous["requests"] + 1, previous["results"] + outcome["results"], previous["unique_results"] + outcome["unique"])
+                    overlaps = {other: round(share, 3) for other, share in overlaps.items() if share >= 0.05}
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO queries (query, requests, results, unique_results, yield, last_run, overlaps) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (key, *totals, average, run, json.dumps(overlaps, sort_keys=True)),
+                    )
+                self._conn.executemany("INSERT OR REPLACE INTO found (id, run) VALUES (?, ?)", [(i, run) for i in found])
+                self._conn.execute("DELETE FROM found WHERE run <= ?", (run - QUERY_SEEN_RUNS,))
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO runs (run, finished_at, requests, articles, unique_articles, new_articles) VALUES (?, ?, ?, ?, ?, ?)",
+                    (run, time.time(), requests, articles, len(found), new_articles),
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+
+class QueryPlanner:
+    """
+    Builds a plan within a request budget from the syllabus candidates and their
+    history, runs it, and records the outcome for the next plan.
+
+    Args:
+        stats: Query history (default: QUERY_STATS_PATH)
+        budget: Serper requests per run
+        candidates: Candidate queries (default: syllabus_queries())
+    """
+
+    def __init__(self, stats: Optional[QueryStats] = None, budget: int = QUERY_BUDGET, candidates: Optional[List[PlannedQuery]] = None):
+        self.stats = stats or QueryStats()
+        self.budget = max(1, budget)
+        self.candidates = candidates if candidates is not None else syllabus_queries()
+
+    def plan(self) -> QueryPlan:
+        """The searches for the next run; deterministic for a given history and budget."""
+        history = self.stats.queries()
+        run = self.stats.last_run() + 1
+        order = {candidate.query: i for i, candidate in enumerate(self.candidates)}
+        candidates = [PlannedQuery(c.query, c.subject, list(c.leaves)) for c in self.candidates]
+
+        def is_recent(candidate: PlannedQuery) -> bool:
+            previous = history.get(query_key(candidate.query))
+            return previous is not None and run - previous["last_run"] < QUERY_REEXPLORE_RUNS
+
+        # Highest average yield first; the syllabus order breaks ties
+        known = sorted(
+            (c for c in candidates if is_recent(c)),
+            key=lambda c: (-history[query_key(c.query)]["yield"], order[c.query]),
+        )
+        plan = QueryPlan(queries=[])
+        ranked: List[PlannedQuery] = []
+        for candidate in known:
+            overlaps = history[query_key(candidate.query)]["overlaps"]
+            survivor = next((kept for kept in ranked if overlaps.get(query_key(kept.query), 0.0) >= QUERY_MERGE_OVERLAP), None)
+            if survivor is not None:
+                survivor.leaves.extend(candidate.leaves)
+                plan.merged[candidate.query] = survivor.query
+            elif history[query_key(candidate.query)]["yield"] < QUERY_MIN_YIELD:
+                plan.dropped.append(candidate.query)
+            else:
+                ranked.append(candidate)
+        # Never run first (in syllabus order), then the least recently run
+        explore = sorted(
+            (c for c in candidates if not is_recent(c)),
+            key=lambda c: (history[query_key(c.query)]["last_run"] if query_key(c.query) in history else -1, order[c.query]),
+        )
+
+        explore_slots = min(len(explore), math.ceil(self.budget * QUERY_EXPLORE_SHARE)) if ranked else len(explore)
+        chosen_explore = explore[:self.budget - len(ranked[:self.budget - explore_slots])]
+        chosen_ranked = ranked[:self.budget - len(chosen_explore)] # Unneeded explore slots go back to ranked queries
+        for candidate in chosen_ranked:
+            candidate.reason = "yield"
+        for candidate in chosen_explore:
+            candidate.reason = "explore"
+        plan.queries = chosen_ranked + chosen_explore
+        chosen = {c.query for c in plan.queries}
+        plan.deferred = [c.query for c in ranked + explore if c.query not in chosen]
+        return plan
+
+    def execute(
+        self,
+        plan: QueryPlan,
+        num_results: int = SERPER_NUM_RESULTS,
+        time_range: Optional[str] = None,
+        search: Optional[Callable[[str], List[Dict]]] = None,
+    ) -> List[Dict]:
+        """
+        Runs a plan's searches concurrently and records their yield and overlaps.
+
+        Args:
+            plan: From plan()
+            num_results: Articles requested per query
+            time_range: Serper recency filter ("h", "d", "w", "m" or "y")
+            search: Function from query text to article records (default: Serper via
+                tools.serper_client; answers from its cache are not counted as requests)
+
+        Returns:
+            The articles of all searches in plan order, each once (by article_id)
+        """
+        cached = set()
+        if search is None:
+            from tools.schemas import NewsArticle
+            from tools.serper_client import is_cached, search_news
+            cached = {q.query for q in plan.queries if is_cached(q.query, "in", "en", num_results, time_range)}
+            search = lambda query: [
+                NewsArticle.from_serper(article).to_record()
+                for article in search_news(query, "in", "en", num_results, time_range).get("news") or []
+            ]
+        if not plan.queries:
+            return []
+
+        def run(planned: PlannedQuery) -> Optional[List[Dict]]:
+            try:
+                return search(planned.query)
+            except Exception as e:
+                print(f"❌ News search failed for '{planned.query}': {e}")
+                return None # A failed search says nothing about the query
+
+        with ThreadPoolExecutor(max_workers=max(1, min(SERPER_MAX_WORKERS, len(plan.queries)))) as executor:
+            results = list(executor.map(run, plan.queries))
+        failed = {q.query for q, found in zip(plan.queries, results) if found is None}
+        results = [found or [] for found in results]
+
+        first_by: Dict[str, str] = {} # Article ID -> the query that returned it first
+        articles, outcomes = [], {}
+        found_before = self.stats.found_before(list({article_id(a) for found in results for a in found}))
+        for planned, found in zip(plan.queries, results):
+            key = query_key(planned.query)
+            ids = list(dict.fromkeys(article_id(article) for article in found))
+            overlaps: Dict[str, int] = {}
+            for i, article in zip(map(article_id, found), found):
+                if i not in first_by:
+                    first_by[i] = key
+                    articles.append(article)
+                elif first_by[i] != key:
+                    overlaps[first_by[i]] = overlaps.get(first_by[i], 0) + 1
+            if planned.query in cached or planned.query in failed: # A cached answer says nothing new either
+                continue
+            unique = [i for i in ids if first_by[i] == key]
+            earlier = {query_key(q.query) for q in plan.queries[:plan.queries.index(planned)] if q.query not in cached | failed}
+            outcomes[key] = {
+                "results": len(ids),
+                "unique": len(unique),
+                "fresh": sum(1 for i in unique if i not in found_before),
+                "overlaps": {other: overlaps.get(other, 0) / len(ids) if ids else 0.0 for other in earlier},
+            }
+        requests = len(outcomes)
+        new_articles = sum(1 for i in first_by if i not in found_before)
+        if outcomes: # Runs answered wholly from the cache (or failed) don't advance the history
+            self.stats.record_run(self.stats.last_run() + 1, outcomes, requests, sum(map(len, results)), list(first_by), new_articles)
+        per_request = f"{new_articles / requests:.1f}" if requests else "n/a"
+        print(
+            f"🧭 Query plan: {len(plan.queries)} searches ({len(cached)} cached, {len(failed)} failed) → {len(articles)} unique articles, "
+            f"{new_articles} not found before ({per_request} per request); "
+            f"{len(plan.merged)} merged, {len(plan.dropped)} low-yield dropped, {len(plan.deferred)} deferred."
+        )
+        return articles
+
+
+def planned_articles(budget: int = QUERY_BUDGET, num_results: int = SERPER_NUM_RESULTS, time_range: Optional[str] = None) -> List[Dict]:
+    """Convenience wrapper: plans and runs one budgeted set of syllabus searches."""
+    planner = QueryPlanner(budget=budget)
+    return planner.execute(planner.plan(), num_results, time_range)
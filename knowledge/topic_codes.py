@@ -0,0 +1,64 @@
+# knowledge/topic_codes.py
+import re
+from typing import Dict, Iterable, List
+
+from config.settings import UPSC_GS_TOPICS
+
+
+def short_topic_name(topic: str) -> str:
+    """'Indian Economy (Growth, ...)' -> 'Indian Economy'."""
+    return topic.split("(")[0].strip()
+
+
+def _initials(name: str) -> str:
+    return "".join(word[0] for word in re.findall(r"[A-Za-z]+", name) if word.lower() not in {"and", "of", "the", "in"}).upper()
+
+
+def _unique_codes(names: Iterable[str]) -> Dict[str, str]:
+    codes: Dict[str, str] = {}
+    used = set()
+    for name in names:
+        code = _initials(short_topic_name(name)) or "T"
+        candidate, n = code, 2
+        while candidate in used:
+            candidate, n = f"{code}{n}", n + 1
+        used.add(candidate)
+        codes[name] = candidate
+    return codes
+
+
+# Short, stable codes derived from the topic names, e.g. "Indian Economy (...)" -> "IE".
+# They only change if UPSC_GS_TOPICS itself is edited.
+TOPIC_CODES: Dict[str, str] = _unique_codes(UPSC_GS_TOPICS)
+CODE_TO_TOPIC: Dict[str, str] = {code: topic for topic, code in TOPIC_CODES.items()}
+
+
+def topic_legend() -> str:
+    """One-line-per-topic legend for the tagger's system prompt."""
+    return "\n".join(f"{code} = {short_topic_name(topic)}" for topic, code in TOPIC_CODES.items())
+
+
+def legend_prompt() -> str:
+    """The legend as appended to the tagger's backstory; it goes out with every tagger call."""
+    return f"\nUPSC GS topic codes:\n{topic_legend()}"
+
+
+def encode_topics(topics: Iterable[str]) -> List[str]:
+    """Full UPSC_GS_TOPICS entries -> codes (unknown entries are passed through)."""
+    return [TOPIC_CODES.get(topic, topic) for topic in topics]
+
+
+def decode_topics(values: Iterable[str]) -> List[str]:
+    """
+    Maps tagger output back to short topic names. Accepts codes as well as full or
+    short names, so older outputs and the rule-based tags decode the same way.
+    Unrecognized values are dropped.
+    """
+    by_short = {short_topic_name(t).lower(): t for t in UPSC_GS_TOPICS}
+    decoded = []
+    for value in values:
+        value = str(value).strip()
+        topic = CODE_TO_TOPIC.get(value.upper()) or by_short.get(short_topic_name(value).lower())
+        if topic is not None and short_topic_name(topic) not in decoded:
+            decoded.append(short_topic_name(topic))
+    return decoded
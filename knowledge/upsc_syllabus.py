@@ -191,4 +191,57 @@ UPSC_CATEGORIES = {
             "Application of ethical principles to real-life situations"
         ]
     }
-}
\ No newline at end of file
+}
+
+# Which of the ten UPSC_GS_TOPICS (config/settings.py, by position) each syllabus subject feeds into.
+# Subjects mapped to None (e.g. Current_Events) are too broad to classify by.
+SUBJECT_GS_TOPIC = {
+    "History": 6,
+    "Geography": 5,
+    "Polity_and_Governance": 1,
+    "Economy_and_Social_Development": 0,
+    "Environment_and_Ecology": 4,
+    "Science_and_Technology": 3,
+    "Current_Events": None,
+    "Governance": 1,
+    "Constitution": 1,
+    "Polity": 1,
+    "Social_Justice": 7,
+    "International_Relations": 2,
+    "Economy": 0,
+    "Agriculture": 0,
+    "Biodiversity_and_Environment": 4,
+    "Disaster_Management": 8,
+    "Internal_Security": 8,
+    "Ethics_and_Human_Interface": 9,
+    "Attitude": 9,
+    "Aptitude_and_Foundational_Values": 9,
+    "Emotional_Intelligence": 9,
+    "Contributions_of_Thinkers_and_Philosophers": 9,
+    "Public_Civil_Service_Values_and_Ethics_in_Public_Administration": 9,
+    "Probity_in_Governance": 9,
+    "Case_Studies": 9,
+}
+
+# Everyday news vocabulary that the formal syllabus wording doesn't contain, per subject
+SUBJECT_NEWS_KEYWORDS = {
+    "Economy": ["GDP", "inflation", "RBI", "repo rate", "monetary policy", "fiscal deficit", "GST", "Union Budget",
+                "FDI", "exports", "imports", "stock market", "SEBI", "banking", "MSME", "disinvestment", "World Investment Report"],
+    "Agriculture": ["farmers", "kharif", "rabi", "crop", "fertiliser", "fertilizer", "procurement", "FCI"],
+    "Polity": ["Supreme Court", "High Court", "Lok Sabha", "Rajya Sabha", "Election Commission", "Governor",
+               "ordinance", "bill passed", "constitutional amendment", "Article 370", "fundamental rights"],
+    "Governance": ["Cabinet approves", "scheme", "ministry", "NITI Aayog", "lateral entry", "Right to Information"],
+    "International_Relations": ["bilateral", "summit", "G20", "G7", "BRICS", "SCO", "QUAD", "United Nations", "UNSC",
+                                "WTO", "IMF", "World Bank", "FATF", "foreign minister", "treaty", "diplomatic", "Indo-Pacific"],
+    "Science_and_Technology": ["ISRO", "satellite", "launch vehicle", "artificial intelligence", "semiconductor", "quantum",
+                               "vaccine", "genome", "DRDO", "5G", "missile test"],
+    "Biodiversity_and_Environment": ["wildlife", "tiger reserve", "forest cover", "emissions", "net zero", "COP", "UNFCCC",
+                                     "air quality", "heatwave", "wetland", "Ramsar", "green hydrogen", "land degradation"],
+    "Geography": ["monsoon", "cyclone", "earthquake", "glacier", "river", "strait", "El Nino", "landslide"],
+    "History": ["archaeological", "excavation", "heritage site", "UNESCO", "freedom fighter", "inscription", "dynasty"],
+    "Social_Justice": ["poverty", "malnutrition", "literacy", "school education", "inclusive education", "healthcare",
+                       "Scheduled Castes", "Scheduled Tribes", "Other Backward Classes", "women empowerment", "population"],
+    "Internal_Security": ["terror", "Naxal", "insurgency", "cyber attack", "border security", "BSF", "CRPF", "infiltration", "drone attack"],
+    "Disaster_Management": ["NDMA", "flood", "relief operations", "rescue operations", "disaster"],
+    "Probity_in_Governance": ["corruption", "Lokpal", "whistleblower", "integrity"],
+}
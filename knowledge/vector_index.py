@@ -0,0 +1,277 @@
+# knowledge/vector_index.py
+import json
+import math
+import os
+import re
+import threading
+import zlib
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from config.settings import VECTOR_INDEX_DIR, VECTOR_DIM, VECTOR_EMBEDDING_MODEL, LINK_TOP_K
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this to was were will with "
+    "upsc india indian news article".split()
+)
+
+
+def summary_text(record: Dict) -> str:
+    """Text embedded for linking: title, summary (or description) and UPSC topics."""
+    topics = " ".join(record.get("UPSC_Topics") or [])
+    body = record.get("Summary") or record.get("Description") or ""
+    return f"{record.get('Title', '')} {body} {topics}"
+
+
+class HashedTfidfEmbedder:
+    """
+    Dependency-free embedder: hashed unigram+bigram counts weighted by an IDF
+    that is learned incrementally from the indexed documents.
+
+    The IDF changes with every document added, so stored vectors hold only the
+    term weights and the current IDF is applied when scoring (see term_weights()).
+    Every row is therefore compared under the same, up-to-date IDF instead of the
+    one in force when it happened to be appended.
+    """
+
+    name = "hashed-tf" # Stored rows are unweighted; bumped from "hashed-tfidf" when IDF moved to query time
+
+    def __init__(self, dim: int = VECTOR_DIM):
+        self.dim = dim
+        self.doc_freq = np.zeros(dim, dtype=np.float64)
+        self.num_docs = 0
+
+    def _features(self, text: str) -> Counter:
+        tokens = [t for t in _TOKEN_RE.findall(text.lower()) if t not in _STOPWORDS]
+        grams = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        return Counter(zlib.crc32(g.encode("utf-8")) for g in grams)
+
+    def embed(self, texts: Sequence[str], update_idf: bool = False) -> np.ndarray:
+        """Unit-length term vectors, without IDF; `update_idf` counts the texts as indexed documents."""
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            features = self._features(text)
+            buckets = set()
+            for h, count in features.items():
+                bucket = h % self.dim
+                sign = 1.0 if (h >> 31) & 1 else -1.0 # Sign hashing keeps collisions from only adding up
+                vectors[row, bucket] += sign * (1.0 + math.log(count))
+                buckets.add(bucket)
+            if update_idf:
+                self.doc_freq[list(buckets)] += 1
+                self.num_docs += 1
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    def term_weights(self) -> np.ndarray:
+        """Current per-dimension IDF, applied to stored and query vectors alike at scoring time."""
+        return (np.log((1 + self.num_docs) / (1 + self.doc_freq)) + 1.0).astype(np.float32)
+
+    def state(self) -> dict:
+        return {"num_docs": self.num_docs, "doc_freq": self.doc_freq.tolist()}
+
+    def load_state(self, state: dict):
+        self.num_docs = state.get("num_docs", 0)
+        if len(state.get("doc_freq", [])) == self.dim:
+            self.doc_freq = np.array(state["doc_freq"], dtype=np.float64)
+
+
+class SentenceTransformerEmbedder:
+    """CPU sentence-transformers model, used when VECTOR_EMBEDDING_MODEL is set and installed."""
+
+    def __init__(self, model_name: str):
+        from sentence_transformers import SentenceTransformer
+        self.name = model_name
+        self.model = SentenceTransformer(model_name, device="cpu")
+        self.dim = self.model.get_sentence_embedding_dimension()
+
+    def embed(self, texts: Sequence[str], update_idf: bool = False) -> np.ndarray:
+        return self.model.encode(list(texts), normalize_embeddings=True, convert_to_numpy=True).astype(np.float32)
+
+    def term_weights(self) -> None:
+        return None # Dense embeddings are final as stored
+
+    def state(self) -> dict:
+        return {}
+
+    def load_state(self, state: dict):
+        pass
+
+
+def get_embedder():
+    """Returns the configured embedder, falling back to hashed TF-IDF."""
+    if VECTOR_EMBEDDING_MODEL:
+        try:
+            return SentenceTransformerEmbedder(VECTOR_EMBEDDING_MODEL)
+        except ImportError:
+            print("⚠️  sentence-transformers is not installed; using hashed TF-IDF embeddings.")
+    return HashedTfidfEmbedder()
+
+
+class VectorIndex:
+    """
+    Persistent, append-only nearest-neighbour index over article summaries.
+
+    Vectors live in a raw float32 file that is memory-mapped for queries, with one
+    JSON metadata line per row. Adding articles appends to both files, so the index
+    grows incrementally across runs; a query is a single matrix-vector product.
+    Rows are never re-embedded: a hashed TF-IDF index stores term vectors and applies
+    the embedder's current IDF when scoring, with the weighted row norms cached
+    until the next add().
+    """
+
+    def __init__(self, directory: str = VECTOR_INDEX_DIR, embedder=None):
+        self.directory = directory
+        self.embedder = embedder or get_embedder()
+        self._vectors_path = os.path.join(directory, "vectors.f32")
+        self._meta_path = os.path.join(directory, "meta.jsonl")
+        self._state_path = os.path.join(directory, "index.json")
+        self._lock = threading.Lock()
+        self._matrix: Optional[np.ndarray] = None
+        self._row_norms: Optional[np.ndarray] = None
+        self.meta: List[Dict] = []
+        self._ids = set()
+
+        os.makedirs(directory, exist_ok=True)
+        if os.path.exists(self._state_path):
+            with open(self._state_path, encoding="utf-8") as f:
+                state = json.load(f)
+            if state.get("embedder") != self.embedder.name or state.get("dim") != self.embedder.dim:
+                raise ValueError(
+                    f"Vector index at {directory} was built with {state.get('embedder')} ({state.get('dim')} dims); "
+                    f"rebuild it or configure the same embedder."
+                )
+            self.embedder.load_state(state.get("embedder_state", {}))
+        if os.path.exists(self._meta_path):
+            with open(self._meta_path, encoding="utf-8") as f:
+                self.meta = [json.loads(line) for line in f if line.strip()]
+        # Keep vectors and metadata aligned if a previous run died between the two appends
+        rows = self._stored_rows()
+        if len(self.meta) > rows:
+            self.meta = self.meta[:rows]
+            with open(self._meta_path, "w", encoding="utf-8") as f:
+                f.writelines(json.dumps(m, ensure_ascii=False) + "\n" for m in self.meta)
+        elif rows > len(self.meta):
+            with open(self._vectors_path, "r+b") as f:
+                f.truncate(len(self.meta) * 4 * self.embedder.dim)
+        self._ids = {m["id"] for m in self.meta}
+
+    def __len__(self) -> int:
+        return len(self.meta)
+
+    def _stored_rows(self) -> int:
+        if not os.path.exists(self._vectors_path):
+            return 0
+        return os.path.getsize(self._vectors_path) // (4 * self.embedder.dim)
+
+    def _load_matrix(self) -> np.ndarray:
+        if self._matrix is None or len(self._matrix) != len(self.meta):
+            if not self.meta:
+                self._matrix = np.zeros((0, self.embedder.dim), dtype=np.float32)
+            else:
+                self._matrix = np.memmap(self._vectors_path, dtype=np.float32, mode="r", shape=(len(self.meta), self.embedder.dim))
+        return self._matrix
+
+    def _weighted_norms(self, matrix: np.ndarray, weights: np.ndarray, chunk: int = 65536) -> np.ndarray:
+        """|d*w| for every stored row, cached until the next add() changes rows or IDF."""
+        if self._row_norms is None:
+            squared = np.square(weights)
+            norms = np.concatenate([np.sqrt(np.square(matrix[i:i + chunk]) @ squared) for i in range(0, len(matrix), chunk)])
+            self._row_norms = np.maximum(norms, 1e-12)
+        return self._row_norms
+
+    def add(self, records: Iterable[Dict]) -> int:
+        """
+        Appends records (dicts with 'Title', 'URL' and 'Summary' or 'Description') to the index.
+        Records whose URL is already indexed are skipped.
+
+        Returns:
+            Number of records added
+        """
+        with self._lock:
+            fresh, seen = [], set()
+            for record in records:
+                key = record.get("URL") or record.get("Title", "")
+                if key and key not in self._ids and key not in seen:
+                    fresh.append(record)
+                    seen.add(key)
+            if not fresh:
+                return 0
+            vectors = self.embedder.embed([summary_text(r) for r in fresh], update_idf=True)
+            with open(self._vectors_path, "ab") as f:
+                f.write(vectors.astype(np.float32).tobytes())
+            with open(self._meta_path, "a", encoding="utf-8") as f:
+                for record in fresh:
+                    meta = {
+                        "id": record.get("URL") or record.get("Title", ""),
+                        "Title": record.get("Title", "N/A"),
+                        "URL": record.get("URL", "N/A"),
+                        "Date": record.get("Date", ""),
+                        "UPSC_Topics": record.get("UPSC_Topics", []),
+                    }
+                    f.write(json.dumps(meta, ensure_ascii=False) + "\n")
+                    self.meta.append(meta)
+                    self._ids.add(meta["id"])
+            with open(self._state_path, "w", encoding="utf-8") as f:
+                json.dump({"embedder": self.embedder.name, "dim": self.embedder.dim, "embedder_state": self.embedder.state()}, f)
+            self._matrix = None
+            self._row_norms = None
+            return len(fresh)
+
+    def query(self, record: Dict, k: int = LINK_TOP_K, min_score: float = 0.1) -> List[Dict]:
+        """
+        Finds the k most similar indexed articles to `record`, excluding the record itself.
+
+        Returns:
+            Metadata dicts ('Title', 'URL', 'Date', 'UPSC_Topics') with an added 'Score', best first
+        """
+        return self.query_many([record], k, min_score)[0]
+
+    def query_many(self, records: Sequence[Dict], k: int = LINK_TOP_K, min_score: float = 0.1) -> List[List[Dict]]:
+        """
+        Batched `query`: scores every record against the archive in one pass over the
+        memory-mapped matrix, which is what makes per-article lookups sub-millisecond.
+        """
+        with self._lock:
+            matrix = self._load_matrix()
+            if not len(matrix) or not records:
+                return [[] for _ in records]
+            vectors = self.embedder.embed([summary_text(r) for r in records])
+            weights = self.embedder.term_weights()
+            if weights is None:
+                all_scores = vectors @ matrix.T
+            else:
+                # Cosine similarity of the IDF-weighted vectors: (q*w)·(d*w) / |q*w| |d*w|
+                queries = vectors * weights
+                queries /= np.maximum(np.linalg.norm(queries, axis=1, keepdims=True), 1e-12)
+                all_scores = (queries * weights) @ matrix.T / self._weighted_norms(matrix, weights)
+            wanted = min(k + 1, matrix.shape[0])
+            results = []
+            for record, scores in zip(records, all_scores):
+                own_id = record.get("URL") or record.get("Title", "")
+                top = np.argpartition(-scores, wanted - 1)[:wanted]
+                neighbours = []
+                for row in top[np.argsort(-scores[top])]:
+                    meta = self.meta[row]
+                    if meta["id"] == own_id or scores[row] < min_score:
+                        continue
+                    neighbours.append({key: meta[key] for key in ("Title", "URL", "Date", "UPSC_Topics")} | {"Score": round(float(scores[row]), 3)})
+                    if len(neighbours) == k:
+                        break
+                results.append(neighbours)
+            return results
+
+
+_indexes: Dict[str, VectorIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_vector_index(directory: str = VECTOR_INDEX_DIR) -> VectorIndex:
+    """The process-wide index for a directory, so its metadata is read from disk once."""
+    with _indexes_lock:
+        if directory not in _indexes:
+            _indexes[directory] = VectorIndex(directory)
+        return _indexes[directory]
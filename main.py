@@ -2,7 +2,7 @@
 import os
 import sys
 from dotenv import load_dotenv
-from typing import List, Dict
+from typing import List, Dict, Optional
 import time # Import time module
 import json # Import json for parsing agent outputs
 
@@ -15,88 +15,14 @@ project_root = os.path.dirname(os.path.abspath(__file__))
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
-# Import necessary components
-from agents.news_fetcher_agent import NewsFetcherAgents
-from agents.tagger_agent import TaggerAgents
-from agents.summarizer_agent import SummarizerAgents
-from agents.linker_agent import LinkerAgents
-from tools.search_tools import upsc_news_search_tool
-from crewai import Task, Crew, Process
-from config.settings import UPSC_GS_TOPICS, OUTPUT_DIR
+import argparse
+from config.settings import OUTPUT_DIR, SERPER_CACHE_TTL_SECONDS, PIPELINE_MODE, PIPELINE_MAX_WORKERS, PIPELINE_BATCH_SIZE, PIPELINE_RESUME, PIPELINE_PROGRESSIVE, DEDUP_INDEX_PATH, TRACING_ENABLED, EXTRACT_ENABLED, ARCHIVE_INDEX_ENABLED, SEGMENT_ARCHIVE_ENABLED, FEEDS_ENABLED, CLASSIFIER_ENABLED, UPSC_GS_TOPICS
 
+# CrewAI, LangChain and the agents are imported inside the functions that use them,
+# so lightweight commands such as `python main.py fetch` start without loading them.
 
-# --- Utility Functions ---
-def parse_news_result(result_string: str) -> List[Dict]:
-    """
-    Parses the news search tool result string into a list of dictionaries.
-    Assumes each news item is clearly delineated and has Title, Source, Date, Description, URL.
-    This parsing might need to be robustified based on actual search tool output format.
-    """
-    news_items = []
-    current_item = {}
-    lines = result_string.strip().split('\n')
-
-    for line in lines:
-        line = line.strip()
-        if not line: # Skip empty lines
-            continue
-        
-        # Check for numbered list start or explicit "Title:"
-        if line.startswith(tuple(f"{i}. " for i in range(1, 11))) or line.startswith("Title:"): # Handles "1. ", "2. ", etc., up to 10
-            if current_item: # Save previous item if exists
-                news_items.append(current_item)
-            current_item = {"Title": line.replace(f"{line.split('.')[0]}.", "", 1).replace("Title:", "").strip()} # Remove number and dot or "Title:"
-        elif line.startswith("Source:"):
-            current_item["Source"] = line.replace("Source:", "").strip()
-        elif line.startswith("Date:"):
-            current_item["Date"] = line.replace("Date:", "").strip()
-        elif line.startswith("Description:"):
-            current_item["Description"] = line.replace("Description:", "").strip()
-        elif line.startswith("URL:"):
-            current_item["URL"] = line.replace("URL:", "").strip()
-        # Handle multi-line descriptions if they don't start with a new key
-        elif current_item and "Description" in current_item and not any(line.startswith(key) for key in ["Title:", "Source:", "Date:", "URL:"] + [f"{i}. " for i in range(1,11)]):
-            current_item["Description"] += " " + line.strip()
-
-    if current_item: # Add the last item
-        news_items.append(current_item)
-    return news_items
-
-
-def format_news_for_tagging(news_items: List[Dict]) -> str:
-    """Formats parsed news items into a single string for the TaggerAgent."""
-    formatted_string = ""
-    for i, item in enumerate(news_items):
-        formatted_string += f"Article {i+1}:\n"
-        formatted_string += f"Title: {item.get('Title', 'N/A')}\n"
-        formatted_string += f"Description: {item.get('Description', 'N/A')}\n"
-        formatted_string += f"URL: {item.get('URL', 'N/A')}\n"
-        formatted_string += "--------------------\n"
-    return formatted_string
-
-def format_news_for_summarization(news_items: List[Dict]) -> str:
-    """Formats parsed news items into a single string for the SummarizerAgent."""
-    formatted_string = ""
-    for i, item in enumerate(news_items):
-        formatted_string += f"Article {i+1} Title: {item.get('Title', 'N/A')}\n"
-        formatted_string += f"Article {i+1} Content (Description): {item.get('Description', 'N/A')}\n"
-        formatted_string += f"Article {i+1} Source: {item.get('Source', 'N/A')}\n"
-        formatted_string += f"Article {i+1} URL: {item.get('URL', 'N/A')}\n"
-        formatted_string += "---\n"
-    return formatted_string
-
-def format_summaries_for_linking(summaries_with_tags: List[Dict]) -> str:
-    """Formats summaries and tags into a single string for the LinkerAgent."""
-    formatted_string = "Summarized and Tagged Articles for Linking:\n"
-    for i, item in enumerate(summaries_with_tags):
-        formatted_string += f"Article {i+1}:\n"
-        formatted_string += f"Title: {item.get('Title', 'N/A')}\n"
-        formatted_string += f"Summary: {item.get('Summary', 'N/A')}\n"
-        formatted_string += f"UPSC Topics: {', '.join(item.get('UPSC_Topics', ['N/A']))}\n"
-        formatted_string += f"URL: {item.get('URL', 'N/A')}\n"
-        formatted_string += "--------------------\n"
-    return formatted_string
 
+# --- Utility Functions ---
 def save_output_to_file(filename: str, content: str):
     """Saves the given content to a file in the OUTPUT_DIR."""
     filepath = os.path.join(OUTPUT_DIR, filename)
@@ -107,11 +33,83 @@ def save_output_to_file(filename: str, content: str):
     except IOError as e:
         print(f"❌ Error saving output to file {filepath}: {e}")
 
+def save_store_outputs(store) -> str:
+    """
+    Rebuilds the tagged, summaries and links output files from a pipeline.article_store.ArticleStore,
+    covering every article seen within ARTICLE_STORE_WINDOW_HOURS.
+    Returns the rebuilt links text.
+    """
+    save_output_to_file("upsc_news_tagged.json", json.dumps(store.tagged_articles(), indent=2, ensure_ascii=False))
+    save_output_to_file("upsc_news_summaries.json", json.dumps(store.summaries(), indent=2, ensure_ascii=False))
+    links = "\n\n".join(
+        f"=== Links for {count} article(s), {time.strftime('%Y-%m-%d %H:%M', time.localtime(created_at))} ===\n{report}"
+        for created_at, count, report in store.link_reports()
+    )
+    save_output_to_file("upsc_news_links.txt", links)
+    return links
+
+
+def stream_summaries_to_file(news_items: List[Dict]) -> str:
+    """
+    Summarizes with streamed calls, appending each article's summary to
+    OUTPUT_DIR/upsc_news_summaries.jsonl the moment it is complete.
+    Returns the summaries as a JSON array, the same shape as the summarizer crew's output.
+    """
+    from pipeline.fanout import stream_summaries
+    from pipeline.progressive import ProgressiveWriter
+
+    path = os.path.join(OUTPUT_DIR, "upsc_news_summaries.jsonl")
+    start = time.perf_counter()
+    with ProgressiveWriter(path) as writer:
+        def on_summary(summary: Dict):
+            writer.write_record(summary)
+            print(f"📝 [{time.perf_counter() - start:6.2f}s] {summary.get('Title', 'N/A')}")
+        summaries = stream_summaries(news_items, on_summary)
+    print(f"✅ {writer.records} summaries streamed to: {path} (first after {writer.first_write_s or 0.0:.2f}s)")
+    return json.dumps(summaries, ensure_ascii=False)
+
+
+def stream_links_to_file(linker_agent, content: str) -> str:
+    """
+    Runs the linker with a streamed call, echoing its report and appending it to
+    OUTPUT_DIR/upsc_news_links_latest.txt as it is generated. Returns the report.
+    """
+    from agents.router import model_router
+    from pipeline.progressive import ProgressiveWriter
+    from pipeline.tasks import build_prompt, LINK_DESCRIPTION, LINK_EXPECTED_OUTPUT
+
+    path = os.path.join(OUTPUT_DIR, "upsc_news_links_latest.txt")
+    parts = []
+    with ProgressiveWriter(path) as writer:
+        for text in model_router.stream("linker", linker_agent, build_prompt(LINK_DESCRIPTION, LINK_EXPECTED_OUTPUT, content), "link"):
+            writer.write_text(text)
+            parts.append(text)
+            print(text, end="", flush=True)
+    print(f"\n✅ Link report streamed to: {path}")
+    return "".join(parts)
+
+
+def archive_processed(articles: List[Dict], tagged: List[Dict], summaries: List[Dict]):
+    """Adds a run's processed articles to the search index and the segment archive (whichever are enabled)."""
+    if not (ARCHIVE_INDEX_ENABLED or SEGMENT_ARCHIVE_ENABLED):
+        return
+    from pipeline.archive_index import merge_processed
+    records = merge_processed(articles, tagged, summaries)
+    if ARCHIVE_INDEX_ENABLED:
+        from pipeline.archive_index import ArchiveIndex
+        ArchiveIndex().add(records)
+    if SEGMENT_ARCHIVE_ENABLED:
+        from pipeline.segments import SegmentArchive
+        archive = SegmentArchive()
+        archive.append(records)
+        archive.close()
+
 
 # --- Test Functions ---
 def test_news_fetcher_agent_initialization():
     print("Testing NewsFetcherAgent initialization...")
     try:
+        from agents.news_fetcher_agent import NewsFetcherAgents
         agent_instance = NewsFetcherAgents()
         _ = agent_instance.news_fetcher_agent()
         print("✅ NewsFetcherAgent initialized successfully.")
@@ -123,6 +121,7 @@ def test_news_fetcher_agent_initialization():
 def test_tagger_agent_initialization():
     print("Testing TaggerAgent initialization...")
     try:
+        from agents.tagger_agent import TaggerAgents
         agent_instance = TaggerAgents()
         _ = agent_instance.upsc_tagger_agent()
         print("✅ TaggerAgent initialized successfully.")
@@ -134,6 +133,7 @@ def test_tagger_agent_initialization():
 def test_summarizer_agent_initialization():
     print("Testing SummarizerAgent initialization...")
     try:
+        from agents.summarizer_agent import SummarizerAgents
         agent_instance = SummarizerAgents()
         _ = agent_instance.summarizer_agent()
         print("✅ SummarizerAgent initialized successfully.")
@@ -145,6 +145,7 @@ def test_summarizer_agent_initialization():
 def test_linker_agent_initialization():
     print("Testing LinkerAgent initialization...")
     try:
+        from agents.linker_agent import LinkerAgents
         agent_instance = LinkerAgents()
         _ = agent_instance.linker_agent()
         print("✅ LinkerAgent initialized successfully.")
@@ -159,6 +160,7 @@ def test_tool_directly():
     try:
         # This is a general query, not UPSC specific, to test tool functionality
         test_query = "latest news headlines"
+        from tools.search_tools import upsc_news_search_tool
         result = upsc_news_search_tool._run(query=test_query)
         if result and "No news articles found" not in result:
             print(f"✅ Serper API tool returned results for '{test_query}'. Snippet: {result[:200]}...")
@@ -171,11 +173,51 @@ def test_tool_directly():
         return False
 
 # --- CrewAI Pipeline ---
-def run_full_news_processing_crew():
+def run_crew_stage(agent, task) -> str:
+    """Runs a single task as its own crew and returns the task's text output."""
+    from crewai import Crew, Process
+    from pipeline.tasks import task_output_text
+    Crew(agents=[agent], tasks=[task], process=Process.sequential, verbose=True, share_crew=False).kickoff()
+    return task_output_text(task)
+
+def run_full_news_processing_crew(resume: bool = PIPELINE_RESUME, news_items: Optional[List[Dict]] = None, progressive: bool = PIPELINE_PROGRESSIVE):
+    """
+    Runs fetch → tag → summarize → link as separate crew stages, each checkpointed to
+    OUTPUT_DIR/checkpoints with a hash of its input. Only articles that are new or changed
+    since earlier runs go through the LLM stages, and the output files are rebuilt from the
+    article store. With `resume`, stages whose input is unchanged are served from their
+    checkpoint, so a failed run restarts at the stage that failed.
+    Pre-fetched `news_items` (e.g. from fetch_articles) replace the fetcher stage.
+    With `progressive`, the summarizer starts alongside the tagger and, like the linker,
+    streams its output into OUTPUT_DIR as each article's record completes; the streamed
+    linker gets each article's 'See_Also' neighbours from the archive inline.
+    """
     print("\n🚀 Running Full UPSC News Processing Pipeline...")
     print("=" * 50)
 
     try:
+        from agents.news_fetcher_agent import NewsFetcherAgents
+        from agents.tagger_agent import TaggerAgents
+        from agents.summarizer_agent import SummarizerAgents
+        from agents.linker_agent import LinkerAgents
+        from agents.llm import llm_cache_stats
+        from agents.router import FAST, STRONG, route_tier
+        from knowledge.classifier import get_classifier
+        from knowledge.vector_index import get_vector_index
+        from tools.serper_client import serper_cache
+        from tools.schemas import ArticleSummary, TaggedArticle, match_outputs, parse_records
+        from tools.tracing import tracer
+        from pipeline.article_store import ArticleStore
+        from pipeline.checkpoint import StageCheckpoints, time_window
+        from pipeline.dedup import NearDuplicateIndex, dedupe_articles
+        from pipeline.fanout import rejected_tags
+        from pipeline.formatting import parse_news_result, format_news_for_tagging, format_news_for_summarization, format_summaries_for_linking
+        from tools.feed_collector import commit_feed_state
+        from pipeline.tasks import (
+            build_fetch_task, build_tag_task, build_summarize_task, build_link_task, build_tag_description,
+            FETCH_DESCRIPTION, FETCH_EXPECTED_OUTPUT, SUMMARIZE_DESCRIPTION, LINK_DESCRIPTION,
+        )
+
         # Initialize Agents
         fetcher_agents = NewsFetcherAgents()
         tagger_agents = TaggerAgents()
@@ -187,107 +229,612 @@ def run_full_news_processing_crew():
         summarizer_agent = summarizer_agents.summarizer_agent()
         linker_agent = linker_agents.linker_agent()
 
-        # Define Tasks
-        fetch_news_task = Task(
-            description=(
-                "Fetch the top 5-10 latest news articles relevant to UPSC Civil Services Examination "
-                "from specified Indian news sources. Focus on current events, policy updates, "
-                "economic developments, international relations, and environmental news. "
-                "Compile results with Title, Source, Date, Description, and URL."
-            ),
-            expected_output="A formatted string containing the Title, Source, Date, Description, and URL for each of the fetched news articles.",
-            agent=fetcher_agent,
-        )
+        checkpoints = StageCheckpoints(resume=resume)
+        store = ArticleStore()
 
-        tag_news_task = Task(
-            description=(
-                "Given the raw news articles, classify each article into one or more "
-                "relevant UPSC General Studies topics from the predefined list. "
-                f"UPSC Topics: {UPSC_GS_TOPICS}. "
-                "Return a JSON string where each item includes 'Title', 'Description', 'URL', and 'UPSC_Topics' (a list of strings)."
-                "Example: [{\"Title\": \"...\", \"Description\": \"...\", \"URL\": \"...\", \"UPSC_Topics\": [\"Indian Economy\"]}]"
-            ),
-            expected_output="A JSON string representing a list of dictionaries, each with 'Title', 'Description', 'URL', and 'UPSC_Topics' (list of strings).",
-            agent=tagger_agent,
-            context=[fetch_news_task] # This task depends on the output of fetch_news_task
-        )
+        print("Starting crew execution...")
+        start_time = time.time()
+        if news_items is None:
+            # Today's news is not yesterday's: a fetch is reused only within one Serper cache window
+            fetched = checkpoints.run(
+                "fetch", [FETCH_DESCRIPTION, FETCH_EXPECTED_OUTPUT, time_window(SERPER_CACHE_TTL_SECONDS)],
+                lambda: run_crew_stage(fetcher_agent, build_fetch_task(fetcher_agent)),
+            )
+            news_items = dedupe_articles(parse_news_result(fetched), history=NearDuplicateIndex(DEDUP_INDEX_PATH))
+        pending, _ = store.diff(news_items)
+        commit_feed_state() # Feed items are in the article store now, so their high-water marks can move
+        if pending and EXTRACT_ENABLED:
+            from tools.article_extractor import extract_bodies
+            pending = extract_bodies(pending)
+
+        if pending:
+            # The summarizer reads the articles themselves (bodies included), not the tagger's echo of them
+            summarize_content = format_news_for_summarization(pending)
+            summary_future = None
+            if progressive:
+                # Summaries do not depend on the tags, so they stream while the tagger crew runs
+                from concurrent.futures import ThreadPoolExecutor
+                summary_executor = ThreadPoolExecutor(max_workers=1)
+                summary_future = summary_executor.submit(
+                    checkpoints.run, "summarize", [SUMMARIZE_DESCRIPTION, summarize_content],
+                    lambda: stream_summaries_to_file(pending),
+                )
+                summary_executor.shutdown(wait=False)
+
+            # Articles the syllabus pre-classifier is confident about skip the tagger;
+            # the rest are tagged with only their candidate topics in the prompt
+            tagged, to_tag, candidates = [], [], set()
+            classifier = get_classifier() if CLASSIFIER_ENABLED else None
+            for article in pending:
+                if classifier is not None:
+                    result = classifier.classify_article(article)
+                    if result.confident:
+                        tagged.append({**article, "UPSC_Topics": result.topics, "Tagged_By": "rules"})
+                        continue
+                    candidates.update(result.candidates)
+                to_tag.append(article)
+            tracer.count("upsc_rule_tagged_articles_total", len(pending) - len(to_tag))
+
+            if to_tag:
+                # Each stage sees only the new or changed articles, passed inline from the previous stage
+                tag_description = build_tag_description([topic for topic in UPSC_GS_TOPICS if topic in candidates] or UPSC_GS_TOPICS)
+                tag_content = format_news_for_tagging(to_tag)
+                tag_output = checkpoints.run(
+                    "tag", [tag_description, tag_content],
+                    lambda: run_crew_stage(tagger_agent, build_tag_task(tagger_agent, content=tag_content, description=tag_description)),
+                )
+                # Results are stored under the fetched article's URL, not whatever URL the model echoed back
+                tag_outputs = match_outputs(to_tag, [record.to_record() for record in parse_records(tag_output, TaggedArticle)])
+                if route_tier("tagger", "tag") == FAST:
+                    # Articles the fast model tagged badly (or not at all) are redone by the strong model
+                    retry = rejected_tags(to_tag, tag_output)
+                    if retry:
+                        print(f"⤴️  Escalating tagging of {len(retry)} article(s) to the strong model.")
+                        strong_tagger = TaggerAgents(tier=STRONG).upsc_tagger_agent()
+                        retry_content = format_news_for_tagging(retry)
+                        retry_output = checkpoints.run(
+                            "tag_escalated", [tag_description, retry_content],
+                            lambda: run_crew_stage(strong_tagger, build_tag_task(strong_tagger, content=retry_content, description=tag_description)),
+                        )
+                        retry_outputs = match_outputs(retry, [record.to_record() for record in parse_records(retry_output, TaggedArticle)])
+                        redone = {article.get("URL"): output for article, output in zip(retry, retry_outputs) if output is not None}
+                        tag_outputs = [redone.get(article.get("URL"), output) for article, output in zip(to_tag, tag_outputs)]
+                tagged += [
+                    {**article, "UPSC_Topics": output.get("UPSC_Topics", []), "Tagged_By": "llm"}
+                    for article, output in zip(to_tag, tag_outputs) if output is not None
+                ]
+            if not tagged:
+                print("❌ Tagger output contained no valid tagged articles.")
+            store.record_tags(tagged)
+
+            if summary_future is not None:
+                summary_output = summary_future.result()
+            else:
+                summary_output = checkpoints.run(
+                    "summarize", [SUMMARIZE_DESCRIPTION, summarize_content],
+                    lambda: run_crew_stage(summarizer_agent, build_summarize_task(summarizer_agent, content=summarize_content)),
+                )
+            summary_outputs = match_outputs(pending, [record.to_record() for record in parse_records(summary_output, ArticleSummary)])
+            summaries = [
+                {**output, "Title": article.get("Title", "N/A"), "URL": article.get("URL", "N/A")}
+                for article, output in zip(pending, summary_outputs) if output is not None
+            ]
+            store.record_summaries(summaries)
+            archive_processed(pending, tagged, summaries)
+
+            topics_by_url = {item.get("URL"): item.get("UPSC_Topics", []) for item in tagged}
+            summaries_with_tags = [{**summary, "UPSC_Topics": topics_by_url.get(summary.get("URL"), [])} for summary in summaries]
+            archive = get_vector_index()
+            link_content = summary_output
+            if progressive:
+                # The streamed linker has no archive tool, so each article's nearest past neighbours are passed inline
+                for item, related in zip(summaries_with_tags, archive.query_many(summaries_with_tags)):
+                    item["See_Also"] = related
+                link_content = format_summaries_for_linking(summaries_with_tags)
+            link_output = checkpoints.run(
+                "link", [LINK_DESCRIPTION, link_content],
+                lambda: (
+                    stream_links_to_file(linker_agent, link_content) if progressive
+                    else run_crew_stage(linker_agent, build_link_task(linker_agent, content=summary_output))
+                ),
+            )
+            store.record_links(pending, link_output)
+
+            # Archived after linking, so the linker does not find this run's own articles
+            added = archive.add(summaries_with_tags)
+            print(f"Archived {added} new summaries for future linking ({len(archive)} total).")
+        else:
+            print("No new or changed articles since the last run; skipping the LLM stages.")
 
-        summarize_news_task = Task(
-            description=(
-                "For each news article provided, generate a concise, objective, "
-                "and UPSC-relevant summary. The summary should be short, sharp, "
-                "and capture the core information essential for a UPSC aspirant. "
-                "Include the original title, URL, and the generated summary for each article."
-                "Return a JSON string where each item includes 'Title', 'URL', 'Summary'."
-                "Example: [{\"Title\": \"...\", \"URL\": \"...\", \"Summary\": \"...\"}]"
-            ),
-            expected_output="A JSON string representing a list of dictionaries, each with 'Title', 'URL', and 'Summary'.",
-            agent=summarizer_agent,
-            context=[tag_news_task], # Summarize the content that has been tagged
-            output_file=os.path.join(OUTPUT_DIR, "upsc_news_summaries.json") # Save summaries
-        )
+        end_time = time.time()
+        print(f"Crew execution finished in {end_time - start_time:.2f} seconds.")
+        cache_stats = serper_cache.stats()
+        print(f"Serper cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses ({cache_stats['entries']} entries stored).")
+        for agent_name, stats in llm_cache_stats().items():
+            print(f"LLM cache [{agent_name}]: {stats['hits']} hits, {stats['misses']} misses ({stats['hit_rate']:.0%} hit rate).")
 
-        link_news_task = Task(
-            description=(
-                "Analyze the provided summaries and their UPSC topics to identify "
-                "interconnections, recurring themes, and patterns between different articles. "
-                "Explain the significance of these links for a UPSC aspirant, connecting "
-                "them to broader GS topics or recent trends. "
-                "Your output should highlight specific articles and their linked concepts."
-                "Format the output as a clear, readable text detailing the connections found."
-            ),
-            expected_output="A detailed textual explanation of inter-article links and patterns relevant to UPSC, citing specific articles where applicable.",
-            agent=linker_agent,
-            context=[summarize_news_task], # Link based on summaries
-            output_file=os.path.join(OUTPUT_DIR, "upsc_news_links.txt") # Save links
-        )
+        links = save_store_outputs(store)
+        print("\n--- Identified Links and Patterns ---")
+        print(links)
 
+    except Exception as e:
+        print(f"\n❌ An error occurred during the full news processing pipeline: {e}")
+        if not resume:
+            print("Completed stages are checkpointed; set UPSC_PIPELINE_RESUME=true to restart from the failed stage.")
+        return False
+    return True
 
-        # Instantiate Crew with a sequential process
-        crew = Crew(
-            agents=[fetcher_agent, tagger_agent, summarizer_agent, linker_agent],
-            tasks=[fetch_news_task, tag_news_task, summarize_news_task, link_news_task],
-            process=Process.sequential,
-            verbose=True, # Corrected from 2 to True
-            full_output=True,
-            share_crew=False
-        )
 
-        print("Starting crew execution...")
-        start_time = time.time()
-        result = crew.kickoff()
-        end_time = time.time()
-        print(f"Crew execution finished in {end_time - start_time:.2f} seconds.")
+def run_parallel_news_processing(max_workers: int = PIPELINE_MAX_WORKERS, batch_size: int = PIPELINE_BATCH_SIZE, news_items: Optional[List[Dict]] = None):
+    """
+    Fetches with the fetcher crew (unless `news_items` are given), then tags and summarizes
+    articles concurrently in small units instead of one giant prompt, and finally links
+    the merged summaries.
+    """
+    print("\n🚀 Running Parallel UPSC News Processing Pipeline...")
+    print(f"Workers: {max_workers}, articles per unit: {batch_size or 'packed to the token budget'}")
+    print("=" * 50)
 
-        print("\n--- Crew Execution Results ---")
-        print(result)
+    try:
+        from agents.linker_agent import LinkerAgents
+        from agents.llm import complete
+        from agents.context_store import context_report
+        from agents.router import model_router
+        from knowledge.vector_index import get_vector_index
+        from pipeline.article_store import ArticleStore
+        from pipeline.dedup import NearDuplicateIndex, dedupe_articles
+        from pipeline.fanout import ArticleProcessor, run_fanout
+        from pipeline.formatting import parse_news_result, format_summaries_for_linking
+        from pipeline.tasks import build_fetch_task, build_prompt, LINK_DESCRIPTION, LINK_EXPECTED_OUTPUT, tag_prompt_savings_report
+        from tools.feed_collector import commit_feed_state
+        from pipeline.tokens import token_ledger
 
-        # Process and save tagged news, summaries, and links
-        if tag_news_task.output:
-            try:
-                tagged_news_content = tag_news_task.output.raw_output if hasattr(tag_news_task.output, 'raw_output') else tag_news_task.output
-                save_output_to_file("upsc_news_tagged.json", tagged_news_content.raw_output)
-            except Exception as e:
-                print(f"❌ Error processing tagged news output: {e}")
+        linker_agents = LinkerAgents()
+        linker_agent = linker_agents.linker_agent()
 
-        if summarize_news_task.output:
-             print("\n--- Generated Summaries ---")
-             print(summarize_news_task.output.raw_output if hasattr(summarize_news_task.output, 'raw_output') else summarize_news_task.output)
+        start_time = time.time()
+        if news_items is None:
+            from agents.news_fetcher_agent import NewsFetcherAgents
+            fetcher_agent = NewsFetcherAgents().news_fetcher_agent()
+            news_items = parse_news_result(run_crew_stage(fetcher_agent, build_fetch_task(fetcher_agent)))
+            print(f"Fetched {len(news_items)} articles in {time.time() - start_time:.2f} seconds.")
+            news_items = dedupe_articles(news_items, history=NearDuplicateIndex(DEDUP_INDEX_PATH))
+        if not news_items:
+            print("❌ No articles could be parsed from the fetcher output.")
+            return False
+        store = ArticleStore()
+        pending, _ = store.diff(news_items)
+        commit_feed_state()
+        if pending and EXTRACT_ENABLED:
+            from tools.article_extractor import extract_bodies
+            pending = extract_bodies(pending, max_workers=max(max_workers, PIPELINE_MAX_WORKERS))
+
+        archive = get_vector_index()
+        if pending:
+            tagged, summaries = run_fanout(pending, ArticleProcessor(), max_workers=max_workers, batch_size=batch_size)
+            store.record_tags(tagged)
+
+            # The linker only sees each article's nearest neighbours from past runs, not the whole archive
+            topics_by_url = {item.get("URL"): item.get("UPSC_Topics", []) for item in tagged}
+            summaries_with_tags = [{**summary, "UPSC_Topics": topics_by_url.get(summary.get("URL"), [])} for summary in summaries]
+            for item, related in zip(summaries_with_tags, archive.query_many(summaries_with_tags)):
+                item["See_Also"] = related
+            store.record_summaries([{key: item[key] for key in ("Title", "URL", "Summary", "See_Also")} for item in summaries_with_tags])
+            archive_processed(pending, tagged, summaries)
+
+            link_prompt = build_prompt(LINK_DESCRIPTION, LINK_EXPECTED_OUTPUT, format_summaries_for_linking(summaries_with_tags))
+            store.record_links(pending, complete(linker_agents.llm, linker_agent, link_prompt, task="link"))
+            print(f"Archived {archive.add(summaries_with_tags)} new summaries for future linking ({len(archive)} total).")
+        else:
+            print("No new or changed articles since the last run; skipping the LLM stages.")
+        links = save_store_outputs(store)
+        print(f"Parallel pipeline finished in {time.time() - start_time:.2f} seconds.")
+        print("\n--- Token Usage ---")
+        print(token_ledger.report())
+        print(tag_prompt_savings_report(token_ledger.totals().get("tag", {}).get("calls", 0)))
+        print("\n--- Model Routes ---")
+        print(model_router.report())
+        print("\n--- Agent Context ---")
+        print(context_report())
+
+        print("\n--- Identified Links and Patterns ---")
+        print(links)
+    except Exception as e:
+        print(f"\n❌ An error occurred during the parallel news processing pipeline: {e}")
+        return False
+    return True
 
-        if link_news_task.output:
-            print("\n--- Identified Links and Patterns ---")
-            print(link_news_task.output.raw_output if hasattr(link_news_task.output, 'raw_output') else link_news_task.output)
 
+def run_streaming_news_processing(searches: Optional[List[tuple]] = None, articles: Optional[List[Dict]] = None):
+    """
+    Streams articles through fetch → dedupe → tag → summarize → link and appends each
+    finished record to output/upsc_news_stream.jsonl as soon as it is ready.
+    `searches` are search_articles() argument tuples (default: one query per GS topic);
+    already fetched `articles` (e.g. feed items) are streamed ahead of them.
+    """
+    print("\n🚀 Running Streaming UPSC News Processing Pipeline...")
+    print("=" * 50)
 
+    from agents.context_store import context_report
+    from agents.router import model_router
+    from knowledge.vector_index import get_vector_index
+    from pipeline.streaming import StreamingPipeline, link_with_archive
+    from pipeline.tokens import token_ledger
+    from tools.feed_collector import commit_feed_state
+
+    filepath = os.path.join(OUTPUT_DIR, "upsc_news_stream.jsonl")
+    start_time = time.time()
+    count = 0
+    search_index = None
+    segment_archive = None
+    if ARCHIVE_INDEX_ENABLED:
+        from pipeline.archive_index import ArchiveIndex
+        search_index = ArchiveIndex()
+    if SEGMENT_ARCHIVE_ENABLED:
+        from pipeline.segments import SegmentArchive
+        segment_archive = SegmentArchive()
+    try:
+        with open(filepath, 'w', encoding='utf-8') as f:
+            for record in StreamingPipeline(link_fn=link_with_archive(get_vector_index())).run(searches, articles or []):
+                count += 1
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                f.flush()
+                if search_index is not None:
+                    search_index.add([record])
+                if segment_archive is not None:
+                    segment_archive.append([record])
+                print(f"[{time.time() - start_time:6.2f}s] ✅ {record.get('Title', 'N/A')} → {', '.join(record.get('UPSC_Topics', [])) or 'untagged'}")
     except Exception as e:
-        print(f"\n❌ An error occurred during the full news processing pipeline: {e}")
+        print(f"\n❌ An error occurred during the streaming news processing pipeline: {e}")
         return False
+    commit_feed_state() # Every feed item has been streamed to the output file
+    print(f"Streamed {count} articles to {filepath} in {time.time() - start_time:.2f} seconds.")
+    print("\n--- Token Usage ---")
+    print(token_ledger.report())
+    print("\n--- Model Routes ---")
+    print(model_router.report())
+    print("\n--- Agent Context ---")
+    print(context_report())
     return True
 
 
+# --- Headless Commands ---
+def topic_query(topic: str) -> str:
+    """GS topic codes (e.g. 'IE') expand to a search for that topic; anything else is searched as given."""
+    from knowledge.topic_codes import CODE_TO_TOPIC, short_topic_name
+    code_topic = CODE_TO_TOPIC.get(topic.strip().upper())
+    return f"{short_topic_name(code_topic)} India news" if code_topic else topic
+
+def fetch_articles(
+    topics: Optional[List[str]] = None,
+    window: Optional[str] = None,
+    count: Optional[int] = None,
+    bodies: bool = False,
+    feeds: bool = FEEDS_ENABLED,
+    search: bool = True,
+) -> List[Dict]:
+    """
+    Searches Serper directly (no fetcher agent) and returns deduplicated articles.
+
+    Args:
+        topics: Search topics or GS topic codes (default: the planned syllabus queries of
+            knowledge.query_planner, or one query per GS topic with QUERY_PLANNER_ENABLED off)
+        window: Recency filter: "h", "d", "w", "m" or "y"
+        count: Maximum number of articles to return (also the per-query result count)
+        bodies: Also download each article's page and add its text as 'Body'
+        feeds: Also collect the new items of NEWS_FEEDS (tools.feed_collector); they come first
+        search: Run the Serper searches (False with `feeds` reads the feeds only)
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from config.settings import SERPER_MAX_WORKERS, SERPER_NUM_RESULTS, QUERY_PLANNER_ENABLED
+    from pipeline.dedup import NearDuplicateIndex, dedupe_articles
+    from pipeline.streaming import default_queries
+    from tools.serper_client import search_articles
+
+    articles = []
+    if feeds:
+        from tools.feed_collector import collect_feeds
+        articles += collect_feeds()
+    num_results = count or SERPER_NUM_RESULTS
+    if search and not topics and QUERY_PLANNER_ENABLED:
+        from knowledge.query_planner import planned_articles
+        articles += planned_articles(num_results=num_results, time_range=window)
+    elif search:
+        queries = [topic_query(topic) for topic in topics] if topics else [query for query, _, _ in default_queries()]
+        with ThreadPoolExecutor(max_workers=max(1, min(SERPER_MAX_WORKERS, len(queries)))) as executor:
+            results = executor.map(lambda query: search_articles(query, "in", "en", num_results, window), queries)
+            articles += [article for result in results for article in result]
+    articles = dedupe_articles(articles, history=NearDuplicateIndex(DEDUP_INDEX_PATH))
+    articles = articles[:count] if count else articles
+    if bodies:
+        from tools.article_extractor import extract_bodies
+        articles = extract_bodies(articles)
+    return articles
+
+def load_json_file(path: str) -> List[Dict]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def cmd_fetch(args) -> int:
+    articles = fetch_articles(args.topic, args.window, args.count, bodies=args.bodies, feeds=args.feeds, search=args.search)
+    print(f"Fetched {len(articles)} articles.")
+    save_output_to_file("upsc_news_fetched.json", json.dumps(articles, indent=2, ensure_ascii=False))
+    if args.feeds:
+        from tools.feed_collector import commit_feed_state
+        commit_feed_state()
+    return 0 if articles else 1
+
+def cmd_tag(args) -> int:
+    from pipeline.fanout import ArticleProcessor, map_in_units, untagged
+    processor = ArticleProcessor()
+    tagged = map_in_units(
+        processor.tag, load_json_file(args.input), args.workers, args.batch_size,
+        packer=lambda items: processor.pack(items, "tag"), fallback=untagged,
+    )
+    save_output_to_file("upsc_news_tagged.json", json.dumps(tagged, indent=2, ensure_ascii=False))
+    return 0
+
+def cmd_summarize(args) -> int:
+    from pipeline.fanout import ArticleProcessor, map_in_units, unsummarized
+    processor = ArticleProcessor()
+    summaries = map_in_units(
+        processor.summarize, load_json_file(args.input), args.workers, args.batch_size,
+        packer=processor.pack, fallback=unsummarized,
+    )
+    save_output_to_file("upsc_news_summaries.json", json.dumps(summaries, indent=2, ensure_ascii=False))
+    return 0
+
+def cmd_link(args) -> int:
+    from agents.linker_agent import LinkerAgents
+    from agents.llm import complete
+    from knowledge.vector_index import get_vector_index
+    from pipeline.formatting import format_summaries_for_linking
+    from pipeline.tasks import build_prompt, LINK_DESCRIPTION, LINK_EXPECTED_OUTPUT
+
+    topics_by_url = {item.get("URL"): item.get("UPSC_Topics", []) for item in load_json_file(args.tagged)}
+    summaries = [{**item, "UPSC_Topics": topics_by_url.get(item.get("URL"), [])} for item in load_json_file(args.input)]
+    for item, related in zip(summaries, get_vector_index().query_many(summaries)):
+        item["See_Also"] = related
+    linker_agents = LinkerAgents()
+    prompt = build_prompt(LINK_DESCRIPTION, LINK_EXPECTED_OUTPUT, format_summaries_for_linking(summaries))
+    links = complete(linker_agents.llm, linker_agents.linker_agent(), prompt, task="link")
+    save_output_to_file("upsc_news_links.txt", links)
+    return 0
+
+def cmd_run(args) -> int:
+    fetch_flags = args.topic or args.window or args.count or args.feeds
+    if args.mode == "streaming":
+        searches = None if args.search else []
+        if args.search and (args.topic or args.window or args.count):
+            from config.settings import SERPER_NUM_RESULTS
+            from pipeline.streaming import default_queries
+            queries = [topic_query(topic) for topic in args.topic] if args.topic else [query for query, _, _ in default_queries()]
+            searches = [(query, "in", "en", args.count or SERPER_NUM_RESULTS, args.window) for query in queries]
+        feed_items = []
+        if args.feeds:
+            from tools.feed_collector import collect_feeds
+            feed_items = collect_feeds()
+        return 0 if run_streaming_news_processing(searches, feed_items) else 1
+    # Fetch flags bypass the fetcher agent and search Serper directly
+    news_items = fetch_articles(args.topic, args.window, args.count, feeds=args.feeds, search=args.search) if fetch_flags or not args.search else None
+    if args.mode == "parallel":
+        return 0 if run_parallel_news_processing(args.workers, args.batch_size, news_items) else 1
+    return 0 if run_full_news_processing_crew(args.resume, news_items, args.progressive) else 1
+
+def cmd_bench(args) -> int:
+    if args.target == "imports":
+        from benchmarks import import_time
+        return import_time.main(args.bench_args)
+    if args.target == "pipeline":
+        from benchmarks import bench_pipeline
+        return bench_pipeline.main(args.bench_args)
+    if args.target == "extract":
+        from benchmarks import bench_extract
+        return bench_extract.main(args.bench_args)
+    if args.target == "archive":
+        from benchmarks import bench_archive
+        return bench_archive.main(args.bench_args)
+    if args.target == "segments":
+        from benchmarks import bench_segments
+        return bench_segments.main(args.bench_args)
+    if args.target == "feeds":
+        from benchmarks import bench_feeds
+        return bench_feeds.main(args.bench_args)
+    if args.target == "queries":
+        from benchmarks import bench_queries
+        return bench_queries.main(args.bench_args)
+    from benchmarks import bench_search
+    return bench_search.main(args.bench_args)
+
+def cmd_search(args) -> int:
+    from datetime import datetime
+    from pipeline.archive_index import ArchiveIndex, days_ago, merge_processed, COUNT_CAP as ARCHIVE_COUNT_CAP
+
+    index = ArchiveIndex()
+    if args.reindex:
+        from pipeline.article_store import ArticleStore
+        store = ArticleStore()
+        everything = float("inf")
+        tagged = store.tagged_articles(window_hours=everything)
+        print(f"🗂️  Indexed {index.add(merge_processed(tagged, tagged, store.summaries(window_hours=everything)))} stored articles.")
+        index.optimize()
+    since = days_ago(args.days) if args.days else None
+    if args.since:
+        since = datetime.strptime(args.since, "%Y-%m-%d").timestamp()
+    until = datetime.strptime(args.until, "%Y-%m-%d").timestamp() if args.until else None
+    results = index.search(
+        args.query, topics=args.topic, papers=args.paper, subjects=args.subject, sources=args.source,
+        since=since, until=until, limit=args.limit, offset=args.offset, facets=args.facets,
+    )
+    if args.json:
+        print(json.dumps(results.to_dict(), indent=2, ensure_ascii=False))
+        return 0
+    total = f"{results.total}+" if results.total >= ARCHIVE_COUNT_CAP else str(results.total)
+    print(f"🔎 {total} matching articles ({results.elapsed_ms:.1f} ms)")
+    for rank, hit in enumerate(results.hits, args.offset + 1):
+        print(f"\n{rank}. {hit.get('Title', 'N/A')}")
+        print(f"   {hit.get('Source', 'N/A')} | {hit.get('Date', 'N/A')} | {', '.join(hit.get('UPSC_Topics', [])) or 'untagged'}")
+        print(f"   {hit.get('Snippet') or hit.get('Summary', '')}")
+        print(f"   {hit.get('URL', 'N/A')}")
+    if args.facets:
+        print("\n--- Facets ---")
+        for facet, counts in results.facets.items():
+            print(f"{facet}: " + ", ".join(f"{value} ({count})" for value, count in counts))
+    return 0
+
+def cmd_archive(args) -> int:
+    from pipeline.segments import SegmentArchive
+
+    archive = SegmentArchive()
+    try:
+        if args.action == "import":
+            from pipeline.archive_index import merge_processed
+            from pipeline.article_store import ArticleStore
+            store = ArticleStore()
+            everything = float("inf")
+            tagged = store.tagged_articles(window_hours=everything)
+            print(f"🗂️  Appended {archive.append(merge_processed(tagged, tagged, store.summaries(window_hours=everything)))} stored articles.")
+        elif args.action == "compact":
+            start = time.perf_counter()
+            result = archive.compact()
+            before, after = result["before"], result["after"]
+            print(
+                f"✅ Compacted {before['entries']} entries into {after['records']} records in {time.perf_counter() - start:.2f}s "
+                f"({before['bytes'] / 1e6:.1f} MB → {after['bytes'] / 1e6:.1f} MB, {after['segments']} segment(s))."
+            )
+            return 0
+        elif args.action in ("get", "day"):
+            if not args.key:
+                print(f"❌ 'archive {args.action}' needs a {'URL' if args.action == 'get' else 'YYYY-MM-DD date'}.")
+                return 1
+            found = archive.get(args.key) if args.action == "get" else archive.day(args.key)
+            if not found:
+                print(f"❌ No archived articles for {args.key}")
+                return 1
+            print(json.dumps(found, indent=2, ensure_ascii=False))
+            return 0
+        stats = archive.stats()
+        print(
+            f"📦 {stats['records']} articles ({stats['entries']} appended) in {stats['segments']} {stats['codec']} segment(s), "
+            f"{stats['bytes'] / 1e6:.1f} MB [{stats['generation']}]"
+        )
+        return 0
+    finally:
+        archive.close()
+
+def cmd_queries(args) -> int:
+    from datetime import datetime
+    from knowledge.query_planner import QueryPlanner, query_key
+
+    planner = QueryPlanner()
+    history = planner.stats.queries()
+    plan = planner.plan()
+    covered = sum(len(planned.leaves) for planned in plan.queries)
+    print(f"🧭 Next plan: {len(plan.queries)} of {len(planner.candidates)} syllabus queries (budget {planner.budget}), covering {covered} leaves")
+    for planned in plan.queries:
+        previous = history.get(query_key(planned.query))
+        label = f"yield {previous['yield']:.1f}" if planned.reason == "yield" else "explore"
+        leaves = f"  ({len(planned.leaves)} leaves)" if len(planned.leaves) > 1 else ""
+        print(f"   [{label:>9}] {planned.query}{leaves}")
+    print(f"   {len(plan.merged)} merged, {len(plan.dropped)} low-yield dropped, {len(plan.deferred)} deferred")
+    runs = planner.stats.runs(args.runs)
+    if runs:
+        print("Recent runs:")
+    for run in runs:
+        per_request = f"{run['new_articles'] / run['requests']:.1f}" if run["requests"] else "n/a"
+        print(
+            f"   #{run['run']:<4} {datetime.fromtimestamp(run['finished_at']):%Y-%m-%d %H:%M}  {run['requests']:>3} requests → "
+            f"{run['unique_articles']:>4} unique, {run['new_articles']:>4} not found before ({per_request} per request)"
+        )
+    return 0
+
+def cmd_check(args) -> int:
+    return 0 if run_component_checks(interactive=False) else 1
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="UPSC News Assistant. Run without a command for the interactive component checks."
+    )
+    parser.add_argument("--trace", action="store_true", default=TRACING_ENABLED, help="Record spans and metrics to output/traces")
+    commands = parser.add_subparsers(dest="command")
+
+    def add_fetch_flags(command):
+        command.add_argument("--topic", action="append", help="Search topic or GS topic code (e.g. IE); repeatable")
+        command.add_argument("--window", choices=["h", "d", "w", "m", "y"], help="Only articles from the past hour/day/week/month/year")
+        command.add_argument("--count", type=int, help="Maximum number of articles")
+        command.add_argument("--feeds", action=argparse.BooleanOptionalAction, default=FEEDS_ENABLED, help="Also read the new items of the NEWS_FEEDS RSS/Atom feeds")
+        command.add_argument("--no-search", dest="search", action="store_false", help="Skip the Serper searches (with --feeds: feeds only)")
+
+    def add_worker_flags(command):
+        command.add_argument("--workers", type=int, default=PIPELINE_MAX_WORKERS)
+        command.add_argument("--batch-size", type=int, default=PIPELINE_BATCH_SIZE, help="Articles per LLM call; 0 packs calls to the token budget")
+
+    fetch = commands.add_parser("fetch", help="Search news and save output/upsc_news_fetched.json")
+    add_fetch_flags(fetch)
+    fetch.add_argument("--bodies", action=argparse.BooleanOptionalAction, default=EXTRACT_ENABLED, help="Download article pages and add their text as 'Body'")
+    fetch.set_defaults(handler=cmd_fetch)
+
+    tag = commands.add_parser("tag", help="Tag fetched articles with UPSC GS topics")
+    tag.add_argument("--input", default=os.path.join(OUTPUT_DIR, "upsc_news_fetched.json"))
+    add_worker_flags(tag)
+    tag.set_defaults(handler=cmd_tag)
+
+    summarize = commands.add_parser("summarize", help="Summarize tagged articles")
+    summarize.add_argument("--input", default=os.path.join(OUTPUT_DIR, "upsc_news_tagged.json"))
+    add_worker_flags(summarize)
+    summarize.set_defaults(handler=cmd_summarize)
+
+    link = commands.add_parser("link", help="Link summaries to each other and to past articles")
+    link.add_argument("--input", default=os.path.join(OUTPUT_DIR, "upsc_news_summaries.json"))
+    link.add_argument("--tagged", default=os.path.join(OUTPUT_DIR, "upsc_news_tagged.json"))
+    link.set_defaults(handler=cmd_link)
+
+    run = commands.add_parser("run", help="Run the whole pipeline")
+    run.add_argument("--mode", choices=["sequential", "parallel", "streaming"], default=PIPELINE_MODE)
+    run.add_argument("--resume", action=argparse.BooleanOptionalAction, default=PIPELINE_RESUME, help="Reuse stage checkpoints whose input is unchanged")
+    run.add_argument("--progressive", action="store_true", default=PIPELINE_PROGRESSIVE, help="Sequential mode: stream summaries and links to OUTPUT_DIR as they are generated")
+    add_fetch_flags(run)
+    add_worker_flags(run)
+    run.set_defaults(handler=cmd_run)
+
+    search = commands.add_parser("search", help="Search the archive of processed articles")
+    search.add_argument("query", nargs="?", default="", help='Words to match in title, summary or body; "quoted phrases" and prefix* allowed')
+    search.add_argument("--topic", action="append", help="GS topic name, code or name fragment (e.g. IPG or polity); repeatable")
+    search.add_argument("--paper", action="append", help="Syllabus paper, e.g. Mains_GS2; repeatable")
+    search.add_argument("--subject", action="append", help="Syllabus subject, e.g. Polity_and_Governance; repeatable")
+    search.add_argument("--source", action="append", help="News source; repeatable")
+    search.add_argument("--days", type=float, help="Only articles published in the last N days")
+    search.add_argument("--since", help="Only articles published on or after YYYY-MM-DD")
+    search.add_argument("--until", help="Only articles published before YYYY-MM-DD")
+    search.add_argument("--limit", type=int, default=20)
+    search.add_argument("--offset", type=int, default=0)
+    search.add_argument("--facets", action="store_true", help="Also print facet counts over all matches")
+    search.add_argument("--json", action="store_true", help="Print results as JSON")
+    search.add_argument("--reindex", action="store_true", help="First (re)index every article in the article store")
+    search.set_defaults(handler=cmd_search)
+
+    archive = commands.add_parser("archive", help="Inspect, backfill or compact the segment archive of processed articles")
+    archive.add_argument("action", choices=["stats", "get", "day", "import", "compact"], nargs="?", default="stats")
+    archive.add_argument("key", nargs="?", help="Article URL for 'get', YYYY-MM-DD for 'day'")
+    archive.set_defaults(handler=cmd_archive)
+
+    queries = commands.add_parser("queries", help="Show the next planned syllabus searches and the yield of recent runs")
+    queries.add_argument("--runs", type=int, default=10, help="Recent runs to list")
+    queries.set_defaults(handler=cmd_queries)
+
+    bench = commands.add_parser("bench", help="Run a benchmark (extra arguments are passed through)")
+    bench.add_argument("target", choices=["search", "imports", "pipeline", "extract", "archive", "segments", "feeds", "queries"])
+    bench.add_argument("bench_args", nargs=argparse.REMAINDER)
+    bench.set_defaults(handler=cmd_bench)
+
+    check = commands.add_parser("check", help="Initialize every agent and probe the Serper API, without prompting")
+    check.set_defaults(handler=cmd_check)
+    return parser
+
+
 # --- Main Execution ---
-def main():
-    """Main function to run all tests or the full pipeline."""
+def run_component_checks(interactive: bool = True) -> bool:
+    """Initializes every agent and probes Serper; interactively offers to run the pipeline."""
     print("🧪 Starting UPSC News Assistant Component Tests")
     print("=" * 50)
     
@@ -298,41 +845,70 @@ def main():
     if missing_vars:
         print(f"❌ Missing environment variables: {', '.join(missing_vars)}")
         print("Please set these in your .env file")
-        return
+        return False
     
     # Test 1: NewsFetcherAgent initialization
     fetcher_agent = test_news_fetcher_agent_initialization()
     if not fetcher_agent:
-        return
+        return False
     
     # Test 2: TaggerAgent initialization
     tagger_agent = test_tagger_agent_initialization()
     if not tagger_agent:
-        return
+        return False
     
     # Test 3: SummarizerAgent initialization
     summarizer_agent = test_summarizer_agent_initialization()
     if not summarizer_agent:
-        return
+        return False
 
     # Test 4: LinkerAgent initialization
     linker_agent = test_linker_agent_initialization()
     if not linker_agent:
-        return
+        return False
 
     # Test 5: Tool functionality (Serper API)
     tool_works = test_tool_directly()
     if not tool_works:
         print("⚠️  Serper tool test failed. News fetching might not work correctly.")
+    if not interactive:
+        return tool_works
     
     # Test 6: Run the full news processing pipeline
     print("\nDo you want to run the full news processing pipeline (fetch, tag, summarize, link)? This will make API calls. (y/n): ", end="")
     user_input = input().strip().lower()
     
     if user_input == 'y':
-        run_full_news_processing_crew()
+        if PIPELINE_MODE == "parallel":
+            return run_parallel_news_processing()
+        elif PIPELINE_MODE == "streaming":
+            return run_streaming_news_processing()
+        else:
+            return run_full_news_processing_crew()
     else:
         print("✅ All basic tests completed without running the full pipeline.")
+    return True
+
+def main(argv=None) -> int:
+    """Dispatches a CLI command, or runs the interactive component checks when none is given."""
+    args = build_parser().parse_args(argv)
+    if args.trace:
+        from tools.tracing import tracer
+        tracer.enabled = True
+    try:
+        if args.command is None:
+            return 0 if run_component_checks() else 1
+        return args.handler(args)
+    finally:
+        if args.trace:
+            trace_path = tracer.flush()
+            if trace_path:
+                print(f"📈 Trace written to {trace_path}; metrics in {tracer.write_snapshot()}")
+                from agents.context_store import context_snapshot
+                context_path = trace_path.replace(".jsonl", "-context.json")
+                with open(context_path, "w", encoding="utf-8") as f:
+                    json.dump(context_snapshot(), f, indent=2, ensure_ascii=False)
+                print(f"🧠 Agent context snapshot written to {context_path}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,339 @@
+# pipeline/archive_index.py
+"""
+Searchable archive of every processed article.
+
+Titles, summaries and article bodies go into an SQLite FTS5 index (porter-stemmed,
+BM25-ranked with titles weighted highest). Facets are kept in a side table indexed
+by (facet, value):
+- GS topic: UPSC_Topics, from UPSC_GS_TOPICS
+- syllabus paper and subject: from UPSC_CATEGORIES, via the syllabus leaves the
+  classifier matches
+- source
+- publication month (date ranges filter on the exact date)
+
+Queries combine full text with facet and date filters, and return ranked hits plus
+facet counts over the matching set. Records are upserted by canonical URL, so
+re-processing an article replaces its entry.
+"""
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config.settings import ARCHIVE_INDEX_PATH, UPSC_GS_TOPICS
+from knowledge.classifier import get_classifier
+from knowledge.topic_codes import decode_topics, short_topic_name
+from knowledge.upsc_syllabus import UPSC_CATEGORIES
+from pipeline.article_store import canonical_url
+
+FACETS = ("topic", "paper", "subject", "source", "month")
+_TERM_RE = re.compile(r"\w+\*?", re.UNICODE)
+_RELATIVE_DATE_RE = re.compile(r"(\d+)\s+(minute|hour|day|week|month|year)s?\s+ago", re.IGNORECASE)
+_RELATIVE_UNITS = {"minute": 60, "hour": 3600, "day": 86400, "week": 7 * 86400, "month": 30 * 86400, "year": 365 * 86400}
+_DATE_FORMATS = ("%Y-%m-%d", "%b %d, %Y", "%d %b %Y", "%B %d, %Y", "%d %B %Y", "%Y-%m-%dT%H:%M:%S")
+_SUBJECT_MAX_LEAVES = 3 # Strongest syllabus matches that contribute paper/subject facets
+COUNT_CAP = 10000 # SearchResults.total stops counting here; exact totals of broad queries cost a full scan
+
+# Syllabus leaf -> [(paper, subject)] it appears under
+_LEAF_SUBJECTS: Dict[str, List[Tuple[str, str]]] = {}
+for _paper, _subjects in UPSC_CATEGORIES.items():
+    for _subject, _leaves in _subjects.items():
+        for _leaf in _leaves:
+            _LEAF_SUBJECTS.setdefault(_leaf, []).append((_paper, _subject))
+_PAPERS = list(UPSC_CATEGORIES)
+_SUBJECTS = sorted({subject for subjects in UPSC_CATEGORIES.values() for subject in subjects})
+_TOPIC_NAMES = [short_topic_name(topic) for topic in UPSC_GS_TOPICS]
+
+
+def resolve_topics(values: List[str]) -> List[str]:
+    """Topic filters -> stored topic names: codes and names decode exactly, anything else matches name fragments."""
+    resolved = []
+    for value in values:
+        matches = decode_topics([value]) or [name for name in _TOPIC_NAMES if value.strip().lower() in name.lower()]
+        resolved += [name for name in matches if name not in resolved]
+    return resolved or list(values)
+
+
+def _resolve_keys(values: List[str], keys: List[str]) -> List[str]:
+    # Case-insensitive, with spaces for underscores: "polity and governance" -> "Polity_and_Governance"
+    by_lower = {key.lower(): key for key in keys}
+    return [by_lower.get(value.strip().lower().replace(" ", "_"), value) for value in values]
+
+
+def published_timestamp(date: str, seen_at: float) -> float:
+    """
+    Epoch seconds for a search result's date ('Jun 5, 2024', '2024-06-05' or '3 hours ago').
+    Relative dates count back from `seen_at`; unparseable ones fall back to it.
+    """
+    date = (date or "").strip()
+    relative = _RELATIVE_DATE_RE.search(date)
+    if relative:
+        return seen_at - int(relative.group(1)) * _RELATIVE_UNITS[relative.group(2).lower()]
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(date, fmt).timestamp()
+        except ValueError:
+            continue
+    try:
+        return datetime.strptime(date[:10], "%Y-%m-%d").timestamp() # ISO timestamps with a zone or fraction
+    except ValueError:
+        return seen_at
+
+
+def fts_query(text: str) -> str:
+    """
+    Turns free text into an FTS5 query: every word must match (a trailing * keeps prefix
+    matching) and quoted "phrases" stay phrases. FTS5 operators in the input are treated as words.
+    """
+    parts = []
+    for i, chunk in enumerate(text.split('"')):
+        terms = _TERM_RE.findall(chunk)
+        if not terms:
+            continue
+        if i % 2: # Inside quotes
+            parts.append('"' + " ".join(term.rstrip("*") for term in terms) + '"')
+        else:
+            parts.extend(f'"{term.rstrip("*")}"' + ("*" if term.endswith("*") else "") for term in terms)
+    return " ".join(parts)
+
+
+class SearchResults:
+    """Ranked hits, facet counts over all matches (when requested), the match count and the query time."""
+
+    def __init__(self, hits: List[Dict], total: int, facets: Dict[str, List[Tuple[str, int]]], elapsed_ms: float):
+        self.hits = hits
+        self.total = total
+        self.facets = facets
+        self.elapsed_ms = elapsed_ms
+
+    def to_dict(self) -> Dict:
+        return {
+            "total": self.total,
+            "elapsed_ms": round(self.elapsed_ms, 2),
+            "hits": self.hits,
+            "facets": {facet: [{"value": value, "count": count} for value, count in counts] for facet, counts in self.facets.items()},
+        }
+
+
+class ArchiveIndex:
+    """
+    Full-text and faceted index over processed articles, stored in SQLite. Thread-safe.
+    Pass path=None for an in-memory index.
+    """
+
+    def __init__(self, path: Optional[str] = ARCHIVE_INDEX_PATH):
+        self._lock = threading.Lock()
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path or ":memory:", check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS docs ("
+            " id INTEGER PRIMARY KEY,"
+            " canonical_url TEXT UNIQUE NOT NULL,"
+            " published REAL NOT NULL," # Epoch seconds
+            " indexed_at REAL NOT NULL,"
+            " record TEXT NOT NULL)" # Title, URL, Source, Date, Summary, UPSC_Topics as JSON
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_docs_published ON docs (published)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS doc_facets ("
+            " facet TEXT NOT NULL, value TEXT NOT NULL, doc_id INTEGER NOT NULL,"
+            " published REAL NOT NULL," # Copied from docs so a facet can be walked newest first
+            " PRIMARY KEY (facet, value, doc_id)) WITHOUT ROWID"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_doc_facets_doc ON doc_facets (doc_id)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_doc_facets_recent ON doc_facets (facet, value, published)")
+        if not self._conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'docs_fts'").fetchone():
+            self._conn.execute("CREATE VIRTUAL TABLE docs_fts USING fts5(title, summary, body, tokenize='porter unicode61')")
+            # Persistent ranking: title matches weigh most, then summary, then body
+            self._conn.execute("INSERT INTO docs_fts (docs_fts, rank) VALUES ('rank', 'bm25(10.0, 4.0, 1.0)')")
+
+    def _facets(self, record: Dict, published: float) -> List[Tuple[str, str]]:
+        facets = [("topic", topic) for topic in decode_topics(record.get("UPSC_Topics") or [])]
+        text = f"{record.get('Title', '')}. {record.get('Summary') or record.get('Description', '')}"
+        for leaf in get_classifier().classify(text).subtopics[:_SUBJECT_MAX_LEAVES]:
+            for paper, subject in _LEAF_SUBJECTS.get(leaf, []):
+                facets += [("paper", paper), ("subject", subject)]
+        if record.get("Source") and record["Source"] != "N/A":
+            facets.append(("source", record["Source"]))
+        facets.append(("month", time.strftime("%Y-%m", time.localtime(published))))
+        return sorted(set(facets))
+
+    def add(self, records: Iterable[Dict], seen_at: Optional[float] = None) -> int:
+        """
+        Indexes (or re-indexes) processed articles: fetched fields plus 'UPSC_Topics',
+        'Summary' and, when extracted, 'Body'.
+
+        Returns:
+            Number of records indexed
+        """
+        now = time.time()
+        seen_at = seen_at or now
+        rows = []
+        for record in records:
+            url = canonical_url(record.get("URL", ""))
+            if not url:
+                continue
+            published = published_timestamp(record.get("Date", ""), seen_at)
+            stored = {key: record.get(key) for key in ("Title", "URL", "Source", "Date", "Summary") if record.get(key)}
+            stored["UPSC_Topics"] = decode_topics(record.get("UPSC_Topics") or [])
+            rows.append((url, published, stored, self._facets(record, published), record.get("Body") or record.get("Description") or ""))
+        with self._lock:
+            self._conn.execute("BEGIN")
+            for url, published, stored, facets, body in rows:
+                existing = self._conn.execute("SELECT id FROM docs WHERE canonical_url = ?", (url,)).fetchone()
+                if existing:
+                    doc_id = existing[0]
+                    self._conn.execute(
+                        "UPDATE docs SET published = ?, indexed_at = ?, record = ? WHERE id = ?",
+                        (published, now, json.dumps(stored, ensure_ascii=False), doc_id),
+                    )
+                    self._conn.execute("DELETE FROM docs_fts WHERE rowid = ?", (doc_id,))
+                    self._conn.execute("DELETE FROM doc_facets WHERE doc_id = ?", (doc_id,))
+                else:
+                    doc_id = self._conn.execute(
+                        "INSERT INTO docs (canonical_url, published, indexed_at, record) VALUES (?, ?, ?, ?)",
+                        (url, published, now, json.dumps(stored, ensure_ascii=False)),
+                    ).lastrowid
+                self._conn.execute(
+                    "INSERT INTO docs_fts (rowid, title, summary, body) VALUES (?, ?, ?, ?)",
+                    (doc_id, stored.get("Title", ""), stored.get("Summary", ""), body),
+                )
+                self._conn.executemany(
+                    "INSERT INTO doc_facets (facet, value, doc_id, published) VALUES (?, ?, ?, ?)",
+                    [(facet, value, doc_id, published) for facet, value in facets],
+                )
+            self._conn.execute("COMMIT")
+        return len(rows)
+
+    def search(
+        self,
+        query: str = "",
+        topics: Optional[List[str]] = None,
+        papers: Optional[List[str]] = None,
+        subjects: Optional[List[str]] = None,
+        sources: Optional[List[str]] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        limit: int = 20,
+        offset: int = 0,
+        facets: bool = False,
+        facet_limit: int = 10,
+    ) -> SearchResults:
+        """
+        Ranked search. Within one facet the given values are alternatives; different
+        facets and the date range must all match.
+
+        Args:
+            query: Free text over title, summary and body (see fts_query); empty lists newest first
+            topics: GS topic names, codes or name fragments (e.g. "Indian Polity & Governance", "IPG", "polity")
+            papers, subjects: UPSC_CATEGORIES keys, e.g. "Mains_GS2", "Polity_and_Governance"
+            sources: Exact source names
+            since, until: Epoch seconds bounding the publication date
+            facets: Also count facet values over every match (costs a pass over the matches)
+
+        Returns:
+            SearchResults with up to `limit` hits (title, URL, source, date, topics, summary,
+            a highlighted snippet when there is a query, and the BM25 score). The total
+            stops counting at COUNT_CAP.
+        """
+        start = time.perf_counter()
+        filters = [
+            (facet, values) for facet, values in (
+                ("topic", resolve_topics(topics) if topics else None),
+                ("paper", _resolve_keys(papers, _PAPERS) if papers else None),
+                ("subject", _resolve_keys(subjects, _SUBJECTS) if subjects else None),
+                ("source", sources),
+            ) if values
+        ]
+        where, params = [], []
+        match = fts_query(query)
+        if match:
+            source = "docs_fts JOIN docs d ON d.id = docs_fts.rowid"
+            where.append("docs_fts MATCH ?")
+            params.append(match)
+            published = "d.published"
+        elif filters:
+            # Without text to rank by, walk the first facet newest first (idx_doc_facets_recent)
+            facet, values = filters.pop(0)
+            source = "doc_facets f JOIN docs d ON d.id = f.doc_id"
+            where.append(f"f.facet = ? AND f.value IN ({', '.join('?' * len(values))})")
+            params += [facet, *values]
+            published = "f.published"
+        else:
+            source, published = "docs d", "d.published"
+        for facet, values in filters:
+            # Correlated primary-key probes: cheaper than materializing every document of the facet value
+            where.append(f"EXISTS (SELECT 1 FROM doc_facets x WHERE x.facet = ? AND x.value IN ({', '.join('?' * len(values))}) AND x.doc_id = d.id)")
+            params += [facet, *values]
+        if since is not None:
+            where.append(f"{published} >= ?")
+            params.append(since)
+        if until is not None:
+            where.append(f"{published} < ?")
+            params.append(until)
+        condition = f" WHERE {' AND '.join(where)}" if where else ""
+        if match:
+            columns = "d.id, d.record, docs_fts.rank, snippet(docs_fts, -1, '[', ']', '…', 16)"
+            order = "docs_fts.rank"
+        else:
+            columns, order = "d.id, d.record, 0.0, NULL", f"{published} DESC"
+
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {columns} FROM {source}{condition} ORDER BY {order} LIMIT ? OFFSET ?",
+                (*params, limit, offset),
+            ).fetchall()
+            total = self._conn.execute(
+                f"SELECT COUNT(*) FROM (SELECT 1 FROM {source}{condition} LIMIT {COUNT_CAP})", params
+            ).fetchone()[0]
+            facet_rows = self._conn.execute(
+                f"SELECT c.facet, c.value, COUNT(*) AS n FROM doc_facets c"
+                f" WHERE c.doc_id IN (SELECT d.id FROM {source}{condition})"
+                " GROUP BY c.facet, c.value ORDER BY c.facet, n DESC, c.value",
+                params,
+            ).fetchall() if facets else []
+
+        hits = []
+        for _, record, score, snippet in rows:
+            hit = json.loads(record)
+            if match:
+                hit["Score"] = round(-score, 4) # FTS5 rank (BM25) is lower-is-better
+                hit["Snippet"] = snippet
+            hits.append(hit)
+        counts: Dict[str, List[Tuple[str, int]]] = {}
+        for facet, value, count in facet_rows:
+            if len(counts.setdefault(facet, [])) < facet_limit:
+                counts[facet].append((value, count))
+        return SearchResults(hits, total, counts, (time.perf_counter() - start) * 1000)
+
+    def optimize(self):
+        """Merges the FTS index segments; worth running after large imports."""
+        with self._lock:
+            self._conn.execute("INSERT INTO docs_fts (docs_fts) VALUES ('optimize')")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+
+
+def merge_processed(articles: List[Dict], tagged: List[Dict], summaries: List[Dict]) -> List[Dict]:
+    """Joins fetched articles with their tags and summaries by URL, ready for ArchiveIndex.add."""
+    topics_by_url = {canonical_url(item.get("URL", "")): item.get("UPSC_Topics", []) for item in tagged}
+    summary_by_url = {canonical_url(item.get("URL", "")): item.get("Summary", "") for item in summaries}
+    merged = []
+    for article in articles:
+        url = canonical_url(article.get("URL", ""))
+        merged.append({**article, "UPSC_Topics": topics_by_url.get(url, article.get("UPSC_Topics", [])), "Summary": summary_by_url.get(url, "")})
+    return merged
+
+
+def days_ago(days: float) -> float:
+    """Epoch seconds `days` days before now, for search(since=...)."""
+    return (datetime.now() - timedelta(days=days)).timestamp()
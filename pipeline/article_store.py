@@ -0,0 +1,208 @@
+# pipeline/article_store.py
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from config.settings import ARTICLE_STORE_PATH, ARTICLE_STORE_WINDOW_HOURS
+from pipeline.dedup import article_text
+
+# Query parameters that only track the click, never change the article
+_TRACKING_PARAMS = {"fbclid", "gclid", "ref", "ref_src", "cmpid", "ocid", "mc_cid", "mc_eid"}
+
+
+def canonical_url(url: str) -> str:
+    """
+    Normalizes a news URL so the same article always maps to one key:
+    lowercases scheme and host, drops 'www.', fragments, tracking parameters
+    and trailing slashes, and sorts the remaining query string.
+    """
+    url = (url or "").strip()
+    parts = urlsplit(url)
+    if not parts.scheme or not parts.netloc:
+        return url
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in _TRACKING_PARAMS and not key.lower().startswith("utm_")
+    )
+    return urlunsplit((parts.scheme.lower(), host, parts.path.rstrip("/") or "/", urlencode(query), ""))
+
+
+def content_hash(article: Dict) -> str:
+    """Hash of the article's normalized title and description; changes when the story is edited."""
+    return hashlib.sha1(article_text(article).encode("utf-8")).hexdigest()
+
+
+class ArticleStore:
+    """
+    Persistent record of every processed article and its pipeline state, stored in SQLite.
+
+    Articles are keyed by canonical URL and carry a content hash. Tags and summaries are
+    stored together with the content hash they were produced from, so a later run only
+    sends articles that are new or whose content changed through the LLM stages, and the
+    output files are rebuilt from the stored results. Pass path=None for an in-memory store.
+    """
+
+    def __init__(self, path: Optional[str] = ARTICLE_STORE_PATH):
+        self._lock = threading.Lock()
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path or ":memory:", check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS articles ("
+            " canonical_url TEXT PRIMARY KEY,"
+            " content_hash TEXT NOT NULL,"
+            " article TEXT NOT NULL," # Fetched record as JSON
+            " first_seen_at REAL NOT NULL,"
+            " last_seen_at REAL NOT NULL,"
+            " topics TEXT, tagged_by TEXT, tagged_hash TEXT," # Tag state
+            " summary TEXT, summarized_hash TEXT," # Summary record as JSON
+            " linked_at REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_articles_content ON articles (content_hash)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_articles_seen ON articles (last_seen_at)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS link_reports ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT, created_at REAL NOT NULL, urls TEXT NOT NULL, report TEXT NOT NULL)"
+        )
+
+    def diff(self, news_items: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Records the fetch of `news_items` and splits them by processing state.
+
+        An article whose content matches one already processed under another URL
+        (e.g. an AMP or syndicated copy) inherits that article's tags and summary.
+
+        Returns:
+            (pending, unchanged): articles that still need tagging, summarizing or linking, and
+            articles whose stored results are current (with 'UPSC_Topics' filled in)
+        """
+        now = time.time()
+        pending, unchanged = [], []
+        with self._lock:
+            self._conn.execute("BEGIN")
+            for article in news_items:
+                url, digest = canonical_url(article.get("URL", "")), content_hash(article)
+                encoded = json.dumps(article, ensure_ascii=False)
+                row = self._conn.execute(
+                    "SELECT topics, tagged_by, tagged_hash, summary, summarized_hash, linked_at FROM articles WHERE canonical_url = ?", (url,)
+                ).fetchone()
+                if row is None:
+                    self._conn.execute(
+                        "INSERT INTO articles (canonical_url, content_hash, article, first_seen_at, last_seen_at) VALUES (?, ?, ?, ?, ?)",
+                        (url, digest, encoded, now, now),
+                    )
+                    twin = self._conn.execute(
+                        "SELECT topics, tagged_by, summary, linked_at FROM articles"
+                        " WHERE content_hash = ? AND canonical_url != ? AND tagged_hash = content_hash AND summarized_hash = content_hash",
+                        (digest, url),
+                    ).fetchone()
+                    if twin is not None:
+                        summary = {**json.loads(twin[2]), "Title": article.get("Title", "N/A"), "URL": article.get("URL", "N/A")}
+                        self._conn.execute(
+                            "UPDATE articles SET topics = ?, tagged_by = ?, tagged_hash = ?, summary = ?, summarized_hash = ?, linked_at = ?"
+                            " WHERE canonical_url = ?",
+                            (twin[0], twin[1], digest, json.dumps(summary, ensure_ascii=False), digest, twin[3], url),
+                        )
+                        row = (twin[0], twin[1], digest, summary, digest, twin[3])
+                else:
+                    self._conn.execute(
+                        "UPDATE articles SET content_hash = ?, article = ?, last_seen_at = ? WHERE canonical_url = ?",
+                        (digest, encoded, now, url),
+                    )
+                # Fully processed means tagged and summarized for this content, and linked
+                if row is not None and row[2] == digest and row[4] == digest and row[5] is not None:
+                    unchanged.append({**article, "UPSC_Topics": json.loads(row[0] or "[]"), "Tagged_By": row[1]})
+                else:
+                    pending.append(article)
+            self._conn.execute("COMMIT")
+        print(f"🗂️  Article store: {len(pending)} new or changed, {len(unchanged)} unchanged of {len(news_items)} fetched.")
+        return pending, unchanged
+
+    def record_tags(self, tagged: List[Dict]):
+        """
+        Stores 'UPSC_Topics' for each tagged article, valid for its current content.
+        An empty topic list is a result too (the article is not UPSC-relevant) and marks the
+        article as tagged; pass only articles the tagger actually returned.
+        """
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE articles SET topics = ?, tagged_by = ?, tagged_hash = content_hash WHERE canonical_url = ?",
+                [
+                    (json.dumps(item.get("UPSC_Topics", []), ensure_ascii=False), item.get("Tagged_By"), canonical_url(item.get("URL", "")))
+                    for item in tagged
+                ],
+            )
+
+    def record_summaries(self, summaries: List[Dict]):
+        """
+        Stores summary records ('Title', 'URL', 'Summary' and optional 'See_Also'), valid for the
+        current content. Like record_tags, an empty summary marks the article as summarized.
+        """
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE articles SET summary = ?, summarized_hash = content_hash WHERE canonical_url = ?",
+                [
+                    (json.dumps(item, ensure_ascii=False), canonical_url(item.get("URL", "")))
+                    for item in summaries
+                ],
+            )
+
+    def record_links(self, articles: List[Dict], report: str):
+        """Stores one linker report covering `articles` and marks them as linked."""
+        now = time.time()
+        urls = [canonical_url(item.get("URL", "")) for item in articles]
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.execute(
+                "INSERT INTO link_reports (created_at, urls, report) VALUES (?, ?, ?)",
+                (now, json.dumps(urls), report),
+            )
+            self._conn.executemany("UPDATE articles SET linked_at = ? WHERE canonical_url = ?", [(now, url) for url in urls])
+            self._conn.execute("COMMIT")
+
+    def _since(self, window_hours: Optional[float]) -> float:
+        hours = ARTICLE_STORE_WINDOW_HOURS if window_hours is None else window_hours
+        return time.time() - hours * 3600
+
+    def tagged_articles(self, window_hours: Optional[float] = None) -> List[Dict]:
+        """Tagged articles seen within the window, most recently first seen first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT article, topics, tagged_by FROM articles"
+                " WHERE last_seen_at >= ? AND tagged_hash = content_hash ORDER BY first_seen_at DESC",
+                (self._since(window_hours),),
+            ).fetchall()
+        return [{**json.loads(article), "UPSC_Topics": json.loads(topics), "Tagged_By": tagged_by} for article, topics, tagged_by in rows]
+
+    def summaries(self, window_hours: Optional[float] = None) -> List[Dict]:
+        """Summary records of articles seen within the window, most recently first seen first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT summary FROM articles"
+                " WHERE last_seen_at >= ? AND summarized_hash = content_hash ORDER BY first_seen_at DESC",
+                (self._since(window_hours),),
+            ).fetchall()
+        return [json.loads(summary) for (summary,) in rows]
+
+    def link_reports(self, window_hours: Optional[float] = None) -> List[Tuple[float, int, str]]:
+        """(created_at, number of articles covered, report) for linker runs within the window, newest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT created_at, urls, report FROM link_reports WHERE created_at >= ? ORDER BY created_at DESC",
+                (self._since(window_hours),),
+            ).fetchall()
+        return [(created_at, len(json.loads(urls)), report) for created_at, urls, report in rows]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
@@ -0,0 +1,98 @@
+# pipeline/batcher.py
+"""
+Token-budget batching for the tagger and summarizer.
+
+Articles are packed, in order, into calls whose prompts reach a target token budget
+(estimated locally with pipeline.tokens.estimate_tokens). The agent persona and task
+instructions are then paid once per call rather than once per article. A call also
+stops taking articles once its expected response would come near the model's output
+limit, so long batches never come back truncated. A batch that fails is split in half
+and each half is retried, down to single articles.
+"""
+from typing import Callable, Dict, List
+
+from config.settings import BATCH_TOKEN_BUDGET, BATCH_MAX_ARTICLES, LLM_MAX_OUTPUT_TOKENS
+from pipeline.tokens import estimate_tokens
+from tools.tracing import tracer
+
+_OUTPUT_HEADROOM = 0.8 # Plan for at most this share of max_tokens; estimates are rough
+
+
+class TokenBudget:
+    """
+    How one kind of call (e.g. "summarize") spends tokens.
+
+    Args:
+        overhead: Fixed prompt text sent with every call (system prompt, instructions)
+        format_item: Renders one article the way it appears in the prompt
+        output_tokens: Estimated response tokens for one article
+    """
+
+    def __init__(self, overhead: str, format_item: Callable[[Dict], str], output_tokens: Callable[[Dict], int]):
+        self.overhead_tokens = estimate_tokens(overhead)
+        self.format_item = format_item
+        self.output_tokens = output_tokens
+
+
+def pack_batches(
+    items: List[Dict],
+    budget: TokenBudget,
+    max_input_tokens: int = BATCH_TOKEN_BUDGET,
+    max_output_tokens: int = LLM_MAX_OUTPUT_TOKENS,
+    max_items: int = BATCH_MAX_ARTICLES,
+) -> List[List[Dict]]:
+    """
+    Greedily packs `items` into consecutive batches. A batch is closed when the next
+    article would push its prompt past `max_input_tokens`, its expected response past
+    the output headroom of `max_output_tokens`, or its size past `max_items`.
+    An article too large on its own still gets a batch of one.
+
+    Returns:
+        Batches in input order; concatenated they equal `items`
+    """
+    output_limit = max_output_tokens * _OUTPUT_HEADROOM
+    batches: List[List[Dict]] = []
+    current: List[Dict] = []
+    input_tokens, output_tokens = budget.overhead_tokens, 0
+    for item in items:
+        item_input = estimate_tokens(budget.format_item(item))
+        item_output = budget.output_tokens(item)
+        if current and (
+            input_tokens + item_input > max_input_tokens
+            or output_tokens + item_output > output_limit
+            or len(current) >= max_items
+        ):
+            batches.append(current)
+            current, input_tokens, output_tokens = [], budget.overhead_tokens, 0
+        current.append(item)
+        input_tokens += item_input
+        output_tokens += item_output
+    if current:
+        batches.append(current)
+    return batches
+
+
+def call_with_split(
+    fn: Callable[[List[Dict]], List[Dict]],
+    items: List[Dict],
+    fallback: Callable[[Dict], Dict],
+    stage: str = "batch",
+) -> List[Dict]:
+    """
+    Runs `fn` on a batch; if it raises, splits the batch in half and retries each half,
+    recursively. An article that still fails on its own is replaced by `fallback(article)`.
+
+    Returns:
+        One result per item, in input order
+    """
+    if not items:
+        return []
+    try:
+        return fn(items)
+    except Exception as e:
+        if len(items) == 1:
+            print(f"❌ {stage.capitalize()} failed for '{items[0].get('Title', 'N/A')}': {e}")
+            return [fallback(items[0])]
+    tracer.count("upsc_batch_splits_total", stage=stage)
+    middle = len(items) // 2
+    return call_with_split(fn, items[:middle], fallback, stage) + call_with_split(fn, items[middle:], fallback, stage)
@@ -0,0 +1,94 @@
+# pipeline/checkpoint.py
+import json
+import os
+import tempfile
+import time
+from typing import Any, Callable, Optional
+
+from config.settings import CHECKPOINT_DIR
+from tools.cache import make_cache_key
+from tools.tracing import tracer
+
+
+class StageCheckpoints:
+    """
+    Per-stage checkpoints for the crew pipeline, one JSON file per stage in `directory`.
+
+    Each checkpoint stores the stage's output together with a hash of everything that
+    went into it (task wording plus the upstream output). When resuming, a stage whose
+    input hash matches its checkpoint is skipped; the first stage whose input changed
+    or that never finished runs again, and since its fresh output changes the input
+    hash of every later stage, they re-run too.
+    """
+
+    def __init__(self, directory: str = CHECKPOINT_DIR, resume: bool = False):
+        self.directory = directory
+        self.resume = resume
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, stage: str) -> str:
+        return os.path.join(self.directory, f"{stage}.json")
+
+    def load(self, stage: str, input_hash: str) -> Optional[Any]:
+        """Returns the checkpointed output of `stage` if it was produced from `input_hash`."""
+        try:
+            with open(self._path(stage), encoding="utf-8") as f:
+                checkpoint = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return checkpoint.get("output") if checkpoint.get("input_hash") == input_hash else None
+
+    def save(self, stage: str, input_hash: str, output: Any):
+        """Writes the checkpoint atomically: a crash mid-write leaves the previous checkpoint intact."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=f".{stage}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"stage": stage, "input_hash": input_hash, "created_at": time.time(), "output": output}, f, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self._path(stage))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def run(self, stage: str, inputs: Any, fn: Callable[[], Any]) -> Any:
+        """
+        Runs one stage, or returns its checkpointed output when resuming with unchanged input.
+
+        Args:
+            stage: Stage name, also the checkpoint's file name
+            inputs: JSON-serializable values the stage's output depends on
+            fn: Produces the stage's (JSON-serializable) output
+
+        Returns:
+            The stage's output
+        """
+        input_hash = make_cache_key(stage, inputs)
+        with tracer.span("pipeline.stage", stage=stage) as span:
+            if self.resume:
+                output = self.load(stage, input_hash)
+                if output is not None:
+                    span.set(checkpoint_hit=True)
+                    print(f"⏭️  Skipping {stage}: checkpoint matches its input.")
+                    return output
+            output = fn()
+        self.save(stage, input_hash, output)
+        print(f"💾 Checkpointed {stage}.")
+        return output
+
+    def clear(self):
+        """Removes every stage checkpoint."""
+        for name in os.listdir(self.directory):
+            if name.endswith(".json"):
+                os.remove(os.path.join(self.directory, name))
+
+
+def time_window(seconds: float, now: Optional[float] = None) -> str:
+    """
+    Start (UTC) of the fixed `seconds`-long window containing `now`. Part of the input of
+    stages whose output depends on when they ran, such as fetching today's news, so their
+    checkpoint is only reused within the window.
+    """
+    now = time.time() if now is None else now
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(now // seconds * seconds))
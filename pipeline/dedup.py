@@ -0,0 +1,212 @@
+# pipeline/dedup.py
+import hashlib
+import os
+import random
+import re
+import sqlite3
+import threading
+import time
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError: # Pure-Python fallback computes identical signatures, just slower
+    np = None
+
+from config.settings import NEWS_SOURCES, DEDUP_THRESHOLD, DEDUP_NUM_PERM, DEDUP_BANDS, DEDUP_DROP_SEEN
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1 # Hashes and permutation coefficients stay below 2**32 so a*h+b fits in uint64
+_SHINGLE_SIZE = 5 # Character shingles: robust for the short title + snippet texts Serper returns
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def _permutations(num_perm: int) -> List[Tuple[int, int]]:
+    # Fixed seed: signatures must stay comparable across runs and processes
+    rng = random.Random(1729)
+    return [(rng.randrange(1, _MAX_HASH), rng.randrange(0, _MAX_HASH)) for _ in range(num_perm)]
+
+
+def article_text(article: Dict) -> str:
+    """The text compared for near-duplicates: title plus description, normalized."""
+    text = f"{article.get('Title', '')} {article.get('Description', '')}"
+    return " ".join(_TOKEN_RE.findall(text.lower()))
+
+
+def article_id(article: Dict) -> str:
+    """Stable identifier for an article, from its URL (or its text when the URL is missing)."""
+    basis = article.get("URL") or article_text(article)
+    return hashlib.sha1(basis.encode("utf-8")).hexdigest()
+
+
+def source_priority(source: Optional[str]) -> int:
+    """Lower is preferred: sources listed in NEWS_SOURCES win, in their listed order."""
+    source = (source or "").lower()
+    for i, preferred in enumerate(NEWS_SOURCES):
+        if source and (preferred.lower() in source or source in preferred.lower()):
+            return i
+    return len(NEWS_SOURCES)
+
+
+class MinHasher:
+    """Computes MinHash signatures over character shingles of a text."""
+
+    def __init__(self, num_perm: int = DEDUP_NUM_PERM):
+        self.num_perm = num_perm
+        self._perms = _permutations(num_perm)
+        if np is not None:
+            self._a = np.array([a for a, _ in self._perms], dtype=np.uint64)[:, None]
+            self._b = np.array([b for _, b in self._perms], dtype=np.uint64)[:, None]
+
+    def signature(self, text: str) -> Tuple[int, ...]:
+        if len(text) <= _SHINGLE_SIZE:
+            shingles = {text}
+        else:
+            shingles = {text[i:i + _SHINGLE_SIZE] for i in range(len(text) - _SHINGLE_SIZE + 1)}
+        hashes = [int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=4).digest(), "little") for s in shingles]
+        if np is not None:
+            values = (self._a * np.array(hashes, dtype=np.uint64) + self._b) % np.uint64(_MERSENNE_PRIME)
+            return tuple(int(v) for v in (values & np.uint64(_MAX_HASH)).min(axis=1))
+        return tuple(
+            min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+            for a, b in self._perms
+        )
+
+    @staticmethod
+    def similarity(sig_a: Sequence[int], sig_b: Sequence[int]) -> float:
+        """Estimated Jaccard similarity of the underlying shingle sets."""
+        return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / len(sig_a)
+
+
+class NearDuplicateIndex:
+    """
+    LSH index over MinHash signatures, stored in SQLite.
+
+    Signatures are split into bands; two articles become candidates when any band
+    hashes to the same bucket, so a lookup costs one indexed query per band no
+    matter how large the history grows. Pass path=None for a throwaway in-memory index.
+    """
+
+    def __init__(self, path: Optional[str] = None, num_perm: int = DEDUP_NUM_PERM, bands: int = DEDUP_BANDS, threshold: float = DEDUP_THRESHOLD):
+        if num_perm % bands:
+            raise ValueError("DEDUP_NUM_PERM must be divisible by DEDUP_BANDS.")
+        self.hasher = MinHasher(num_perm)
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path or ":memory:", check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS signatures ("
+            " article_id TEXT PRIMARY KEY, url TEXT, signature BLOB NOT NULL, added_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE TABLE IF NOT EXISTS bands (band INTEGER NOT NULL, bucket INTEGER NOT NULL, article_id TEXT NOT NULL)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_bands_bucket ON bands (band, bucket)")
+
+    def _buckets(self, signature: Sequence[int]) -> List[Tuple[int, int]]:
+        buckets = []
+        for band in range(self.bands):
+            chunk = array("Q", signature[band * self.rows:(band + 1) * self.rows]).tobytes()
+            buckets.append((band, int.from_bytes(hashlib.blake2b(chunk, digest_size=7).digest(), "little")))
+        return buckets
+
+    def query(self, signature: Sequence[int]) -> Optional[Tuple[str, float]]:
+        """Returns (article_id, similarity) of the closest indexed near-duplicate, or None."""
+        with self._lock:
+            candidates = set()
+            for band, bucket in self._buckets(signature):
+                candidates.update(row[0] for row in self._conn.execute(
+                    "SELECT article_id FROM bands WHERE band = ? AND bucket = ?", (band, bucket)))
+            best = None
+            for candidate in candidates:
+                row = self._conn.execute("SELECT signature FROM signatures WHERE article_id = ?", (candidate,)).fetchone()
+                if row is None:
+                    continue
+                similarity = MinHasher.similarity(signature, array("Q", row[0]))
+                if similarity >= self.threshold and (best is None or similarity > best[1]):
+                    best = (candidate, similarity)
+        return best
+
+    def add(self, article_key: str, signature: Sequence[int], url: str = ""):
+        with self._lock:
+            if self._conn.execute("SELECT 1 FROM signatures WHERE article_id = ?", (article_key,)).fetchone():
+                return
+            self._conn.execute("BEGIN")
+            self._conn.execute(
+                "INSERT INTO signatures (article_id, url, signature, added_at) VALUES (?, ?, ?, ?)",
+                (article_key, url, array("Q", signature).tobytes(), time.time()),
+            )
+            self._conn.executemany(
+                "INSERT INTO bands (band, bucket, article_id) VALUES (?, ?, ?)",
+                [(band, bucket, article_key) for band, bucket in self._buckets(signature)],
+            )
+            self._conn.execute("COMMIT")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM signatures").fetchone()[0]
+
+
+def dedupe_articles(news_items: List[Dict], history: Optional[NearDuplicateIndex] = None, drop_seen: bool = DEDUP_DROP_SEEN) -> List[Dict]:
+    """
+    Collapses near-duplicate articles (e.g. one press release syndicated by several papers).
+
+    Keeps one canonical article per cluster, preferring sources in NEWS_SOURCES order, and
+    attaches the others as 'Alternate_Sources' ({'Source', 'URL'} dicts). With a `history`
+    index, every member of a kept cluster is recorded in it; if `drop_seen` is set, a
+    cluster is dropped entirely when any of its members duplicates a different article
+    from an earlier run (repeats of the same URL are left to the article store, which
+    reprocesses them only if they changed).
+
+    Returns:
+        Canonical articles in order of first appearance
+    """
+    run_index = NearDuplicateIndex(threshold=history.threshold if history else DEDUP_THRESHOLD)
+    hasher = run_index.hasher
+    clusters: Dict[str, List[Dict]] = {} # First member's id -> members, canonical first
+    order: List[str] = []
+    signatures: Dict[str, Tuple[int, ...]] = {} # Article id -> signature, for every member
+
+    for article in news_items:
+        key = article_id(article)
+        if key in signatures:
+            continue # Exact repeat of an article already in this run
+        signature = hasher.signature(article_text(article))
+        signatures[key] = signature
+        match = run_index.query(signature)
+        if match is None:
+            run_index.add(key, signature, article.get("URL", ""))
+            clusters[key] = [article]
+            order.append(key)
+            continue
+        members = clusters[match[0]]
+        if source_priority(article.get("Source")) < source_priority(members[0].get("Source")):
+            members.insert(0, article)
+        else:
+            members.append(article)
+
+    canonical_articles = []
+    dropped = 0
+    for key in order:
+        canonical, *alternates = clusters[key]
+        if history is not None:
+            member_ids = [article_id(member) for member in clusters[key]]
+            if drop_seen:
+                matches = [(history.query(signatures[member_id]), member_id) for member_id in member_ids]
+                if any(seen is not None and seen[0] != member_id for seen, member_id in matches):
+                    dropped += 1
+                    continue
+            for member, member_id in zip(clusters[key], member_ids):
+                history.add(member_id, signatures[member_id], member.get("URL", ""))
+        if alternates:
+            canonical = {**canonical, "Alternate_Sources": [{"Source": a.get("Source", "N/A"), "URL": a.get("URL", "N/A")} for a in alternates]}
+        canonical_articles.append(canonical)
+
+    duplicates = len(news_items) - len(order)
+    if duplicates or dropped:
+        print(f"🧹 Deduplicated {len(news_items)} articles → {len(canonical_articles)} ({duplicates} near-duplicates, {dropped} seen in earlier runs).")
+    return canonical_articles
@@ -0,0 +1,317 @@
+# pipeline/fanout.py
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from agents.context_store import get_context_store
+from agents.llm import agent_system_prompt
+from agents.router import ModelRouter, model_router
+from agents.summarizer_agent import SummarizerAgents
+from agents.tagger_agent import TaggerAgents
+from config.settings import (
+    UPSC_GS_TOPICS,
+    PIPELINE_MAX_WORKERS,
+    PIPELINE_BATCH_SIZE,
+    CLASSIFIER_ENABLED,
+    ROUTER_MIN_CONFIDENCE,
+    COMPACT_TOPIC_CODES,
+)
+from knowledge.classifier import get_classifier
+from pipeline.batcher import TokenBudget, call_with_split, pack_batches
+from pipeline.formatting import format_news_for_tagging, format_news_for_summarization
+from pipeline.tasks import (
+    build_tag_description,
+    TAG_EXPECTED_OUTPUT,
+    SUMMARIZE_DESCRIPTION,
+    SUMMARIZE_EXPECTED_OUTPUT,
+    build_prompt,
+)
+from pipeline.tokens import estimate_tokens
+from tools.schemas import ArticleSummary, TaggedArticle, iter_streamed_records, match_outputs, parse_records
+from tools.tracing import tracer
+
+_SUMMARY_TOKENS = 200 # Rough response tokens for one summary, excluding the echoed title and URL
+
+
+def _parse_tags(articles: List[Dict], response: str) -> List[Optional[Dict]]:
+    # TaggedArticle validation already decodes topic codes back to topic names
+    return match_outputs(articles, [record.to_record() for record in parse_records(response, TaggedArticle)])
+
+
+def _parse_summaries(articles: List[Dict], response: str) -> List[Optional[Dict]]:
+    return match_outputs(articles, [record.to_record() for record in parse_records(response, ArticleSummary)])
+
+
+def accept_tags(output: Optional[Dict]) -> bool:
+    """Whether a tagger output record is good enough to keep without asking the strong model."""
+    if not output: # The model returned nothing for this article
+        return False
+    confidence = output.get("Confidence")
+    return bool(output.get("UPSC_Topics")) and (confidence is None or confidence >= ROUTER_MIN_CONFIDENCE)
+
+
+def accept_summary(output: Optional[Dict]) -> bool:
+    """Whether a summarizer output record is good enough to keep without asking the strong model."""
+    return bool(output and (output.get("Summary") or "").strip())
+
+
+def _tag_note(output: Dict) -> str:
+    return f"{output.get('Title', 'N/A')} → {', '.join(output.get('UPSC_Topics', []))}"
+
+
+def _summary_note(output: Dict) -> str:
+    # The headline and the summary's first sentence are enough to keep related stories consistent
+    summary = (output.get("Summary") or "").strip()
+    return f"{output.get('Title', 'N/A')}: {summary.split('. ')[0].rstrip('.')}."
+
+
+def untagged(article: Dict) -> Dict:
+    """Placeholder tagger result for an article that could not be tagged."""
+    return {**article, "UPSC_Topics": []}
+
+
+def unsummarized(article: Dict) -> Dict:
+    """Placeholder summarizer result for an article that could not be summarized."""
+    return {"Title": article.get("Title", "N/A"), "URL": article.get("URL", "N/A"), "Summary": ""}
+
+
+def _tag_output_tokens(article: Dict) -> int:
+    # The tagger echoes the title and URL (and the description, unless topics are compact codes)
+    echoed = article.get("Title", "") + article.get("URL", "")
+    if not COMPACT_TOPIC_CODES:
+        echoed += article.get("Description", "")
+    return estimate_tokens(echoed) + 30
+
+
+def _summary_output_tokens(article: Dict) -> int:
+    return estimate_tokens(article.get("Title", "") + article.get("URL", "")) + _SUMMARY_TOKENS
+
+
+def _split_units(items: List[Dict], batch_size: int, packer: Optional[Callable[[List[Dict]], List[List[Dict]]]]) -> List[List[Dict]]:
+    if batch_size <= 0 and packer is not None:
+        return packer(items)
+    batch_size = max(1, batch_size)
+    return [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
+
+
+def rejected_tags(articles: List[Dict], response: str) -> List[Dict]:
+    """The articles whose tags in a tagger `response` are missing or fail accept_tags."""
+    return [article for article, output in zip(articles, _parse_tags(articles, response)) if not accept_tags(output)]
+
+
+class ArticleProcessor:
+    """
+    Tags and summarizes small groups of articles with direct agent calls, each on its
+    routed model tier (agents.router); fast-tier results that fail validation are
+    redone by the strong model.
+    """
+
+    def __init__(self, tagger_agents: Optional[TaggerAgents] = None, summarizer_agents: Optional[SummarizerAgents] = None, router: Optional[ModelRouter] = None):
+        self.tagger_agents = tagger_agents or TaggerAgents()
+        self.summarizer_agents = summarizer_agents or SummarizerAgents()
+        self.router = router or model_router
+        self.tagger_agent = self.tagger_agents.upsc_tagger_agent()
+        self.summarizer_agent = self.summarizer_agents.summarizer_agent()
+        self.classifier = get_classifier() if CLASSIFIER_ENABLED else None
+        # What each call costs in tokens, for packing articles into calls (pipeline.batcher)
+        self.budgets = {
+            "tag": TokenBudget(
+                agent_system_prompt(self.tagger_agent) + build_prompt(build_tag_description(UPSC_GS_TOPICS), TAG_EXPECTED_OUTPUT, ""),
+                lambda article: format_news_for_tagging([article]),
+                _tag_output_tokens,
+            ),
+            "summarize": TokenBudget(
+                agent_system_prompt(self.summarizer_agent) + build_prompt(SUMMARIZE_DESCRIPTION, SUMMARIZE_EXPECTED_OUTPUT, ""),
+                lambda article: format_news_for_summarization([article]),
+                _summary_output_tokens,
+            ),
+        }
+
+    def pack(self, news_items: List[Dict], stage: str = "summarize") -> List[List[Dict]]:
+        """
+        Splits articles into calls that fit the token budget of `stage` ("tag" or "summarize").
+        Summarization prompts carry article bodies, so its budget also bounds tagging.
+        """
+        return pack_batches(news_items, self.budgets[stage])
+
+    def tag(self, news_items: List[Dict]) -> List[Dict]:
+        """
+        Returns the articles with an added 'UPSC_Topics' list.
+        Articles the syllabus pre-classifier is confident about are tagged without an LLM
+        call; the rest go to the tagger with only their candidate topics in the prompt.
+        """
+        tagged: List[Optional[Dict]] = [None] * len(news_items)
+        pending, candidates = [], set()
+        for i, article in enumerate(news_items):
+            if self.classifier is not None:
+                result = self.classifier.classify_article(article)
+                if result.confident:
+                    tagged[i] = {**article, "UPSC_Topics": result.topics, "Tagged_By": "rules"}
+                    continue
+                candidates.update(result.candidates)
+            pending.append(i)
+        tracer.count("upsc_rule_tagged_articles_total", len(news_items) - len(pending))
+        if not pending:
+            return tagged
+
+        articles = [news_items[i] for i in pending]
+        topics = [topic for topic in UPSC_GS_TOPICS if topic in candidates] or UPSC_GS_TOPICS
+        description = build_tag_description(topics)
+        outputs = self.router.run_items(
+            "tagger", self.tagger_agent, "tag", articles,
+            lambda batch: build_prompt(description, TAG_EXPECTED_OUTPUT, format_news_for_tagging(batch)),
+            _parse_tags, accept_tags, _tag_note,
+        )
+        for i, article, output in zip(pending, articles, outputs):
+            tagged[i] = {**article, "UPSC_Topics": (output or {}).get("UPSC_Topics", []), "Tagged_By": "llm"}
+        return tagged
+
+    def summarize(self, tagged_items: List[Dict]) -> List[Dict]:
+        """Returns one {'Title', 'URL', 'Summary'} record per article."""
+        outputs = self.router.run_items(
+            "summarizer", self.summarizer_agent, "summarize", tagged_items,
+            lambda batch: build_prompt(SUMMARIZE_DESCRIPTION, SUMMARIZE_EXPECTED_OUTPUT, format_news_for_summarization(batch)),
+            _parse_summaries, accept_summary, _summary_note,
+        )
+        return [
+            {"Title": article.get("Title", "N/A"), "URL": article.get("URL", "N/A"), "Summary": (output or {}).get("Summary", "")}
+            for article, output in zip(tagged_items, outputs)
+        ]
+
+    def summarize_streaming(self, tagged_items: List[Dict], on_summary: Callable[[Dict], None]) -> List[Dict]:
+        """
+        Like summarize(), but streams the response and passes each article's summary to
+        `on_summary` as soon as its JSON object is complete. Articles the stream skipped or
+        got wrong (or all remaining ones, if the stream broke off) are redone afterwards
+        with summarize(), escalation included, and passed on as they finish.
+
+        Returns:
+            One {'Title', 'URL', 'Summary'} record per article, in input order
+        """
+        results: List[Optional[Dict]] = [None] * len(tagged_items)
+        index_by_url = {}
+        for i, article in enumerate(tagged_items):
+            index_by_url.setdefault(article.get("URL"), i)
+        prompt = build_prompt(SUMMARIZE_DESCRIPTION, SUMMARIZE_EXPECTED_OUTPUT, format_news_for_summarization(tagged_items))
+        stream = self.router.stream("summarizer", self.summarizer_agent, prompt, "summarize", items=len(tagged_items))
+        try:
+            for record in iter_streamed_records(stream, ArticleSummary):
+                output = record.to_record()
+                i = index_by_url.get(output.get("URL")) if output.get("URL") else None
+                if i is None or results[i] is not None or not accept_summary(output):
+                    continue
+                article = tagged_items[i]
+                results[i] = {"Title": article.get("Title", "N/A"), "URL": article.get("URL", "N/A"), "Summary": output["Summary"]}
+                on_summary(results[i])
+        except Exception as e:
+            print(f"❌ Streamed summarization broke off after {sum(r is not None for r in results)} article(s): {e}")
+        context = get_context_store("summarizer")
+        if context is not None:
+            context.add([_summary_note(result) for result in results if result is not None])
+
+        rest = [i for i, result in enumerate(results) if result is None]
+        if rest:
+            for i, summary in zip(rest, call_with_split(self.summarize, [tagged_items[i] for i in rest], unsummarized, stage="summarization")):
+                results[i] = summary
+                if accept_summary(summary):
+                    on_summary(summary)
+        return results
+
+    def process(self, news_items: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Tags then summarizes one unit of work. A failed call is retried on each half of
+        the unit; articles that fail on their own yield empty results instead of aborting the run.
+        """
+        with tracer.span("pipeline.unit", stage="tag", articles=len(news_items)):
+            tagged = call_with_split(self.tag, news_items, untagged, stage="tagging")
+        with tracer.span("pipeline.unit", stage="summarize", articles=len(tagged)):
+            summaries = call_with_split(self.summarize, tagged, unsummarized, stage="summarization")
+        return tagged, summaries
+
+
+def run_fanout(
+    news_items: List[Dict],
+    processor: Optional[ArticleProcessor] = None,
+    max_workers: int = PIPELINE_MAX_WORKERS,
+    batch_size: int = PIPELINE_BATCH_SIZE,
+) -> Tuple[List[Dict], List[Dict]]:
+    """
+    Splits the articles into units of `batch_size` (or, when it is 0, into units packed
+    to the token budget) and tags+summarizes them on a worker pool. Each unit moves
+    straight from tagging to summarization, so summaries start as soon as the first unit
+    is tagged. Results are merged back in input order.
+
+    Returns:
+        (tagged articles, summaries), both aligned with `news_items`
+    """
+    if not news_items:
+        return [], []
+    processor = processor or ArticleProcessor()
+    units = _split_units(news_items, batch_size, processor.pack)
+
+    submitted = time.perf_counter()
+
+    def process(unit: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+        # How long the unit sat in the pool's queue before a worker picked it up
+        tracer.record("queue.wait", time.perf_counter() - submitted, stage="fanout")
+        return processor.process(unit)
+
+    tagged, summaries = [], []
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(units)))) as executor:
+        for unit_tagged, unit_summaries in executor.map(process, units):
+            tagged.extend(unit_tagged)
+            summaries.extend(unit_summaries)
+    return tagged, summaries
+
+
+def stream_summaries(
+    news_items: List[Dict],
+    on_summary: Callable[[Dict], None],
+    processor: Optional[ArticleProcessor] = None,
+    max_workers: int = PIPELINE_MAX_WORKERS,
+) -> List[Dict]:
+    """
+    Summarizes articles in token-packed units on a worker pool, streaming every unit
+    (ArticleProcessor.summarize_streaming), so the first summary reaches `on_summary`
+    after roughly one call's time to first token rather than after the whole stage.
+
+    Returns:
+        One summary per article, aligned with `news_items`
+    """
+    if not news_items:
+        return []
+    processor = processor or ArticleProcessor()
+    units = processor.pack(news_items)
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(units)))) as executor:
+        return [
+            summary
+            for unit_summaries in executor.map(lambda unit: processor.summarize_streaming(unit, on_summary), units)
+            for summary in unit_summaries
+        ]
+
+
+def map_in_units(
+    fn: Callable[[List[Dict]], List[Dict]],
+    items: List[Dict],
+    max_workers: int = PIPELINE_MAX_WORKERS,
+    batch_size: int = PIPELINE_BATCH_SIZE,
+    packer: Optional[Callable[[List[Dict]], List[List[Dict]]]] = None,
+    fallback: Optional[Callable[[Dict], Dict]] = None,
+) -> List[Dict]:
+    """
+    Runs a single stage (e.g. ArticleProcessor.tag) over `items` in units of `batch_size`
+    on a worker pool and returns the concatenated results in input order.
+
+    Args:
+        packer: Splits the items into units when `batch_size` is 0 (e.g. ArticleProcessor.pack)
+        fallback: When given, failed units are split in half and retried, and articles
+            that still fail get fallback(article) instead of aborting the run
+    """
+    if not items:
+        return []
+    units = _split_units(items, batch_size, packer)
+    if fallback is not None:
+        stage_fn = fn
+        fn = lambda unit: call_with_split(stage_fn, unit, fallback)
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(units)))) as executor:
+        return [record for unit_result in executor.map(fn, units) for record in unit_result]
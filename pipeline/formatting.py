@@ -0,0 +1,102 @@
+# pipeline/formatting.py
+import re
+from typing import Dict, Iterable, List
+
+from tools.schemas import NewsArticle, parse_records
+
+
+_ITEM_START_RE = re.compile(r"^(?:\d+\.\s+(?:Title:\s*)?|Title:\s*)(.*)$") # "3. Headline", "3. Title: Headline" or "Title: Headline"
+_FIELD_RE = re.compile(r"^(Title|Source|Date|Description|URL):\s*(.*)$")
+
+
+def parse_news_result(result_string: str) -> List[Dict]:
+    """
+    Parses the news search tool (or fetcher agent) output into a list of dictionaries
+    with Title, Source, Date, Description and URL.
+    The JSON block the search tool emits is preferred; plain "1. Title / Source: ..."
+    text is parsed in a single pass as a fallback. There is no cap on the number of items.
+    """
+    records = [record for record in parse_records(result_string, NewsArticle) if record.url or record.title != "N/A"]
+    if records:
+        return [record.to_record() for record in records]
+
+    news_items = []
+    current_item: Dict = {}
+    for line in result_string.splitlines():
+        line = line.strip()
+        if not line or not line.strip("-="): # Skip empty lines and separators
+            continue
+        field = _FIELD_RE.match(line)
+        if field and field.group(1) != "Title":
+            if current_item:
+                current_item[field.group(1)] = field.group(2).strip()
+            continue
+        start = _ITEM_START_RE.match(line)
+        if start:
+            if current_item: # Save previous item if exists
+                news_items.append(current_item)
+            current_item = {"Title": start.group(1).strip()}
+        # Handle multi-line descriptions if they don't start with a new key
+        elif "Description" in current_item:
+            current_item["Description"] += " " + line
+
+    if current_item: # Add the last item
+        news_items.append(current_item)
+    return news_items
+
+
+def format_article_for_tagging(index: int, item: Dict) -> str:
+    """Formats one article for the TaggerAgent; `index` is its 1-based position in the prompt."""
+    return (
+        f"Article {index}:\n"
+        f"Title: {item.get('Title', 'N/A')}\n"
+        f"Description: {item.get('Description', 'N/A')}\n"
+        f"URL: {item.get('URL', 'N/A')}\n"
+        "--------------------\n"
+    )
+
+def format_article_for_summarization(index: int, item: Dict) -> str:
+    """
+    Formats one article for the SummarizerAgent; `index` is its 1-based position in the prompt.
+    The extracted article body (tools.article_extractor) is used when available, else the snippet.
+    """
+    body = item.get('Body')
+    content = f"Article {index} Content (Body): {body}\n" if body else f"Article {index} Content (Description): {item.get('Description', 'N/A')}\n"
+    return (
+        f"Article {index} Title: {item.get('Title', 'N/A')}\n"
+        f"{content}"
+        f"Article {index} Source: {item.get('Source', 'N/A')}\n"
+        f"Article {index} URL: {item.get('URL', 'N/A')}\n"
+        "---\n"
+    )
+
+def format_summary_for_linking(index: int, item: Dict) -> str:
+    """Formats one summarized, tagged article (and its nearest archive articles, if any) for the LinkerAgent."""
+    see_also = "".join(
+        f"  - {related.get('Title', 'N/A')} ({related.get('Date') or 'earlier'}): {related.get('URL', 'N/A')}\n"
+        for related in item.get("See_Also", [])
+    )
+    return (
+        f"Article {index}:\n"
+        f"Title: {item.get('Title', 'N/A')}\n"
+        f"Summary: {item.get('Summary', 'N/A')}\n"
+        f"UPSC Topics: {', '.join(item.get('UPSC_Topics', ['N/A']))}\n"
+        f"URL: {item.get('URL', 'N/A')}\n"
+        + (f"Related Past Articles:\n{see_also}" if see_also else "")
+        + "--------------------\n"
+    )
+
+def format_news_for_tagging(news_items: Iterable[Dict]) -> str:
+    """Formats parsed news items into a single string for the TaggerAgent."""
+    return "".join(format_article_for_tagging(i, item) for i, item in enumerate(news_items, 1))
+
+def format_news_for_summarization(news_items: Iterable[Dict]) -> str:
+    """Formats parsed news items into a single string for the SummarizerAgent."""
+    return "".join(format_article_for_summarization(i, item) for i, item in enumerate(news_items, 1))
+
+def format_summaries_for_linking(summaries_with_tags: Iterable[Dict]) -> str:
+    """Formats summaries and tags into a single string for the LinkerAgent."""
+    return "Summarized and Tagged Articles for Linking:\n" + "".join(
+        format_summary_for_linking(i, item) for i, item in enumerate(summaries_with_tags, 1)
+    )
+
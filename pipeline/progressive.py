@@ -0,0 +1,78 @@
+# pipeline/progressive.py
+"""
+Progressive output files for streamed LLM stages.
+
+While a stage runs, each finished record (or piece of text) is appended to
+`<path>.partial` and flushed at once, so `tail -f` or another process can read results
+as they arrive. When the stage completes, the partial file is fsynced and renamed over
+`path` in one step: `path` itself only ever holds a complete result, and a crash leaves
+the last complete file in place plus the partial one for inspection.
+"""
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+
+class ProgressiveWriter:
+    """
+    Append-only writer with atomic finalization. Thread-safe. Used as a context manager,
+    it finalizes on success and keeps the partial file if the block raises.
+
+    Args:
+        path: Final output file, e.g. output/upsc_news_summaries.jsonl
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.partial_path = path + ".partial"
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._file = open(self.partial_path, "w", encoding="utf-8")
+        self._lock = threading.Lock()
+        self._opened_at = time.perf_counter()
+        self.records = 0
+        self.first_write_s: Optional[float] = None # Seconds from opening to the first write
+
+    def write_record(self, record: Dict):
+        """Appends one record as a JSON line."""
+        self._append(json.dumps(record, ensure_ascii=False) + "\n")
+        with self._lock:
+            self.records += 1
+
+    def write_text(self, text: str):
+        """Appends raw text, e.g. a streamed chunk of the linker's report."""
+        if text:
+            self._append(text)
+
+    def _append(self, text: str):
+        with self._lock:
+            if self.first_write_s is None:
+                self.first_write_s = time.perf_counter() - self._opened_at
+            self._file.write(text)
+            self._file.flush()
+
+    def finalize(self) -> str:
+        """Makes the written output durable and moves it to `path`; returns `path`."""
+        with self._lock:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+            os.replace(self.partial_path, self.path)
+        return self.path
+
+    def abort(self):
+        """Closes the writer, leaving `path` untouched and the partial file behind."""
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    def __enter__(self) -> "ProgressiveWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.finalize()
+        else:
+            self.abort()
+        return False
@@ -0,0 +1,414 @@
+# pipeline/segments.py
+"""
+Append-only, segmented archive of processed articles.
+
+Records are appended as compressed JSON lines to numbered segment files, each record
+its own frame: zstd when `zstandard` is installed, gzip members otherwise. Either way a
+whole segment still decompresses to plain JSON lines (`zstdcat`, `zcat`). Three
+fixed-width, memory-mapped index files locate single records without touching the rest:
+
+- entries.idx: one 32-byte entry per appended record (key hash, day, segment, offset,
+  length, and the previous entry of the same day)
+- keys.idx: open-addressing hash table, article key (canonical URL) → latest entry
+- days.idx: day number → newest entry of that day; a day's entries form a chain
+
+Writing a record costs the record plus three fixed-size index writes. Reading one by key
+costs a hash probe and a single seek. Memory use does not grow with the archive. A
+record that is appended again supersedes the old copy, which stays on disk until
+compact() rewrites the live records, in day order, into a fresh generation of segments.
+"""
+import gzip
+import hashlib
+import json
+import mmap
+import os
+import shutil
+import struct
+import threading
+import time
+from datetime import date, datetime
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+from config.settings import SEGMENT_ARCHIVE_DIR, SEGMENT_MAX_BYTES, SEGMENT_COMPRESSION_LEVEL
+from pipeline.archive_index import published_timestamp
+from pipeline.article_store import canonical_url
+from pipeline.dedup import article_id
+
+_HEADER = struct.Struct("<8sQ") # Magic, record count (entries.idx) or key count (keys.idx)
+_ENTRY = struct.Struct("<QIIQII") # Key hash, day, segment, offset, length, previous entry of the day + 1
+_SLOT = struct.Struct("<QQ") # Key hash (0 = empty), entry + 1
+_DAY = struct.Struct("<Q") # Newest entry of the day + 1
+_ENTRIES_MAGIC, _KEYS_MAGIC, _DAYS_MAGIC = b"UPSCENT1", b"UPSCKEY1", b"UPSCDAY1"
+_INITIAL_SLOTS = 1 << 14
+_EPOCH = date(1970, 1, 1).toordinal()
+
+
+def record_key(record: Dict) -> str:
+    """The archive key of a record: its canonical URL (or a hash of its text when it has none)."""
+    return canonical_url(record.get("URL", "")) or article_id(record)
+
+
+def key_hash(key: str) -> int:
+    """64-bit hash of an archive key; never 0, which marks an empty hash slot."""
+    return int.from_bytes(hashlib.sha1(key.encode("utf-8")).digest()[:8], "little") or 1
+
+
+def day_number(value: Union[str, date, datetime, float]) -> int:
+    """Days since 1970-01-01 for a date, a 'YYYY-MM-DD' string or epoch seconds (local time)."""
+    if isinstance(value, str):
+        value = datetime.strptime(value, "%Y-%m-%d").date()
+    elif isinstance(value, (int, float)):
+        value = date.fromtimestamp(value)
+    elif isinstance(value, datetime):
+        value = value.date()
+    return value.toordinal() - _EPOCH
+
+
+class _MappedFile:
+    """A file with a 16-byte header, mapped into memory and grown (and remapped) on demand."""
+
+    def __init__(self, path: str, magic: bytes, initial_size: int):
+        self.path = path
+        self._file = open(path, "r+b" if os.path.exists(path) else "w+b")
+        if os.fstat(self._file.fileno()).st_size < initial_size:
+            self._file.truncate(initial_size)
+        self.map = mmap.mmap(self._file.fileno(), 0)
+        stored_magic, _ = _HEADER.unpack_from(self.map, 0)
+        if stored_magic == b"\0" * 8:
+            _HEADER.pack_into(self.map, 0, magic, 0)
+        elif stored_magic != magic:
+            raise ValueError(f"{path} is not a segment archive index")
+
+    @property
+    def count(self) -> int:
+        return _HEADER.unpack_from(self.map, 0)[1]
+
+    @count.setter
+    def count(self, value: int):
+        _HEADER.pack_into(self.map, 0, _HEADER.unpack_from(self.map, 0)[0], value)
+
+    def grow(self, size: int):
+        """Makes the file at least `size` bytes, doubling so appends stay amortized O(1)."""
+        if size <= len(self.map):
+            return
+        self.map.close()
+        self._file.truncate(max(size, 2 * os.fstat(self._file.fileno()).st_size))
+        self.map = mmap.mmap(self._file.fileno(), 0)
+
+    def flush(self):
+        self.map.flush()
+
+    def close(self):
+        self.map.close()
+        self._file.close()
+
+
+class _Generation:
+    """One set of segments plus their indexes, in its own directory. Not thread-safe."""
+
+    def __init__(self, directory: str, segment_max_bytes: int):
+        self.directory = directory
+        self.segment_max_bytes = segment_max_bytes
+        os.makedirs(directory, exist_ok=True)
+        self.entries = _MappedFile(os.path.join(directory, "entries.idx"), _ENTRIES_MAGIC, _HEADER.size + 1024 * _ENTRY.size)
+        self.keys = _MappedFile(os.path.join(directory, "keys.idx"), _KEYS_MAGIC, _HEADER.size + _INITIAL_SLOTS * _SLOT.size)
+        self.days = _MappedFile(os.path.join(directory, "days.idx"), _DAYS_MAGIC, _HEADER.size + 1024 * _DAY.size)
+        self.segments: Dict[int, str] = {} # Segment number -> path
+        for name in os.listdir(directory):
+            if name.startswith("segment-"):
+                self.segments[int(name[8:14])] = os.path.join(directory, name)
+        self._readers: Dict[int, int] = {} # Segment number -> read-only file descriptor
+        self._writer = None
+        self._writer_segment = 0
+
+    # --- Index files ---
+    def entry(self, n: int) -> Tuple[int, int, int, int, int, int]:
+        return _ENTRY.unpack_from(self.entries.map, _HEADER.size + n * _ENTRY.size)
+
+    def _capacity(self) -> int:
+        return (len(self.keys.map) - _HEADER.size) // _SLOT.size
+
+    def _probe(self, hashed: int) -> Tuple[int, int]:
+        """Slot position of `hashed` (or of the empty slot where it belongs), and its entry + 1."""
+        mask = self._capacity() - 1
+        slot = hashed & mask
+        while True:
+            position = _HEADER.size + slot * _SLOT.size
+            stored, entry = _SLOT.unpack_from(self.keys.map, position)
+            if stored == hashed:
+                return position, entry
+            if stored == 0:
+                return position, 0
+            slot = (slot + 1) & mask
+
+    def latest(self, hashed: int) -> Optional[int]:
+        """Number of the newest entry for a key hash, or None."""
+        entry = self._probe(hashed)[1]
+        return entry - 1 if entry else None
+
+    def _set_latest(self, hashed: int, n: int):
+        if (self.keys.count + 1) * 2 > self._capacity():
+            self._rehash(self._capacity() * 2)
+        position, entry = self._probe(hashed)
+        if not entry:
+            self.keys.count += 1
+        _SLOT.pack_into(self.keys.map, position, hashed, n + 1)
+
+    def _rehash(self, capacity: int):
+        """Rebuilds keys.idx with `capacity` slots, slot by slot, and swaps it in atomically."""
+        old = self.keys
+        tmp_path = old.path + ".tmp"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        self.keys = _MappedFile(tmp_path, _KEYS_MAGIC, _HEADER.size + capacity * _SLOT.size)
+        for slot in range((len(old.map) - _HEADER.size) // _SLOT.size):
+            hashed, entry = _SLOT.unpack_from(old.map, _HEADER.size + slot * _SLOT.size)
+            if hashed:
+                position, _ = self._probe(hashed)
+                _SLOT.pack_into(self.keys.map, position, hashed, entry)
+        self.keys.count = old.count
+        self.keys.flush()
+        old.close()
+        os.replace(tmp_path, old.path)
+        self.keys.path = old.path
+
+    def day_head(self, day: int) -> int:
+        """Newest entry of `day` + 1, or 0."""
+        position = _HEADER.size + day * _DAY.size
+        return _DAY.unpack_from(self.days.map, position)[0] if 0 <= day and position < len(self.days.map) else 0
+
+    def day_range(self) -> range:
+        return range(0, (len(self.days.map) - _HEADER.size) // _DAY.size)
+
+    # --- Segments ---
+    def _segment_path(self, segment: int, codec: str) -> str:
+        return os.path.join(self.directory, f"segment-{segment:06d}.jsonl{codec}")
+
+    def _open_writer(self, codec: str, frame_length: int):
+        if self._writer is None:
+            last = max(self.segments, default=0)
+            path = self.segments.get(last)
+            if path is None or not path.endswith(codec):
+                last += 1 # Never mix codecs within one segment
+                path = self._segment_path(last, codec)
+            self._writer, self._writer_segment = open(path, "ab"), last
+            self.segments[last] = path
+        if self._writer.tell() and self._writer.tell() + frame_length > self.segment_max_bytes:
+            self._writer.close()
+            self._writer_segment += 1
+            path = self._segment_path(self._writer_segment, codec)
+            self._writer = open(path, "ab")
+            self.segments[self._writer_segment] = path
+
+    def append_frame(self, hashed: int, day: int, frame: bytes, codec: str) -> int:
+        """Appends one compressed record and indexes it; returns its entry number."""
+        self._open_writer(codec, len(frame))
+        offset = self._writer.tell()
+        self._writer.write(frame)
+        # Segment bytes first, then the entry, then the count that publishes it, then the lookups
+        n = self.entries.count
+        self.entries.grow(_HEADER.size + (n + 1) * _ENTRY.size)
+        _ENTRY.pack_into(self.entries.map, _HEADER.size + n * _ENTRY.size, hashed, day, self._writer_segment, offset, len(frame), self.day_head(day))
+        self.entries.count = n + 1
+        self.days.grow(_HEADER.size + (day + 1) * _DAY.size)
+        _DAY.pack_into(self.days.map, _HEADER.size + day * _DAY.size, n + 1)
+        self._set_latest(hashed, n)
+        return n
+
+    def read_frame(self, segment: int, offset: int, length: int) -> bytes:
+        if self._writer is not None and segment == self._writer_segment:
+            self._writer.flush()
+        fd = self._readers.get(segment)
+        if fd is None:
+            fd = self._readers[segment] = os.open(self.segments[segment], os.O_RDONLY)
+        return os.pread(fd, length, offset)
+
+    def sync(self):
+        if self._writer is not None:
+            self._writer.flush()
+            os.fsync(self._writer.fileno())
+        for mapped in (self.entries, self.days, self.keys):
+            mapped.flush()
+
+    def size_bytes(self) -> int:
+        return sum(os.path.getsize(os.path.join(self.directory, name)) for name in os.listdir(self.directory))
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        for fd in self._readers.values():
+            os.close(fd)
+        self._readers.clear()
+        for mapped in (self.entries, self.days, self.keys):
+            mapped.close()
+
+
+class SegmentArchive:
+    """
+    The archive in `directory`. Thread-safe within one process; use one writer process.
+
+    Args:
+        directory: Archive root; the active generation is named in its CURRENT file
+        segment_max_bytes: A new segment is started once the current one would exceed this
+        compression_level: zstd level for new records (gzip uses its default level)
+    """
+
+    def __init__(self, directory: str = SEGMENT_ARCHIVE_DIR, segment_max_bytes: int = SEGMENT_MAX_BYTES, compression_level: int = SEGMENT_COMPRESSION_LEVEL):
+        self.directory = directory
+        self.segment_max_bytes = segment_max_bytes
+        self.codec = ".zst" if zstandard is not None else ".gz"
+        self._compressor = zstandard.ZstdCompressor(level=compression_level) if zstandard is not None else None
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._current_path = os.path.join(directory, "CURRENT")
+        try:
+            with open(self._current_path, encoding="utf-8") as f:
+                name = f.read().strip()
+        except FileNotFoundError:
+            name = "gen-000001"
+            self._set_current(name)
+        self._generation = _Generation(os.path.join(directory, name), segment_max_bytes)
+
+    def _set_current(self, name: str):
+        tmp_path = self._current_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(name + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self._current_path)
+
+    def _compress(self, data: bytes) -> bytes:
+        if self.codec == ".zst":
+            return self._compressor.compress(data)
+        return gzip.compress(data, mtime=0)
+
+    def _decode(self, segment_path: str, frame: bytes) -> Dict:
+        if segment_path.endswith(".zst"):
+            if zstandard is None:
+                raise RuntimeError(f"{segment_path} is zstd-compressed; install `zstandard` to read it")
+            data = zstandard.ZstdDecompressor().decompress(frame)
+        else:
+            data = gzip.decompress(frame)
+        return json.loads(data)
+
+    def _read(self, generation: _Generation, n: int) -> Dict:
+        _, _, segment, offset, length, _ = generation.entry(n)
+        return self._decode(generation.segments[segment], generation.read_frame(segment, offset, length))
+
+    def append(self, records: List[Dict]) -> int:
+        """
+        Appends processed article records (a newer copy of an article supersedes the old one)
+        and makes them durable. Each record's day comes from its 'Date' (else today).
+
+        Returns:
+            Number of records appended
+        """
+        now = time.time()
+        prepared = []
+        for record in records:
+            hashed = key_hash(record_key(record))
+            day = max(0, day_number(published_timestamp(record.get("Date", ""), now)))
+            line = json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n"
+            prepared.append((hashed, day, self._compress(line)))
+        with self._lock:
+            for hashed, day, frame in prepared:
+                self._generation.append_frame(hashed, day, frame, self.codec)
+            self._generation.sync()
+        return len(prepared)
+
+    def get(self, url: str) -> Optional[Dict]:
+        """The latest record of an article by URL (any form that canonicalizes the same), or None."""
+        hashed = key_hash(canonical_url(url) or url)
+        with self._lock:
+            n = self._generation.latest(hashed)
+            return self._read(self._generation, n) if n is not None else None
+
+    def day(self, value: Union[str, date, datetime, float]) -> List[Dict]:
+        """Live records of one day ('YYYY-MM-DD', a date or epoch seconds), in append order."""
+        day = day_number(value)
+        with self._lock:
+            generation = self._generation
+            return [self._read(generation, n) for n in reversed(list(self._day_entries(generation, day)))]
+
+    def _day_entries(self, generation: _Generation, day: int) -> Iterator[int]:
+        """Live entry numbers of `day`, newest first, skipping superseded copies."""
+        entry = generation.day_head(day)
+        while entry:
+            n = entry - 1
+            hashed, _, _, _, _, entry = generation.entry(n)
+            if generation.latest(hashed) == n:
+                yield n
+
+    def __iter__(self) -> Iterator[Dict]:
+        """Every live record in append order; reads one record at a time."""
+        with self._lock:
+            total = self._generation.entries.count
+        for n in range(total):
+            with self._lock:
+                generation = self._generation
+                if n >= generation.entries.count:
+                    return
+                hashed = generation.entry(n)[0]
+                record = self._read(generation, n) if generation.latest(hashed) == n else None
+            if record is not None:
+                yield record
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._generation.keys.count
+
+    def stats(self) -> Dict:
+        """Live records, appended entries (live plus superseded), segments, codec and size on disk."""
+        with self._lock:
+            generation = self._generation
+            return {
+                "generation": os.path.basename(generation.directory),
+                "records": generation.keys.count,
+                "entries": generation.entries.count,
+                "segments": len(generation.segments),
+                "codec": self.codec.lstrip("."),
+                "bytes": generation.size_bytes(),
+            }
+
+    def compact(self) -> Dict:
+        """
+        Rewrites the live records into a new generation, oldest day first, dropping superseded
+        copies and recompressing records whose codec differs from the current one. The new
+        generation replaces the old one atomically through the CURRENT file.
+
+        Returns:
+            stats() before and after, under "before" and "after"
+        """
+        before = self.stats()
+        with self._lock:
+            old = self._generation
+            name = f"gen-{int(os.path.basename(old.directory)[4:]) + 1:06d}"
+            target = os.path.join(self.directory, name)
+            if os.path.exists(target):
+                shutil.rmtree(target) # Left over from an interrupted compaction
+            new = _Generation(target, self.segment_max_bytes)
+            for day in old.day_range():
+                if not old.day_head(day):
+                    continue
+                for n in reversed(list(self._day_entries(old, day))): # Memory is bounded by one day's entries
+                    hashed, _, segment, offset, length, _ = old.entry(n)
+                    frame = old.read_frame(segment, offset, length)
+                    if not old.segments[segment].endswith(self.codec):
+                        frame = self._compress(json.dumps(self._decode(old.segments[segment], frame), ensure_ascii=False).encode("utf-8") + b"\n")
+                    new.append_frame(hashed, day, frame, self.codec)
+            new.sync()
+            self._set_current(name)
+            self._generation = new
+            old.close()
+            shutil.rmtree(old.directory)
+        return {"before": before, "after": self.stats()}
+
+    def close(self):
+        with self._lock:
+            self._generation.close()
@@ -0,0 +1,232 @@
+# pipeline/streaming.py
+import itertools
+import queue
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from config.settings import (
+    UPSC_GS_TOPICS,
+    PIPELINE_MAX_WORKERS,
+    PIPELINE_QUEUE_SIZE,
+    PIPELINE_LINK_WINDOW,
+    SERPER_MAX_WORKERS,
+    LINK_TOP_K,
+    EXTRACT_ENABLED,
+    EXTRACT_MAX_WORKERS,
+)
+from pipeline.dedup import NearDuplicateIndex, article_id, article_text
+from tools.tracing import tracer
+
+_DONE = object() # End-of-stream marker passed between stages
+_POLL_SECONDS = 0.1 # How often blocked stage workers check for cancellation
+
+# A stage function maps one input record to zero or more output records
+StageFn = Callable[[object], Iterable[object]]
+LinkFn = Callable[[Dict, Deque[Dict]], Dict]
+
+
+def default_queries(country: str = "in", language: str = "en") -> List[Tuple[str, str, str]]:
+    """One search per GS topic, using the topic name without its parenthetical details."""
+    return [(f"{topic.split('(')[0].strip()} India news", country, language) for topic in UPSC_GS_TOPICS]
+
+
+def link_by_topics(record: Dict, window: Deque[Dict], max_links: int = 3) -> Dict:
+    """
+    Cheap default linker: relates a record to recent records sharing UPSC topics,
+    most shared topics first.
+    """
+    topics = set(record.get("UPSC_Topics") or [])
+    scored = []
+    for other in window:
+        overlap = len(topics & set(other.get("UPSC_Topics") or []))
+        if overlap:
+            scored.append((overlap, other.get("Title", "N/A")))
+    scored.sort(key=lambda pair: pair[0], reverse=True)
+    return {**record, "Related": [title for _, title in scored[:max_links]]}
+
+
+def link_with_archive(index, k: int = LINK_TOP_K) -> LinkFn:
+    """
+    Builds a linker that adds the k nearest archived articles as 'See_Also' (on top of the
+    topic links within the run) and then archives the record for future runs.
+
+    Args:
+        index: knowledge.vector_index.VectorIndex holding past summaries
+    """
+    def link(record: Dict, window: Deque[Dict]) -> Dict:
+        linked = link_by_topics(record, window)
+        linked["See_Also"] = index.query(record, k=k)
+        index.add([linked])
+        return linked
+    return link
+
+
+class StreamingPipeline:
+    """
+    Streams articles through fetch → dedupe → extract → tag → summarize → link stages
+    (extract, which adds the article 'Body', runs when an `extractor` is given).
+
+    Stages run on their own threads and are connected by bounded queues, so an
+    article reaches the consumer as soon as it has passed every stage while later
+    searches are still in flight, and memory stays bounded by the queue sizes
+    rather than by the number of articles in the run.
+    """
+
+    def __init__(
+        self,
+        search_tool=None,
+        processor=None,
+        link_fn: LinkFn = link_by_topics,
+        workers: int = PIPELINE_MAX_WORKERS,
+        queue_size: int = PIPELINE_QUEUE_SIZE,
+        link_window: int = PIPELINE_LINK_WINDOW,
+        extractor=None,
+    ):
+        if search_tool is None:
+            from tools import serper_client # Anything with search_articles(query, country, language, ...) works
+            search_tool = serper_client
+        if processor is None:
+            from pipeline.fanout import ArticleProcessor
+            processor = ArticleProcessor()
+        if extractor is None and EXTRACT_ENABLED:
+            from tools.article_extractor import ArticleExtractor
+            extractor = ArticleExtractor()
+        self.search_tool = search_tool
+        self.processor = processor
+        self.extractor = extractor
+        self.link_fn = link_fn
+        self.workers = max(1, workers)
+        self.queue_size = max(1, queue_size)
+        self.link_window = link_window
+
+    # --- Stage functions ---
+    def _fetch(self, search) -> Iterable[Dict]:
+        if isinstance(search, dict): # A pre-fetched article (e.g. a feed item) needs no search
+            return [search]
+        return self.search_tool.search_articles(*search)
+
+    def _make_dedupe(self) -> StageFn:
+        index = NearDuplicateIndex() # Repeats and near-duplicates of an already emitted record are dropped
+        seen_ids = set()
+        def dedupe(record: Dict) -> Iterable[Dict]:
+            key = article_id(record)
+            if key in seen_ids:
+                return []
+            seen_ids.add(key)
+            signature = index.hasher.signature(article_text(record))
+            if index.query(signature) is not None:
+                return []
+            index.add(key, signature, record.get("URL", ""))
+            return [record]
+        return dedupe
+
+    def _extract(self, record: Dict) -> Iterable[Dict]:
+        return [self.extractor.extract_one(record)]
+
+    def _tag(self, record: Dict) -> Iterable[Dict]:
+        return self.processor.tag([record])
+
+    def _summarize(self, record: Dict) -> Iterable[Dict]:
+        summaries = self.processor.summarize([record])
+        return [{**record, "Summary": summaries[0].get("Summary", "") if summaries else ""}]
+
+    def _make_linker(self) -> StageFn:
+        window: Deque[Dict] = deque(maxlen=self.link_window)
+        def link(record: Dict) -> Iterable[Dict]:
+            linked = self.link_fn(record, window)
+            window.append(linked)
+            return [linked]
+        return link
+
+    # --- Plumbing ---
+    def _put(self, q: queue.Queue, item, stop: threading.Event, stage: Optional[str] = None) -> bool:
+        start = time.perf_counter()
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=_POLL_SECONDS)
+                if stage is not None:
+                    # Time spent blocked on a full downstream queue (backpressure)
+                    tracer.record("queue.put_wait", time.perf_counter() - start, stage=stage)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _start_stage(self, name: str, fn: StageFn, in_q: queue.Queue, out_q: queue.Queue, workers: int, stop: threading.Event) -> List[threading.Thread]:
+        remaining = [workers]
+        lock = threading.Lock()
+
+        def worker():
+            waiting_since = time.perf_counter()
+            while not stop.is_set():
+                try:
+                    item = in_q.get(timeout=_POLL_SECONDS)
+                except queue.Empty:
+                    continue
+                if item is _DONE:
+                    self._put(in_q, _DONE, stop) # Let sibling workers of this stage see the marker too
+                    break
+                # Time spent idle waiting for upstream work (starvation)
+                tracer.record("queue.get_wait", time.perf_counter() - waiting_since, stage=name)
+                try:
+                    with tracer.span("stream.stage", stage=name):
+                        results = list(fn(item))
+                except Exception as e:
+                    print(f"❌ Streaming stage '{name}' dropped a record: {e}")
+                    waiting_since = time.perf_counter()
+                    continue
+                for result in results:
+                    if not self._put(out_q, result, stop, stage=name):
+                        return
+                waiting_since = time.perf_counter()
+            with lock:
+                remaining[0] -= 1
+                last = remaining[0] == 0
+            if last:
+                self._put(out_q, _DONE, stop)
+
+        threads = [threading.Thread(target=worker, name=f"stream-{name}-{i}", daemon=True) for i in range(workers)]
+        for thread in threads:
+            thread.start()
+        return threads
+
+    def run(self, searches: Optional[Iterable[Tuple]] = None, articles: Iterable[Dict] = ()) -> Iterator[Dict]:
+        """
+        Yields fully processed article records (tagged, summarized and linked) as they complete.
+
+        Args:
+            searches: (query, country, language[, num_results, time_range]) tuples to fetch;
+                defaults to one query per GS topic
+            articles: Already fetched articles (e.g. feed items), streamed ahead of the searches
+        """
+        searches = default_queries() if searches is None else searches
+        stop = threading.Event()
+        stages = [
+            ("fetch", self._fetch, SERPER_MAX_WORKERS),
+            ("dedupe", self._make_dedupe(), 1),
+            *([("extract", self._extract, EXTRACT_MAX_WORKERS)] if self.extractor is not None else []),
+            ("tag", self._tag, self.workers),
+            ("summarize", self._summarize, self.workers),
+            ("link", self._make_linker(), 1), # Single worker: the link window is shared state
+        ]
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in range(len(stages) + 1)]
+        for (name, fn, workers), in_q, out_q in zip(stages, queues, queues[1:]):
+            self._start_stage(name, fn, in_q, out_q, workers, stop)
+
+        def feed():
+            for search in itertools.chain(articles, searches):
+                if not self._put(queues[0], search, stop):
+                    return
+            self._put(queues[0], _DONE, stop)
+        threading.Thread(target=feed, name="stream-feed", daemon=True).start()
+
+        try:
+            while True:
+                record = queues[-1].get()
+                if record is _DONE:
+                    break
+                yield record
+        finally:
+            stop.set() # Unblocks every stage if the consumer stops early
@@ -0,0 +1,138 @@
+# pipeline/tasks.py
+import os
+from crewai import Task
+from config.settings import UPSC_GS_TOPICS, OUTPUT_DIR, COMPACT_TOPIC_CODES
+from knowledge.topic_codes import encode_topics, legend_prompt
+from pipeline.tokens import estimate_tokens
+
+# --- Task wording shared by the crew tasks and the direct per-article prompts ---
+FETCH_DESCRIPTION = (
+    "Fetch the top 5-10 latest news articles relevant to UPSC Civil Services Examination "
+    "from specified Indian news sources. Focus on current events, policy updates, "
+    "economic developments, international relations, and environmental news. "
+    "Read the news feeds and run the planned syllabus search before any searches of your own. "
+    "Compile results with Title, Source, Date, Description, and URL."
+)
+FETCH_EXPECTED_OUTPUT = (
+    "A JSON list of the fetched news articles, each an object with 'Title', 'Source', 'Date', "
+    "'Description', and 'URL' (copy the tools' structured results verbatim)."
+)
+
+def build_tag_description(topics=UPSC_GS_TOPICS, compact: bool = COMPACT_TOPIC_CODES) -> str:
+    """
+    Tagging instructions offering `topics` (the full list, or a pre-classifier shortlist).
+    In compact mode topics are referred to by the codes from the tagger's legend and
+    the answers are decoded back with knowledge.topic_codes.decode_topics.
+    """
+    if compact:
+        return (
+            "Given the raw news articles, classify each article into one or more "
+            "relevant UPSC General Studies topics, using the topic codes from your legend. "
+            f"Allowed codes: {', '.join(encode_topics(topics))}. "
+            "Return a JSON string where each item includes 'Title', 'URL', 'UPSC_Topics' (a list of codes) "
+            "and 'Confidence' (0 to 1, how sure you are of the topics). "
+            "Example: [{\"Title\": \"...\", \"URL\": \"...\", \"UPSC_Topics\": [\"IE\"], \"Confidence\": 0.9}]"
+        )
+    return (
+        "Given the raw news articles, classify each article into one or more "
+        "relevant UPSC General Studies topics from the predefined list. "
+        f"UPSC Topics: {list(topics)}. "
+        "Return a JSON string where each item includes 'Title', 'Description', 'URL', 'UPSC_Topics' (a list of strings) "
+        "and 'Confidence' (0 to 1, how sure you are of the topics)."
+        "Example: [{\"Title\": \"...\", \"Description\": \"...\", \"URL\": \"...\", \"UPSC_Topics\": [\"Indian Economy\"], \"Confidence\": 0.9}]"
+    )
+
+TAG_DESCRIPTION = build_tag_description()
+TAG_EXPECTED_OUTPUT = (
+    "A JSON string representing a list of dictionaries, each with 'Title', 'URL', 'UPSC_Topics' (list of topic codes) and 'Confidence'."
+    if COMPACT_TOPIC_CODES else
+    "A JSON string representing a list of dictionaries, each with 'Title', 'Description', 'URL', 'UPSC_Topics' (list of strings) and 'Confidence'."
+)
+
+SUMMARIZE_DESCRIPTION = (
+    "For each news article provided, generate a concise, objective, "
+    "and UPSC-relevant summary. The summary should be short, sharp, "
+    "and capture the core information essential for a UPSC aspirant. "
+    "Include the original title, URL, and the generated summary for each article."
+    "Return a JSON string where each item includes 'Title', 'URL', 'Summary'."
+    "Example: [{\"Title\": \"...\", \"URL\": \"...\", \"Summary\": \"...\"}]"
+)
+SUMMARIZE_EXPECTED_OUTPUT = "A JSON string representing a list of dictionaries, each with 'Title', 'URL', and 'Summary'."
+
+LINK_DESCRIPTION = (
+    "Analyze the provided summaries and their UPSC topics to identify "
+    "interconnections, recurring themes, and patterns between different articles. "
+    "Explain the significance of these links for a UPSC aspirant, connecting "
+    "them to broader GS topics or recent trends. "
+    "Your output should highlight specific articles and their linked concepts."
+    "Format the output as a clear, readable text detailing the connections found."
+)
+LINK_EXPECTED_OUTPUT = "A detailed textual explanation of inter-article links and patterns relevant to UPSC, citing specific articles where applicable."
+
+
+# --- CrewAI task builders ---
+def build_fetch_task(agent) -> Task:
+    return Task(description=FETCH_DESCRIPTION, expected_output=FETCH_EXPECTED_OUTPUT, agent=agent)
+
+def build_tag_task(agent, context=None, content: str = None, description: str = TAG_DESCRIPTION) -> Task:
+    """
+    Tags the fetch task's output (`context`), or the articles passed inline as `content`.
+    `description` defaults to the full topic list; pass build_tag_description(shortlist) to narrow it.
+    """
+    return Task(
+        description=f"{description}\n\n{content}" if content else description,
+        expected_output=TAG_EXPECTED_OUTPUT,
+        agent=agent,
+        context=context # This task depends on the output of fetch_news_task
+    )
+
+def build_summarize_task(agent, context=None, content: str = None) -> Task:
+    """Summarizes the tag task's output (`context`), or the tagged articles passed inline as `content`."""
+    return Task(
+        description=f"{SUMMARIZE_DESCRIPTION}\n\n{content}" if content else SUMMARIZE_DESCRIPTION,
+        expected_output=SUMMARIZE_EXPECTED_OUTPUT,
+        agent=agent,
+        context=context, # Summarize the content that has been tagged
+        output_file=os.path.join(OUTPUT_DIR, "upsc_news_summaries.json") # Save summaries
+    )
+
+def build_link_task(agent, context=None, content: str = None) -> Task:
+    """Links the summarize task's output (`context`), or the summaries passed inline as `content`."""
+    return Task(
+        description=f"{LINK_DESCRIPTION}\n\n{content}" if content else LINK_DESCRIPTION,
+        expected_output=LINK_EXPECTED_OUTPUT,
+        agent=agent,
+        context=context, # Link based on summaries
+        output_file=os.path.join(OUTPUT_DIR, "upsc_news_links.txt") # Save links
+    )
+
+def task_output_text(task) -> str:
+    """Returns a finished task's raw text output across CrewAI versions."""
+    output = task.output
+    if output is None:
+        return ""
+    for attribute in ("raw_output", "raw"):
+        if hasattr(output, attribute):
+            return getattr(output, attribute)
+    return str(output)
+
+
+# --- Prompts for direct (crew-less) agent calls ---
+def build_prompt(description: str, expected_output: str, content: str) -> str:
+    """Combines task wording with the articles it applies to into a single user prompt."""
+    return f"{description}\n\n{content}\n\nExpected output: {expected_output}"
+
+
+def tag_prompt_savings_report(calls: int = 1) -> str:
+    """
+    Estimated fixed tokens of `calls` tagging calls with the verbose topic list versus
+    the compact codes. The compact legend is part of the tagger's system prompt, so it
+    is sent, and counted, with every call.
+    """
+    calls = max(1, calls)
+    verbose = estimate_tokens(build_tag_description(compact=False))
+    compact = estimate_tokens(build_tag_description(compact=True)) + estimate_tokens(legend_prompt())
+    return (
+        f"Tag prompt overhead for {calls} call(s): {verbose * calls} tokens verbose → {compact * calls} tokens compact "
+        f"incl. the legend each call ({1 - compact / verbose:.0%} smaller)."
+    )
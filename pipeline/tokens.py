@@ -0,0 +1,57 @@
+# pipeline/tokens.py
+import threading
+from typing import Dict, Optional
+
+_CHARS_PER_TOKEN = 3.5 # Close enough to Claude's tokenizer for English news text
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap local token estimate used when the API does not report usage."""
+    return max(1, int(len(text) / _CHARS_PER_TOKEN + 0.5)) if text else 0
+
+
+def response_usage(message) -> Optional[Dict[str, int]]:
+    """Extracts {'input_tokens', 'output_tokens'} from a LangChain AI message, if reported."""
+    usage = getattr(message, "usage_metadata", None)
+    if usage:
+        return {"input_tokens": usage.get("input_tokens", 0), "output_tokens": usage.get("output_tokens", 0)}
+    usage = (getattr(message, "response_metadata", None) or {}).get("usage")
+    if usage:
+        return {"input_tokens": usage.get("input_tokens", 0), "output_tokens": usage.get("output_tokens", 0)}
+    return None
+
+
+class TokenLedger:
+    """Thread-safe per-task accounting of input/output tokens and calls."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tasks: Dict[str, Dict[str, int]] = {}
+
+    def record(self, task: str, input_tokens: int, output_tokens: int, estimated: bool = False):
+        with self._lock:
+            totals = self._tasks.setdefault(task, {"calls": 0, "input_tokens": 0, "output_tokens": 0, "estimated_calls": 0})
+            totals["calls"] += 1
+            totals["input_tokens"] += input_tokens
+            totals["output_tokens"] += output_tokens
+            totals["estimated_calls"] += int(estimated)
+
+    def totals(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {task: dict(totals) for task, totals in self._tasks.items()}
+
+    def reset(self):
+        with self._lock:
+            self._tasks.clear()
+
+    def report(self) -> str:
+        """Human-readable per-task token table."""
+        lines = [f"{'Task':<12}{'Calls':>7}{'Input':>10}{'Output':>10}"]
+        for task, totals in sorted(self.totals().items()):
+            marker = " (est.)" if totals["estimated_calls"] else ""
+            lines.append(f"{task:<12}{totals['calls']:>7}{totals['input_tokens']:>10}{totals['output_tokens']:>10}{marker}")
+        return "\n".join(lines)
+
+
+# Process-wide ledger fed by agents.llm.complete()
+token_ledger = TokenLedger()
@@ -0,0 +1,8 @@
+# tests/conftest.py
+import os
+import sys
+
+# Tests import the project's packages the way main.py and the benchmarks do
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
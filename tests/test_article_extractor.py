@@ -0,0 +1,89 @@
+# tests/test_article_extractor.py
+import threading
+from collections import defaultdict
+from http.server import ThreadingHTTPServer
+
+from benchmarks.bench_extract import BOILERPLATE_MARKER, STORY_MARKER, PageHandler, synthetic_page
+from tools import article_extractor
+from tools.article_extractor import ArticleExtractor, BodyCache, extract_text
+
+# A site without <article>: the story is whatever substantial paragraphs the page has
+DIV_PAGE = """<html><head><style>p { color: red; }</style></head><body>
+<div class="menu"><p>Home</p><p>Opinion</p></div>
+<div class="story">
+  <p>The Supreme Court on Monday referred the question of electoral bond disclosures to a five-judge bench.</p>
+  <p>The bench will also examine whether the amendments to the Representation of the People Act are valid.</p>
+</div>
+<script>var p = "<p>Sponsored: this script text is not part of the article at all, however long it is.</p>";</script>
+<footer><p>Follow us on social media for the latest updates from the courts and Parliament.</p></footer>
+</body></html>"""
+
+
+def test_article_paragraphs_are_kept_and_boilerplate_dropped():
+    text = extract_text(synthetic_page(3))
+    paragraphs = text.split("\n\n")
+    assert len(paragraphs) == 8
+    assert all(p.startswith(f"{STORY_MARKER} 3 ") for p in paragraphs)
+    assert BOILERPLATE_MARKER not in text
+    assert "Staff Reporter" not in text and "Copyright" not in text
+
+
+def test_page_without_article_falls_back_to_its_substantial_paragraphs():
+    assert extract_text(DIV_PAGE).split("\n\n") == [
+        "The Supreme Court on Monday referred the question of electoral bond disclosures to a five-judge bench.",
+        "The bench will also examine whether the amendments to the Representation of the People Act are valid.",
+    ]
+
+
+def test_long_text_is_cut_at_a_paragraph_boundary():
+    text = extract_text(synthetic_page(1), max_chars=250)
+    assert len(text) <= 250
+    assert text == "\n\n".join(extract_text(synthetic_page(1)).split("\n\n")[:len(text.split("\n\n"))])
+
+
+def test_pages_are_fetched_once_then_revalidated(tmp_path, monkeypatch):
+    handler = type("FixturePageHandler", (PageHandler,), {"pages": {"/a": synthetic_page(0), "/b": DIV_PAGE}, "latency": 0.0})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    articles = [{"URL": f"{base}/a"}, {"URL": f"{base}/b"}, {"URL": f"{base}/missing"}, {"URL": "N/A"}]
+    cache = BodyCache(str(tmp_path / "bodies.sqlite3"))
+    extractor = ArticleExtractor(max_workers=4, processes=0, cache=cache)
+    try:
+        cold = extractor.extract_many(articles)
+        monkeypatch.setattr(article_extractor, "EXTRACT_FRESH_SECONDS", 0) # Every entry is stale: revalidate
+        warm = extractor.extract_many(articles)
+    finally:
+        extractor.close()
+        server.shutdown()
+
+    assert [a["Body"] for a in cold] == [extract_text(synthetic_page(0)), extract_text(DIV_PAGE), "", ""]
+    assert warm == cold
+    assert dict(extractor.stats) == {"fetched": 2, "failed": 2, "not_modified": 2}
+    assert len(cache) == 2
+
+
+def test_per_host_cap_holds_with_more_sites_than_pooled_hosts(tmp_path):
+    counters = {"active": defaultdict(int), "peak": defaultdict(int), "statuses": defaultdict(int)}
+    pages = {f"/{i}": synthetic_page(i) for i in range(4)}
+    slow = type("SlowPageHandler", (PageHandler,), {"pages": pages, "latency": 0.3, **counters})
+    fast = type("FastPageHandler", (PageHandler,), {"pages": pages, "latency": 0.01, **counters})
+    servers = [ThreadingHTTPServer(("127.0.0.1", 0), slow)] + [ThreadingHTTPServer(("127.0.0.1", 0), fast) for _ in range(4)]
+    for server in servers:
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+    # While one worker waits on the slow site, the other visits more sites than the session
+    # keeps pools for, evicting the slow site's pool before asking it for another page
+    urls = [f"http://127.0.0.1:{server.server_address[1]}" for server in servers]
+    articles = [{"URL": f"{url}/{i}"} for i in range(2) for url in urls]
+    extractor = ArticleExtractor(max_workers=2, per_host=1, processes=0, cache=BodyCache(str(tmp_path / "bodies.sqlite3")))
+    try:
+        extracted = extractor.extract_many(articles)
+    finally:
+        extractor.close()
+        for server in servers:
+            server.shutdown()
+
+    assert all(article["Body"] for article in extracted)
+    assert len(slow.peak) == 5 and max(slow.peak.values()) == 1
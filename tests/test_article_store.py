@@ -0,0 +1,31 @@
+# tests/test_article_store.py
+from pipeline.article_store import ArticleStore
+
+
+def test_empty_results_count_as_processed():
+    store = ArticleStore(path=None)
+    article = {"Title": "Local cricket score", "URL": "https://example.com/cricket", "Description": "Match report"}
+    pending, _ = store.diff([article])
+    assert pending == [article]
+
+    store.record_tags([{**article, "UPSC_Topics": [], "Tagged_By": "llm"}])
+    store.record_summaries([{"Title": article["Title"], "URL": article["URL"], "Summary": ""}])
+    store.record_links(pending, "No links.")
+
+    pending, unchanged = store.diff([article])
+    assert pending == []
+    assert unchanged[0]["UPSC_Topics"] == []
+
+
+def test_articles_missing_from_the_output_stay_pending():
+    store = ArticleStore(path=None)
+    first = {"Title": "Budget session begins", "URL": "https://example.com/budget", "Description": "Parliament"}
+    second = {"Title": "Monsoon update", "URL": "https://example.com/monsoon", "Description": "IMD forecast"}
+    pending, _ = store.diff([first, second])
+
+    store.record_tags([{**first, "UPSC_Topics": ["GS3: Economy"], "Tagged_By": "llm"}])
+    store.record_summaries([{"Title": first["Title"], "URL": first["URL"], "Summary": "Session opens."}])
+    store.record_links(pending, "No links.")
+
+    pending, _ = store.diff([first, second])
+    assert pending == [second]
@@ -0,0 +1,20 @@
+# tests/test_cache.py
+from tools.cache import DiskCache
+
+
+def test_contains_has_no_side_effects(tmp_path):
+    cache = DiskCache(str(tmp_path / "cache.sqlite3"), max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.contains("a") and not cache.contains("missing")
+    assert cache.stats()["hits"] == cache.stats()["misses"] == 0
+
+    cache.set("c", 3) # "a" is still the least recently used: contains() did not refresh it
+    assert not cache.contains("a") and cache.contains("b")
+
+
+def test_contains_honours_the_ttl_without_deleting(tmp_path):
+    cache = DiskCache(str(tmp_path / "cache.sqlite3"), ttl_seconds=-1) # Every entry is already expired
+    cache.set("a", 1)
+    assert not cache.contains("a")
+    assert len(cache) == 1
@@ -0,0 +1,26 @@
+# tests/test_checkpoint.py
+from pipeline.checkpoint import StageCheckpoints, time_window
+
+HOUR = 3600
+
+
+def test_fetch_checkpoint_is_reused_only_within_its_time_window(tmp_path):
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return f"fetch {len(calls)}"
+
+    def run(now):
+        checkpoints = StageCheckpoints(str(tmp_path), resume=True)
+        return checkpoints.run("fetch", ["Fetch the news", time_window(6 * HOUR, now)], fetch)
+
+    start = 1_700_000_000 // (6 * HOUR) * (6 * HOUR)
+    assert run(start + HOUR) == "fetch 1"
+    assert run(start + 5 * HOUR) == "fetch 1" # Resumed within the window
+    assert run(start + 7 * HOUR) == "fetch 2" # A later window fetches again
+    assert len(calls) == 2
+
+
+def test_time_window_starts_on_a_boundary():
+    assert time_window(6 * HOUR, 6 * HOUR * 10 + 5) == time_window(6 * HOUR, 6 * HOUR * 10) == "1970-01-03T12:00:00Z"
@@ -0,0 +1,38 @@
+# tests/test_dedup.py
+from pipeline.dedup import NearDuplicateIndex, dedupe_articles
+
+STORY = "Cabinet approves the National Critical Minerals Mission with an outlay for exploration, recycling and overseas acquisition of mineral assets"
+
+
+def article(url, source="Wire", title="Cabinet approves critical minerals mission", description=STORY):
+    return {"Title": title, "Description": description, "URL": url, "Source": source}
+
+
+def test_exact_repeat_of_any_cluster_member_is_dropped():
+    items = [article("https://a/1"), article("https://b/1", description=STORY + " today"), article("https://b/1", description=STORY + " today")]
+    (kept,) = dedupe_articles(items)
+    assert kept["URL"] == "https://a/1"
+    assert kept["Alternate_Sources"] == [{"Source": "Wire", "URL": "https://b/1"}]
+
+
+def test_every_member_is_recorded_and_later_syndicated_copies_are_dropped():
+    history = NearDuplicateIndex()
+    dedupe_articles([article("https://a/1"), article("https://b/1", description=STORY + " today")], history=history, drop_seen=True)
+    assert len(history) == 2
+
+    unrelated = article("https://c/1", title="RBI keeps repo rate unchanged", description="The monetary policy committee held the repo rate at 6.5 per cent citing food inflation")
+    later = dedupe_articles([unrelated, article("https://d/1", description=STORY + " on Wednesday")], history=history, drop_seen=True)
+    assert [item["URL"] for item in later] == ["https://c/1"]
+
+
+def test_repeat_of_the_same_url_is_left_to_the_article_store():
+    history = NearDuplicateIndex()
+    dedupe_articles([article("https://a/1")], history=history, drop_seen=True)
+    again = dedupe_articles([article("https://a/1", description=STORY + " (updated)")], history=history, drop_seen=True)
+    assert [item["URL"] for item in again] == ["https://a/1"]
+
+
+def test_seen_articles_are_kept_unless_drop_seen():
+    history = NearDuplicateIndex()
+    dedupe_articles([article("https://a/1")], history=history)
+    assert len(dedupe_articles([article("https://d/1")], history=history, drop_seen=False)) == 1
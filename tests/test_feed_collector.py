@@ -0,0 +1,92 @@
+# tests/test_feed_collector.py
+import time
+
+import pytest
+
+from benchmarks.feed_stub import FeedLibrary, feed_urls, start_feed_server
+from tools.feed_collector import FeedCollector, FeedState, new_items
+
+
+@pytest.fixture
+def library():
+    library = FeedLibrary(4, items_per_feed=5, latency=0.0)
+    server = start_feed_server(library)
+    library.urls = feed_urls([server], 4) # Even feeds RSS, odd feeds Atom
+    yield library
+    server.shutdown()
+
+
+def poll(library, state_path, commit=True):
+    library.statuses.clear()
+    collector = FeedCollector(library.urls, max_workers=4, processes=0, state=FeedState(state_path))
+    try:
+        items = collector.poll()
+        if commit:
+            collector.state.commit()
+        return items, dict(library.statuses)
+    finally:
+        collector.close()
+
+
+def stories(items):
+    return sorted(item["URL"].rsplit("/story/", 1)[-1] for item in items)
+
+
+def test_unchanged_feeds_answer_304_and_only_new_items_come_back(library, tmp_path):
+    state_path = str(tmp_path / "feeds.sqlite3")
+    cold, statuses = poll(library, state_path)
+    assert len(cold) == 20 and statuses == {200: 4}
+
+    # A new collector on the same state: validators survive the restart
+    unchanged, statuses = poll(library, state_path)
+    assert unchanged == [] and statuses == {304: 4}
+
+    library.publish(1, count=2)
+    fresh, statuses = poll(library, state_path)
+    assert stories(fresh) == ["1/5", "1/6"] and statuses == {200: 1, 304: 3}
+
+
+def test_uncommitted_polls_are_read_again(library, tmp_path):
+    state_path = str(tmp_path / "feeds.sqlite3")
+    poll(library, state_path)
+    library.publish(2)
+    failed_run, _ = poll(library, state_path, commit=False) # e.g. the run died before storing the items
+    assert stories(failed_run) == ["2/5"]
+
+    retried, statuses = poll(library, state_path)
+    assert stories(retried) == ["2/5"] and statuses == {200: 1, 304: 3}
+    assert poll(library, state_path)[0] == []
+
+
+def test_feed_refetched_without_validators_yields_only_items_past_the_high_water_mark(library, tmp_path):
+    state_path = str(tmp_path / "feeds.sqlite3")
+    poll(library, state_path)
+    state = FeedState(state_path)
+    url = library.urls[0][1]
+    saved = state.get(url)
+    state.set(url, None, None, saved["high_water"], saved["seen"]) # As if the server sent no ETag/Last-Modified
+
+    items, statuses = poll(library, state_path)
+    assert items == [] and statuses == {200: 1, 304: 3}
+    library.publish(0)
+    items, _ = poll(library, state_path)
+    assert stories(items) == ["0/5"]
+
+
+def test_new_items_honours_the_mark_and_remembered_ids():
+    now = time.time()
+    items = [
+        {"Guid": "late", "Published": now},
+        {"Guid": "tie-seen", "Published": now - 60},
+        {"Guid": "tie-new", "Published": now - 60},
+        {"Guid": "old", "Published": now - 120},
+        {"Guid": "undated", "Published": None},
+    ]
+    state = {"high_water": now - 60, "seen": ["tie-seen"]}
+    fresh, high_water, seen = new_items(items, state, now)
+    assert [item["Guid"] for item in fresh] == ["late", "tie-new", "undated"]
+    assert high_water == now
+    assert "late" in seen and "undated" in seen
+
+    stale = [{"Guid": "ancient", "Published": now - 30 * 86400}]
+    assert new_items(stale, None, now)[0] == [] # First poll skips items older than FEEDS_MAX_AGE_HOURS
@@ -0,0 +1,47 @@
+# tests/test_llm_cache.py
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.messages import HumanMessage, SystemMessage
+
+from agents.llm import AgentLLMCache
+from tools.cache import DiskCache, make_cache_key
+
+MESSAGES = [SystemMessage(content="You are a UPSC analyst."), HumanMessage(content="Tag: Monsoon session of Parliament")]
+
+
+def fake_llm(agent_name: str, store: DiskCache, responses=("GS2", "GS3", "GS1")) -> FakeListChatModel:
+    return FakeListChatModel(responses=list(responses), cache=AgentLLMCache(agent_name, store=store))
+
+
+def test_cache_key_is_stable_and_canonical():
+    assert make_cache_key("llm", {"model": "m", "temperature": 0}, "prompt") == make_cache_key("llm", {"temperature": 0, "model": "m"}, "prompt")
+    assert make_cache_key("llm", "m", "prompt") != make_cache_key("llm", "m", "prompt ")
+    assert len(make_cache_key("llm", "m", "prompt")) == 64
+
+
+def test_identical_call_from_another_agent_is_a_hit(tmp_path):
+    store = DiskCache(str(tmp_path / "llm.sqlite3"))
+    tagger, summarizer = fake_llm("tagger", store), fake_llm("summarizer", store)
+
+    assert tagger.invoke(MESSAGES).content == "GS2"
+    assert summarizer.invoke(MESSAGES).content == "GS2" # Answered from the tagger's entry
+    assert summarizer.i == 0 # The model itself was never called
+    assert tagger.cache.stats()["misses"] == 1
+    assert summarizer.cache.stats() == {"hits": 1, "misses": 0, "hit_rate": 1.0}
+
+
+def test_different_prompt_or_model_parameters_miss(tmp_path):
+    store = DiskCache(str(tmp_path / "llm.sqlite3"))
+    tagger = fake_llm("tagger", store)
+    tagger.invoke(MESSAGES)
+    tagger.invoke([MESSAGES[0], HumanMessage(content="Tag: Repo rate unchanged")])
+    fake_llm("tagger", store, responses=("other",)).invoke(MESSAGES) # Different llm_string
+    assert tagger.cache.stats()["hits"] == 0
+    assert tagger.i == 2 # Called for both prompts
+
+
+def test_entries_survive_a_restart(tmp_path):
+    path = str(tmp_path / "llm.sqlite3")
+    fake_llm("tagger", DiskCache(path)).invoke(MESSAGES)
+    restarted = fake_llm("tagger", DiskCache(path))
+    assert restarted.invoke(MESSAGES).content == "GS2"
+    assert restarted.i == 0
@@ -0,0 +1,58 @@
+# tests/test_rate_limit.py
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.serper_stub import start_stub_server
+from tools import serper_client
+from tools.cache import DiskCache
+from tools.rate_limit import AdaptiveLimiter, retry_after_seconds
+
+
+def test_a_429_halves_the_window_once_per_round_trip():
+    limiter = AdaptiveLimiter("test", rate=0, max_concurrency=8)
+    limiter.acquire()
+    limiter.acquire()
+    limiter.release(0.01, retry_after=0.0)
+    limiter.release(0.01, retry_after=0.0) # Sent before the first cut: no new information
+    assert limiter.limit == 4
+    assert limiter.throttled == 2
+
+
+def test_successes_widen_the_window_additively():
+    limiter = AdaptiveLimiter("test", rate=0, max_concurrency=8)
+    limiter.limit = 2.0
+    for _ in range(4):
+        limiter.acquire()
+        limiter.release(0.01)
+    assert 3.0 < limiter.limit < 4.0 # About one slot per window of successes, not one per success
+
+
+def test_retry_after_pauses_every_caller():
+    limiter = AdaptiveLimiter("test", rate=0, max_concurrency=8)
+    with limiter.request() as permit:
+        permit.throttle(retry_after_seconds("0.3"))
+    start = time.monotonic()
+    with limiter.request():
+        pass
+    assert time.monotonic() - start >= 0.25
+
+
+def test_search_backs_off_against_a_throttling_server(tmp_path, monkeypatch):
+    server = start_stub_server(latency=0.005, rate_limit=20)
+    limiter = AdaptiveLimiter("serper", rate=200, max_concurrency=8) # Far above what the server allows
+    monkeypatch.setenv("SERPER_API_KEY", "test")
+    monkeypatch.setattr(serper_client, "SERPER_API_URL", f"http://127.0.0.1:{server.server_address[1]}/news")
+    monkeypatch.setattr(serper_client, "SERPER_MAX_RETRIES", 10)
+    monkeypatch.setattr(serper_client, "serper_cache", DiskCache(str(tmp_path / "serper.sqlite3")))
+    monkeypatch.setattr(serper_client, "get_limiter", lambda provider: limiter)
+    try:
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(lambda n: serper_client.search_news(f"query {n}", num_results=2), range(60)))
+    finally:
+        server.shutdown()
+
+    assert all(len(result["news"]) == 2 for result in results)
+    bucket = server.RequestHandlerClass.bucket
+    assert limiter.throttled == bucket.rejected >= 1 # Every 429 reached the limiter
+    assert limiter.limit < 8 # ...and cut the window
+    assert bucket.rejected < 60 # Paused callers do not keep hammering the server
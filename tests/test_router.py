@@ -0,0 +1,43 @@
+# tests/test_router.py
+import json
+
+from agents.router import FAST, STRONG, ModelRouter, route_tier
+from tools.schemas import match_outputs
+
+
+class ScriptedRouter(ModelRouter):
+    """Answers each tier with a canned response instead of calling a model."""
+
+    def __init__(self, responses):
+        super().__init__()
+        self.responses = responses
+        self.prompts = []
+
+    def complete(self, agent_name, agent, prompt, task, tier=None, items=1):
+        tier = tier or route_tier(agent_name, task)
+        self.prompts.append((tier, prompt))
+        return json.dumps(self.responses[tier])
+
+
+def parse(items, response):
+    return match_outputs(items, json.loads(response))
+
+
+def test_item_the_fast_model_dropped_is_escalated_not_given_a_neighbours_tags():
+    assert route_tier("tagger", "tag") == FAST
+    items = [{"URL": "A"}, {"URL": "B"}]
+    router = ScriptedRouter({
+        FAST: [{"URL": "B", "UPSC_Topics": ["Geography"]}], # Dropped A
+        STRONG: [{"URL": "A", "UPSC_Topics": ["Indian Economy"]}],
+    })
+
+    outputs = router.run_items(
+        "tagger", None, "tag", items,
+        lambda batch: ",".join(item["URL"] for item in batch),
+        parse,
+        accept=lambda output: True, # Even a lenient check cannot accept a missing output
+    )
+
+    assert outputs == [{"URL": "A", "UPSC_Topics": ["Indian Economy"]}, {"URL": "B", "UPSC_Topics": ["Geography"]}]
+    assert router.prompts == [(FAST, "A,B"), (STRONG, "A")]
+    assert router.stats()["tag@fast"]["escalated_items"] == 1
@@ -0,0 +1,31 @@
+# tests/test_schemas.py
+from tools.schemas import match_outputs
+
+
+def test_match_outputs_dropped_item_is_not_given_another_articles_record():
+    inputs = [{"URL": "A"}, {"URL": "B"}]
+    outputs = [{"URL": "B", "UPSC_Topics": ["Geography"]}]
+
+    assert match_outputs(inputs, outputs) == [None, outputs[0]]
+
+
+def test_match_outputs_reordered_items_follow_their_urls():
+    inputs = [{"URL": "A"}, {"URL": "B"}, {"URL": "C"}]
+    outputs = [{"URL": "C", "Summary": "c"}, {"URL": "A", "Summary": "a"}, {"URL": "B", "Summary": "b"}]
+
+    assert [output["Summary"] for output in match_outputs(inputs, outputs)] == ["a", "b", "c"]
+
+
+def test_match_outputs_falls_back_to_position_only_for_unattributable_outputs():
+    inputs = [{"URL": "A"}, {"URL": "B"}]
+    # No URL echoed for the first item, a mangled URL for the second
+    outputs = [{"Summary": "first"}, {"URL": "B?utm=x", "Summary": "second"}]
+
+    assert [output["Summary"] for output in match_outputs(inputs, outputs)] == ["first", "second"]
+
+
+def test_match_outputs_extra_outputs_and_empty_response():
+    inputs = [{"URL": "A"}]
+
+    assert match_outputs(inputs, [{"URL": "A", "Summary": "a"}, {"URL": "Z", "Summary": "z"}])[0]["Summary"] == "a"
+    assert match_outputs(inputs, []) == [None]
@@ -0,0 +1,36 @@
+# tests/test_vector_index.py
+import pytest
+
+from knowledge.vector_index import HashedTfidfEmbedder, VectorIndex
+
+ARTICLES = [
+    {"URL": "a", "Title": "Monsoon rainfall deficit hits kharif sowing", "Summary": "Rainfall deficit delays sowing of paddy."},
+    {"URL": "b", "Title": "RBI keeps repo rate unchanged", "Summary": "Monetary policy committee holds the repo rate on inflation."},
+    {"URL": "c", "Title": "Kharif sowing picks up after monsoon revival", "Summary": "Paddy sowing recovers as rainfall improves."},
+    {"URL": "d", "Title": "Inflation eases, repo rate cut expected", "Summary": "Retail inflation falls below the RBI target."},
+]
+
+
+def scores(index, record):
+    return {item["URL"]: item["Score"] for item in index.query(record, k=10, min_score=-1.0)}
+
+
+def test_rows_added_in_earlier_runs_are_scored_with_the_current_idf(tmp_path):
+    incremental = VectorIndex(str(tmp_path / "incremental"), embedder=HashedTfidfEmbedder(dim=64))
+    incremental.add(ARTICLES[:1])
+    incremental.add(ARTICLES[1:])
+    at_once = VectorIndex(str(tmp_path / "at_once"), embedder=HashedTfidfEmbedder(dim=64))
+    at_once.add(ARTICLES)
+
+    query = {"Title": "Paddy sowing and the monsoon", "Summary": "Rainfall and kharif crops."}
+    expected = scores(at_once, query)
+    assert scores(incremental, query) == pytest.approx(expected, abs=1e-3)
+    assert max(expected, key=expected.get) in {"a", "c"}
+
+
+def test_reopened_index_scores_like_the_one_that_wrote_it(tmp_path):
+    directory = str(tmp_path / "index")
+    index = VectorIndex(directory, embedder=HashedTfidfEmbedder(dim=64))
+    index.add(ARTICLES)
+    reopened = VectorIndex(directory, embedder=HashedTfidfEmbedder(dim=64))
+    assert scores(reopened, ARTICLES[0]) == scores(index, ARTICLES[0])
@@ -0,0 +1,45 @@
+# tools/archive_tools.py
+from crewai.tools import BaseTool
+from typing import Type
+from pydantic import BaseModel, Field
+
+from config.settings import LINK_TOP_K
+
+class RelatedArticlesInput(BaseModel):
+    """Input schema for RelatedArticlesTool."""
+    title: str = Field(..., description="Title of the article to find related past coverage for")
+    summary: str = Field(default="", description="Summary or description of the article")
+
+class RelatedArticlesTool(BaseTool):
+    name: str = "UPSC_Related_Past_Articles"
+    description: str = (
+        "Find previously processed news articles that are most similar to a given article, "
+        "using the local archive of past summaries. Use it to build 'See Also' links across time."
+    )
+    args_schema: Type[BaseModel] = RelatedArticlesInput
+
+    def _run(self, title: str, summary: str = "") -> str:
+        """
+        Look up the nearest past articles in the local vector index.
+
+        Args:
+            title: Article title
+            summary: Article summary or description
+
+        Returns:
+            Formatted string listing related past articles
+        """
+        try:
+            from knowledge.vector_index import get_vector_index # Loaded on first use, then shared by every call
+            related = get_vector_index().query({"Title": title, "Summary": summary}, k=LINK_TOP_K)
+        except Exception as e:
+            return f"Error occurred while searching the article archive: {str(e)}"
+        if not related:
+            return "No related past articles found in the archive."
+        return "Related Past Articles:\n" + "".join(
+            f"- {item['Title']} ({item['Date'] or 'earlier'}, similarity {item['Score']}): {item['URL']}\n"
+            for item in related
+        )
+
+# Create an instance of the tool to be used by agents
+related_articles_tool = RelatedArticlesTool()
@@ -0,0 +1,400 @@
+# tools/article_extractor.py
+"""
+Fetches the pages behind search results and extracts their article text ('Body'),
+so the summarizer works from the article rather than Serper's one-line snippet.
+
+Pages are downloaded concurrently over one pooled keep-alive session, with a cap on
+connections per news site. Raw HTML and extracted text are kept zlib-compressed in
+an on-disk cache, and stale entries are revalidated with ETag/Last-Modified, so an
+unchanged page costs a 304. Parsing runs in a process pool (lxml or selectolax
+when installed, the standard library's html.parser otherwise).
+Kept free of agent-framework imports, like tools.serper_client.
+"""
+import multiprocessing
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config.settings import (
+    CACHE_DIR,
+    EXTRACT_MAX_WORKERS,
+    EXTRACT_PER_HOST,
+    EXTRACT_PROCESSES,
+    EXTRACT_TIMEOUT,
+    EXTRACT_MAX_BYTES,
+    EXTRACT_MAX_CHARS,
+    EXTRACT_FRESH_SECONDS,
+    EXTRACT_CACHE_MAX_ENTRIES,
+    EXTRACT_USER_AGENT,
+)
+from tools.tracing import tracer
+
+# Elements whose text is never article content
+_SKIP_TAGS = ("script", "style", "noscript", "nav", "header", "footer", "aside", "form", "figure", "iframe", "svg", "button")
+_MIN_PARAGRAPH_CHARS = 40 # Shorter paragraphs are bylines, captions and share prompts
+_MIN_ARTICLE_CHARS = 200 # An <article> with less text than this is ignored in favour of the whole page
+_SPACE_RE = re.compile(r"\s+")
+_CHARSET_RE = re.compile(rb"""<meta[^>]+charset=["']?([\w-]+)""", re.IGNORECASE)
+
+
+# --- Extraction (runs in worker processes) ---
+class _ParagraphParser(HTMLParser):
+    """Standard-library fallback: collects <p> texts outside boilerplate elements."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.paragraphs: List[Tuple[str, bool]] = [] # (text, inside <article>)
+        self._skip_depth = 0
+        self._article_depth = 0
+        self._current: Optional[List[str]] = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag == "article":
+            self._article_depth += 1
+        elif tag == "p" and not self._skip_depth:
+            self._flush()
+            self._current = []
+        elif tag == "br" and self._current is not None:
+            self._current.append(" ")
+
+    def handle_endtag(self, tag):
+        if tag in _SKIP_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag == "article":
+            self._flush()
+            self._article_depth = max(0, self._article_depth - 1)
+        elif tag == "p":
+            self._flush()
+
+    def handle_data(self, data):
+        if self._current is not None and not self._skip_depth:
+            self._current.append(data)
+
+    def _flush(self):
+        if self._current is not None:
+            self.paragraphs.append(("".join(self._current), self._article_depth > 0))
+            self._current = None
+
+    def close(self):
+        super().close()
+        self._flush()
+
+
+def _paragraphs_stdlib(html: str) -> List[Tuple[str, bool]]:
+    parser = _ParagraphParser()
+    parser.feed(html)
+    parser.close()
+    return parser.paragraphs
+
+
+def _paragraphs_lxml(html: str) -> List[Tuple[str, bool]]:
+    import lxml.html
+    document = lxml.html.fromstring(html)
+    for element in document.xpath("|".join(f"//{tag}" for tag in _SKIP_TAGS)):
+        element.drop_tree()
+    return [
+        (p.text_content(), any(ancestor.tag == "article" for ancestor in p.iterancestors()))
+        for p in document.iter("p")
+    ]
+
+
+def _paragraphs_selectolax(html: str) -> List[Tuple[str, bool]]:
+    from selectolax.parser import HTMLParser as FastHTMLParser
+    tree = FastHTMLParser(html)
+    tree.strip_tags(list(_SKIP_TAGS))
+    paragraphs = []
+    for node in tree.css("p"):
+        parent, in_article = node.parent, False
+        while parent is not None and not in_article:
+            in_article = parent.tag == "article"
+            parent = parent.parent
+        paragraphs.append((node.text(separator=" "), in_article))
+    return paragraphs
+
+
+def _select_backend():
+    for module, backend in (("selectolax.parser", _paragraphs_selectolax), ("lxml.html", _paragraphs_lxml)):
+        try:
+            __import__(module)
+            return backend
+        except ImportError:
+            continue
+    return _paragraphs_stdlib
+
+
+_paragraphs = _select_backend()
+
+
+def extract_text(html: str, max_chars: int = EXTRACT_MAX_CHARS) -> str:
+    """
+    Extracts the readable article text from a page: the paragraphs inside <article>
+    when it holds the story, otherwise every substantial paragraph on the page.
+
+    Args:
+        html: The page's HTML
+        max_chars: Upper bound on the returned text (cut at a paragraph boundary when possible)
+
+    Returns:
+        Paragraphs separated by blank lines, or "" when the page has no article text
+    """
+    try:
+        paragraphs = _paragraphs(html)
+    except Exception:
+        paragraphs = _paragraphs_stdlib(html) # Malformed markup some fast parsers reject
+    cleaned, seen = [], set()
+    for text, in_article in paragraphs:
+        text = _SPACE_RE.sub(" ", text).strip()
+        if len(text) >= _MIN_PARAGRAPH_CHARS and text not in seen:
+            seen.add(text)
+            cleaned.append((text, in_article))
+    in_article = [text for text, inside in cleaned if inside]
+    chosen = in_article if sum(map(len, in_article)) >= _MIN_ARTICLE_CHARS else [text for text, _ in cleaned]
+
+    body, length = [], 0
+    for text in chosen:
+        if length + len(text) > max_chars:
+            if not body:
+                body.append(text[:max_chars].rsplit(" ", 1)[0])
+            break
+        body.append(text)
+        length += len(text) + 2
+    return "\n\n".join(body)
+
+
+# --- Body cache ---
+class BodyCache:
+    """
+    Compressed page store keyed by URL, with the validators (ETag, Last-Modified)
+    needed to revalidate an entry. Least recently fetched entries are evicted
+    beyond `max_entries`. Thread-safe.
+    """
+
+    def __init__(self, path: str, max_entries: int = EXTRACT_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS bodies ("
+            " url TEXT PRIMARY KEY,"
+            " etag TEXT,"
+            " last_modified TEXT,"
+            " html BLOB NOT NULL,"
+            " text BLOB NOT NULL,"
+            " fetched_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_bodies_fetched ON bodies (fetched_at)")
+
+    def get(self, url: str) -> Optional[Dict]:
+        """Returns {'etag', 'last_modified', 'text', 'fetched_at'} for `url`, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, text, fetched_at FROM bodies WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {"etag": row[0], "last_modified": row[1], "text": zlib.decompress(row[2]).decode("utf-8"), "fetched_at": row[3]}
+
+    def html(self, url: str) -> Optional[str]:
+        """The cached raw page, e.g. to re-extract it with a better parser."""
+        with self._lock:
+            row = self._conn.execute("SELECT html FROM bodies WHERE url = ?", (url,)).fetchone()
+        return zlib.decompress(row[0]).decode("utf-8") if row else None
+
+    def set(self, url: str, html: str, text: str, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        html_blob = zlib.compress(html.encode("utf-8"), 6)
+        text_blob = zlib.compress(text.encode("utf-8"), 6)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO bodies (url, etag, last_modified, html, text, fetched_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (url, etag, last_modified, html_blob, text_blob, time.time()),
+            )
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM bodies").fetchone()
+            if count > self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM bodies WHERE url IN (SELECT url FROM bodies ORDER BY fetched_at LIMIT ?)",
+                    (count - self.max_entries,),
+                )
+
+    def touch(self, url: str):
+        """Marks an entry as freshly validated (after a 304)."""
+        with self._lock:
+            self._conn.execute("UPDATE bodies SET fetched_at = ? WHERE url = ?", (time.time(), url))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM bodies").fetchone()[0]
+
+
+# --- Fetching ---
+class ArticleExtractor:
+    """
+    Adds a 'Body' to articles by downloading and extracting their pages.
+
+    Args:
+        max_workers: Concurrent downloads
+        per_host: Concurrent connections to any one site
+        processes: Parser processes (0 parses in the downloading thread)
+        cache: Body cache (default: CACHE_DIR/article_bodies.sqlite3)
+    """
+
+    def __init__(
+        self,
+        max_workers: int = EXTRACT_MAX_WORKERS,
+        per_host: int = EXTRACT_PER_HOST,
+        processes: int = EXTRACT_PROCESSES,
+        cache: Optional[BodyCache] = None,
+    ):
+        self.max_workers = max(1, max_workers)
+        self.per_host = max(1, per_host)
+        self.processes = processes
+        self.cache = cache if cache is not None else BodyCache(os.path.join(CACHE_DIR, "article_bodies.sqlite3")) # An empty BodyCache is falsy
+        self.session = requests.Session()
+        # Keep-alive connections are reused per host, but the per-site cap is enforced by
+        # _host_slots: urllib3 evicts host pools beyond pool_connections, and a fresh pool
+        # would let another per_host connections through to a site that still has some open
+        adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.per_host)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"User-Agent": EXTRACT_USER_AGENT, "Accept": "text/html,application/xhtml+xml"})
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        self._hosts: Dict[str, threading.BoundedSemaphore] = {}
+        self._hosts_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.stats = defaultdict(int) # fetched, not_modified, cached, failed
+
+    def _host_slots(self, url: str) -> threading.BoundedSemaphore:
+        """The semaphore bounding concurrent requests to `url`'s site at per_host."""
+        host = urlsplit(url).netloc.lower()
+        with self._hosts_lock:
+            if host not in self._hosts:
+                self._hosts[host] = threading.BoundedSemaphore(self.per_host)
+            return self._hosts[host]
+
+    def _count(self, outcome: str):
+        with self._stats_lock:
+            self.stats[outcome] += 1
+
+    def _parse(self, html: str) -> str:
+        if self.processes <= 0:
+            return extract_text(html)
+        with self._pool_lock:
+            if self._pool is None:
+                # Spawned, not forked: the parent is multi-threaded
+                self._pool = ProcessPoolExecutor(max_workers=self.processes, mp_context=multiprocessing.get_context("spawn"))
+        return self._pool.submit(extract_text, html).result()
+
+    def _decode(self, response: requests.Response, raw: bytes) -> str:
+        charset = response.encoding if "charset" in response.headers.get("Content-Type", "").lower() else None
+        if charset is None:
+            declared = _CHARSET_RE.search(raw[:4096])
+            charset = declared.group(1).decode("ascii") if declared else "utf-8"
+        try:
+            return raw.decode(charset, errors="replace")
+        except LookupError:
+            return raw.decode("utf-8", errors="replace")
+
+    def body(self, url: str) -> str:
+        """
+        Returns the article text of the page at `url` ("" when it cannot be fetched or has none).
+        Fresh cache entries are used as is; older ones are revalidated with a conditional GET.
+        """
+        if not urlsplit(url).scheme.startswith("http"):
+            return ""
+        cached = self.cache.get(url)
+        if cached is not None and time.time() - cached["fetched_at"] < EXTRACT_FRESH_SECONDS:
+            self._count("cached")
+            return cached["text"]
+
+        headers = {}
+        if cached is not None:
+            if cached["etag"]:
+                headers["If-None-Match"] = cached["etag"]
+            if cached["last_modified"]:
+                headers["If-Modified-Since"] = cached["last_modified"]
+        with self._host_slots(url), tracer.span("extract.fetch", revalidate=cached is not None) as span:
+            try:
+                with self.session.get(url, headers=headers, timeout=EXTRACT_TIMEOUT, stream=True) as response:
+                    span.set(status=str(response.status_code))
+                    if response.status_code == 304 and cached is not None:
+                        self.cache.touch(url)
+                        self._count("not_modified")
+                        return cached["text"]
+                    content_type = response.headers.get("Content-Type", "text/html")
+                    if response.status_code != 200 or "html" not in content_type:
+                        self._count("failed")
+                        return cached["text"] if cached is not None else ""
+                    chunks, size = [], 0
+                    for chunk in response.iter_content(64 * 1024):
+                        chunks.append(chunk)
+                        size += len(chunk)
+                        if size >= EXTRACT_MAX_BYTES:
+                            break
+                    raw = b"".join(chunks)
+                    html = self._decode(response, raw)
+                    etag, last_modified = response.headers.get("ETag"), response.headers.get("Last-Modified")
+            except requests.RequestException:
+                self._count("failed")
+                return cached["text"] if cached is not None else ""
+
+        with tracer.span("extract.parse", bytes=len(raw)):
+            text = self._parse(html)
+        self.cache.set(url, html, text, etag, last_modified)
+        self._count("fetched")
+        return text
+
+    def extract_one(self, article: Dict) -> Dict:
+        """Returns the article with a 'Body' added; an existing non-empty Body is kept."""
+        if article.get("Body"):
+            return article
+        try:
+            body = self.body(article.get("URL") or "")
+        except Exception as e:
+            print(f"❌ Could not extract {article.get('URL')}: {e}")
+            body = ""
+        return {**article, "Body": body}
+
+    def extract_many(self, articles: List[Dict]) -> List[Dict]:
+        """Adds a 'Body' to every article, downloading pages concurrently; results keep input order."""
+        if not articles:
+            return []
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(articles))) as executor:
+            return list(executor.map(self.extract_one, articles))
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        self.session.close()
+
+
+def extract_bodies(articles: List[Dict], **kwargs) -> List[Dict]:
+    """Convenience wrapper: adds a 'Body' to each article with a throwaway ArticleExtractor."""
+    extractor = ArticleExtractor(**kwargs)
+    try:
+        extracted = extractor.extract_many(articles)
+    finally:
+        extractor.close()
+    stats = extractor.stats
+    print(
+        f"📰 Article bodies: {stats['fetched']} fetched, {stats['not_modified']} unchanged (304), "
+        f"{stats['cached']} cached, {stats['failed']} failed."
+    )
+    return extracted
@@ -0,0 +1,115 @@
+# tools/cache.py
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Optional
+
+
+def make_cache_key(*parts: Any) -> str:
+    """
+    Build a content-addressed cache key from JSON-serializable parts.
+
+    Args:
+        parts: Values that together identify a cached response
+
+    Returns:
+        Hex SHA-256 digest of the canonical JSON encoding of the parts
+    """
+    canonical = json.dumps(parts, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class DiskCache:
+    """
+    Persistent key/value cache backed by a single SQLite file.
+
+    Entries expire after `ttl_seconds` and the store is bounded to `max_entries`,
+    evicting the least recently used entries first. Values are stored as JSON.
+    Safe to share between threads; entries survive process restarts.
+    """
+
+    def __init__(self, path: str, ttl_seconds: Optional[float] = None, max_entries: int = 10000):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries (accessed_at)")
+
+    def get(self, key: str) -> Optional[Any]:
+        """Returns the cached value for `key`, or None on a miss or expired entry."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT value, created_at FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None or (self.ttl_seconds is not None and now - row[1] > self.ttl_seconds):
+                if row is not None:
+                    self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+            self.hits += 1
+        return json.loads(row[0])
+
+    def contains(self, key: str) -> bool:
+        """
+        Whether get(key) would hit, without counting a lookup, refreshing the entry's
+        recency or deleting it when expired.
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT created_at FROM entries WHERE key = ?", (key,)).fetchone()
+        return row is not None and (self.ttl_seconds is None or time.time() - row[0] <= self.ttl_seconds)
+
+    def set(self, key: str, value: Any):
+        """Stores `value` under `key` and evicts least recently used entries beyond max_entries."""
+        now = time.time()
+        encoded = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, encoded, now, now),
+            )
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()
+            if count > self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM entries WHERE key IN "
+                    "(SELECT key FROM entries ORDER BY accessed_at ASC LIMIT ?)",
+                    (count - self.max_entries,),
+                )
+
+    def clear(self):
+        """Removes every entry and resets the hit/miss counters."""
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """Returns hit/miss counters, hit rate and the current number of entries."""
+        with self._lock:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": count,
+        }
+
+    def __len__(self) -> int:
+        return self.stats()["entries"]
@@ -0,0 +1,369 @@
+# tools/feed_collector.py
+"""
+Polls the RSS/Atom feeds of NEWS_SOURCES (NEWS_FEEDS) as a second way to collect
+articles next to Serper search, at no API cost.
+
+Every feed is requested concurrently over one pooled keep-alive session with its
+stored ETag/Last-Modified, so an unchanged feed costs a single 304, and a whole poll
+takes about as long as the slowest feed. Changed feeds are parsed in a process pool.
+Per feed, only items newer than its stored high-water mark (the latest publication
+time seen so far) are returned, so repeated polls yield each item once. New marks are
+staged in memory and only written by commit_feed_state(), once the caller has stored
+the items, so a run that fails before then reads the same items again.
+Kept free of agent-framework imports, like tools.serper_client.
+"""
+import html
+import json
+import multiprocessing
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from defusedxml.ElementTree import fromstring as parse_xml
+except ImportError:
+    from xml.etree.ElementTree import fromstring as parse_xml
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config.settings import (
+    NEWS_FEEDS,
+    NEWS_FEEDS_FILE,
+    FEEDS_MAX_WORKERS,
+    FEEDS_PER_HOST,
+    FEEDS_PROCESSES,
+    FEEDS_TIMEOUT,
+    FEEDS_MAX_BYTES,
+    FEEDS_MAX_AGE_HOURS,
+    FEEDS_STATE_PATH,
+    EXTRACT_USER_AGENT,
+)
+from tools.schemas import NewsArticle
+from tools.tracing import tracer
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_SPACE_RE = re.compile(r"\s+")
+_MAX_DESCRIPTION_CHARS = 500
+_MAX_SEEN = 500 # Item IDs remembered per feed (those at the high-water mark and undated ones)
+
+
+def configured_feeds() -> List[Tuple[str, str]]:
+    """(source, feed URL) pairs from NEWS_FEEDS_FILE when set, else from NEWS_FEEDS."""
+    feeds = NEWS_FEEDS
+    if NEWS_FEEDS_FILE:
+        with open(NEWS_FEEDS_FILE, encoding="utf-8") as f:
+            feeds = json.load(f)
+    return [(source, url) for source, urls in feeds.items() for url in urls]
+
+
+# --- Parsing (runs in worker processes) ---
+def _local(tag: str) -> str:
+    """Tag name without its XML namespace ('{http://www.w3.org/2005/Atom}entry' -> 'entry')."""
+    return tag.rsplit("}", 1)[-1]
+
+
+def _clean(text: Optional[str]) -> str:
+    text = _SPACE_RE.sub(" ", html.unescape(_TAG_RE.sub(" ", text or ""))).strip()
+    return text[:_MAX_DESCRIPTION_CHARS].rsplit(" ", 1)[0] if len(text) > _MAX_DESCRIPTION_CHARS else text
+
+
+def _timestamp(value: Optional[str]) -> Optional[float]:
+    """Epoch seconds from an RFC 822 (RSS) or ISO 8601 (Atom, Dublin Core) date; None if unparseable."""
+    value = (value or "").strip()
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError):
+        pass
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+def parse_feed(xml: bytes, source: str) -> List[Dict]:
+    """
+    Parses an RSS 2.0, RSS 1.0 (RDF) or Atom document.
+
+    Returns:
+        Article records ('Title', 'Source', 'Date', 'Description', 'URL'), each with the
+        item's 'Guid' and 'Published' (epoch seconds or None) added, in feed order
+    """
+    items = []
+    for element in parse_xml(xml).iter():
+        if _local(element.tag) not in ("item", "entry"):
+            continue
+        fields: Dict[str, str] = {}
+        link = ""
+        for child in element:
+            name = _local(child.tag)
+            if name == "link":
+                # Atom links carry the URL in href; prefer rel="alternate" (or no rel)
+                href = child.get("href")
+                if href is None:
+                    link = link or (child.text or "").strip()
+                elif child.get("rel", "alternate") == "alternate" or not link:
+                    link = href.strip()
+            elif name not in fields and child.text:
+                fields[name] = child.text
+        published = _timestamp(fields.get("pubDate") or fields.get("published") or fields.get("updated") or fields.get("date"))
+        article = NewsArticle(
+            title=_clean(fields.get("title")) or "No title available",
+            source=source,
+            date=datetime.fromtimestamp(published).strftime("%Y-%m-%dT%H:%M:%S") if published else "Date not available",
+            description=_clean(fields.get("description") or fields.get("summary") or fields.get("encoded") or fields.get("content")) or "No description available",
+            url=link or "No URL available",
+        ).to_record()
+        article["Guid"] = (fields.get("guid") or fields.get("id") or link).strip()
+        article["Published"] = published
+        items.append(article)
+    return items
+
+
+# --- Feed state ---
+class FeedState:
+    """
+    Per-feed validators (ETag, Last-Modified) and high-water marks, stored in SQLite.
+    Polls stage their new state in memory until commit(). Thread-safe.
+    """
+
+    def __init__(self, path: str = FEEDS_STATE_PATH):
+        self._lock = threading.Lock()
+        self._staged: Dict[str, Dict] = {}
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS feeds ("
+            " url TEXT PRIMARY KEY,"
+            " etag TEXT,"
+            " last_modified TEXT,"
+            " high_water REAL NOT NULL DEFAULT 0,"
+            " seen TEXT NOT NULL DEFAULT '[]',"
+            " polled_at REAL)"
+        )
+
+    def get(self, url: str) -> Optional[Dict]:
+        """Returns {'etag', 'last_modified', 'high_water', 'seen', 'polled_at'} for a feed (staged state first), or None."""
+        with self._lock:
+            if url in self._staged:
+                return dict(self._staged[url])
+            row = self._conn.execute(
+                "SELECT etag, last_modified, high_water, seen, polled_at FROM feeds WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {"etag": row[0], "last_modified": row[1], "high_water": row[2], "seen": json.loads(row[3]), "polled_at": row[4]}
+
+    def set(self, url: str, etag: Optional[str], last_modified: Optional[str], high_water: float, seen: List[str]):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO feeds (url, etag, last_modified, high_water, seen, polled_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (url, etag, last_modified, high_water, json.dumps(seen[-_MAX_SEEN:]), time.time()),
+            )
+
+    def stage(self, url: str, etag: Optional[str], last_modified: Optional[str], high_water: float, seen: List[str]):
+        """Like set(), but kept in memory (and seen by get()) until commit()."""
+        with self._lock:
+            self._staged[url] = {"etag": etag, "last_modified": last_modified, "high_water": high_water, "seen": seen[-_MAX_SEEN:], "polled_at": time.time()}
+
+    def commit(self) -> int:
+        """Writes the staged state of every feed. Returns the number of feeds written."""
+        with self._lock:
+            staged, self._staged = self._staged, {}
+        for url, state in staged.items():
+            self.set(url, state["etag"], state["last_modified"], state["high_water"], state["seen"])
+        return len(staged)
+
+    def touch(self, url: str):
+        """Records a poll that found the feed unchanged (304)."""
+        with self._lock:
+            self._conn.execute("UPDATE feeds SET polled_at = ? WHERE url = ?", (time.time(), url))
+
+
+_state: Optional[FeedState] = None
+_state_lock = threading.Lock()
+
+
+def get_feed_state() -> FeedState:
+    """Returns the process-wide feed state at FEEDS_STATE_PATH."""
+    global _state
+    with _state_lock:
+        if _state is None:
+            _state = FeedState()
+        return _state
+
+
+def commit_feed_state() -> int:
+    """
+    Writes the marks staged by this process's polls. Call it once the polled items are
+    stored (e.g. after ArticleStore.diff). Returns the number of feeds written.
+    """
+    with _state_lock:
+        state = _state
+    return state.commit() if state is not None else 0
+
+
+def new_items(items: List[Dict], state: Optional[Dict], now: float) -> Tuple[List[Dict], float, List[str]]:
+    """
+    Picks the items past a feed's high-water mark.
+
+    An item is new when it was published after the mark, or at the mark (or undated)
+    and not among the remembered item IDs. On a feed's first poll, items older than
+    FEEDS_MAX_AGE_HOURS are skipped.
+
+    Returns:
+        (new items, new high-water mark, item IDs to remember)
+    """
+    high_water = state["high_water"] if state else now - FEEDS_MAX_AGE_HOURS * 3600
+    seen = state["seen"] if state else []
+    seen_set = set(seen)
+    fresh = [
+        item for item in items
+        if item["Guid"] not in seen_set and (item["Published"] is None or item["Published"] >= high_water)
+    ]
+    dated = [item["Published"] for item in items if item["Published"] is not None]
+    new_high_water = max([high_water, *dated])
+    remembered = seen + [item["Guid"] for item in items if item["Published"] is None or item["Published"] == new_high_water]
+    return fresh, new_high_water, list(dict.fromkeys(remembered))
+
+
+# --- Polling ---
+class FeedCollector:
+    """
+    Polls feeds concurrently and returns their new items as article records.
+
+    Args:
+        feeds: (source, feed URL) pairs (default: configured_feeds())
+        max_workers: Feeds requested concurrently
+        processes: Parser processes (0 parses in the polling thread)
+        state: Feed state (default: the process-wide get_feed_state())
+    """
+
+    def __init__(
+        self,
+        feeds: Optional[List[Tuple[str, str]]] = None,
+        max_workers: int = FEEDS_MAX_WORKERS,
+        processes: int = FEEDS_PROCESSES,
+        state: Optional[FeedState] = None,
+    ):
+        self.feeds = feeds if feeds is not None else configured_feeds()
+        self.max_workers = max(1, max_workers)
+        self.processes = processes
+        self.state = state or get_feed_state()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=max(1, FEEDS_PER_HOST), pool_block=True)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "User-Agent": EXTRACT_USER_AGENT,
+            "Accept": "application/rss+xml, application/atom+xml, application/xml;q=0.9, text/xml;q=0.8",
+        })
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.stats = defaultdict(int) # fetched, not_modified, failed, items, new
+
+    def _count(self, outcome: str, n: int = 1):
+        with self._stats_lock:
+            self.stats[outcome] += n
+
+    def _parse(self, xml: bytes, source: str) -> List[Dict]:
+        if self.processes <= 0:
+            return parse_feed(xml, source)
+        with self._pool_lock:
+            if self._pool is None:
+                # Spawned, not forked: the parent is multi-threaded
+                self._pool = ProcessPoolExecutor(max_workers=self.processes, mp_context=multiprocessing.get_context("spawn"))
+        return self._pool.submit(parse_feed, xml, source).result()
+
+    def poll_one(self, source: str, url: str) -> List[Dict]:
+        """New items of one feed ([] when it is unchanged or cannot be fetched)."""
+        state = self.state.get(url)
+        headers = {}
+        if state is not None:
+            if state["etag"]:
+                headers["If-None-Match"] = state["etag"]
+            if state["last_modified"]:
+                headers["If-Modified-Since"] = state["last_modified"]
+        with tracer.span("feeds.fetch", source=source, revalidate=state is not None) as span:
+            try:
+                with self.session.get(url, headers=headers, timeout=FEEDS_TIMEOUT, stream=True) as response:
+                    span.set(status=str(response.status_code))
+                    if response.status_code == 304 and state is not None:
+                        self.state.touch(url)
+                        self._count("not_modified")
+                        return []
+                    if response.status_code != 200:
+                        self._count("failed")
+                        return []
+                    chunks, size = [], 0
+                    for chunk in response.iter_content(64 * 1024):
+                        chunks.append(chunk)
+                        size += len(chunk)
+                        if size >= FEEDS_MAX_BYTES:
+                            break
+                    etag, last_modified = response.headers.get("ETag"), response.headers.get("Last-Modified")
+            except requests.RequestException as e:
+                print(f"❌ Feed request failed for {url}: {e}")
+                self._count("failed")
+                return []
+
+        xml = b"".join(chunks)
+        with tracer.span("feeds.parse", source=source, bytes=len(xml)):
+            try:
+                items = self._parse(xml, source)
+            except Exception as e:
+                print(f"❌ Could not parse feed {url}: {e}")
+                self._count("failed")
+                return []
+        fresh, high_water, seen = new_items(items, state, time.time())
+        self.state.stage(url, etag, last_modified, high_water, seen)
+        self._count("fetched")
+        self._count("items", len(items))
+        self._count("new", len(fresh))
+        return [{key: value for key, value in item.items() if key not in ("Guid", "Published")} for item in fresh]
+
+    def poll(self, sources: Optional[List[str]] = None) -> List[Dict]:
+        """
+        Polls every feed (or those of `sources`) concurrently.
+
+        Returns:
+            New items of all feeds, in feed order
+        """
+        feeds = [(source, url) for source, url in self.feeds if not sources or source in sources]
+        if not feeds:
+            return []
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(feeds))) as executor:
+            return [item for items in executor.map(lambda feed: self.poll_one(*feed), feeds) for item in items]
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        self.session.close()
+
+
+def collect_feeds(sources: Optional[List[str]] = None, **kwargs) -> List[Dict]:
+    """Convenience wrapper: polls the configured feeds once with a throwaway FeedCollector."""
+    collector = FeedCollector(**kwargs)
+    try:
+        items = collector.poll(sources)
+    finally:
+        collector.close()
+    stats = collector.stats
+    print(
+        f"📡 Feeds: {stats['fetched']} changed, {stats['not_modified']} unchanged (304), {stats['failed']} failed; "
+        f"{stats['new']} new of {stats['items']} items."
+    )
+    return items
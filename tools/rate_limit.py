@@ -0,0 +1,306 @@
+# tools/rate_limit.py
+"""
+Process-wide adaptive rate limiting for the external APIs (Serper and Anthropic).
+
+Every caller of a provider draws from one AdaptiveLimiter: a token bucket holding
+requests to the provider's rate limit, plus a concurrency window that adapts AIMD-style.
+The window grows by about one slot per window of successful calls and is cut on a 429
+(or when latency exceeds the target). A Retry-After header pauses every caller of
+the provider, not only the one that was throttled.
+"""
+import email.utils
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional, Tuple, Type, TypeVar
+
+from config.settings import (
+    RATE_LIMIT_ENABLED,
+    SERPER_RATE_LIMIT_RPS,
+    SERPER_MAX_WORKERS,
+    SERPER_LATENCY_TARGET_SECONDS,
+    ANTHROPIC_RATE_LIMIT_RPM,
+    ANTHROPIC_MAX_CONCURRENCY,
+    LLM_LATENCY_TARGET_SECONDS,
+)
+from tools.tracing import tracer
+
+# Status codes meaning "slow down": rate limited, and Anthropic's "overloaded"
+THROTTLE_STATUS_CODES = {429, 529}
+_DEFAULT_PAUSE_SECONDS = 1.0 # Pause after a throttle that came without Retry-After
+
+T = TypeVar("T")
+
+
+def retry_after_seconds(value) -> Optional[float]:
+    """Parses a Retry-After header value (delay in seconds or an HTTP date)."""
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time()) if when is not None else None
+
+
+def throttle_delay(exc: BaseException) -> Optional[float]:
+    """
+    Recognizes provider rate-limit errors such as anthropic.RateLimitError.
+
+    Returns:
+        Seconds to pause (Retry-After, or a default when the header is missing),
+        or None when `exc` is not a throttling error
+    """
+    response = getattr(exc, "response", None)
+    status = getattr(exc, "status_code", None) or getattr(response, "status_code", None)
+    if status not in THROTTLE_STATUS_CODES:
+        return None
+    headers = getattr(response, "headers", None) or {}
+    delay = retry_after_seconds(headers.get("retry-after") or headers.get("Retry-After"))
+    return _DEFAULT_PAUSE_SECONDS if delay is None else delay
+
+
+class Permit:
+    """One admitted request. Call throttle() if the provider answered 429, fail() on other errors."""
+
+    __slots__ = ("retry_after", "failed")
+
+    def __init__(self):
+        self.retry_after: Optional[float] = None
+        self.failed = False
+
+    def throttle(self, retry_after: Optional[float] = None):
+        self.retry_after = _DEFAULT_PAUSE_SECONDS if retry_after is None else retry_after
+
+    def fail(self):
+        self.failed = True
+
+
+class AdaptiveLimiter:
+    """
+    Token bucket plus AIMD concurrency window for one provider. Thread-safe.
+
+    Args:
+        name: Provider name, used in metrics
+        rate: Sustained requests per second the provider allows (0 = unlimited)
+        max_concurrency: Upper bound for the concurrency window
+        latency_target: Calls slower than this shrink the window (None = ignore latency)
+        burst: Bucket capacity, i.e. requests allowed back to back (default: one second's worth)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rate: float,
+        max_concurrency: int,
+        latency_target: Optional[float] = None,
+        burst: Optional[float] = None,
+        min_concurrency: int = 1,
+        decrease_factor: float = 0.5,
+        enabled: bool = True,
+    ):
+        self.name = name
+        self.rate = rate
+        self.capacity = burst or max(1.0, rate)
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_concurrency = max(1, min(min_concurrency, self.max_concurrency))
+        self.latency_target = latency_target
+        self.decrease_factor = decrease_factor
+        self.enabled = enabled
+        self.limit = float(self.max_concurrency)
+        self.in_flight = 0
+        self._tokens = self.capacity
+        self._refilled_at = time.monotonic()
+        self._paused_until = 0.0
+        self._last_decrease = float("-inf")
+        self._latency: Optional[float] = None # Moving average of successful call latency
+        self._cond = threading.Condition()
+        self.requests = 0
+        self.throttled = 0
+        self.wait_seconds = 0.0
+
+    def _refill(self, now: float):
+        if self.rate > 0:
+            self._tokens = min(self.capacity, self._tokens + (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
+
+    def acquire(self):
+        """Blocks until a token and a concurrency slot are available, then takes both."""
+        if not self.enabled:
+            return
+        start = time.monotonic()
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self._paused_until:
+                    timeout = self._paused_until - now
+                elif self.in_flight >= int(self.limit):
+                    timeout = None # Woken by release()
+                elif self.rate > 0 and self._tokens < 1:
+                    timeout = (1 - self._tokens) / self.rate
+                else:
+                    break
+                self._cond.wait(timeout)
+            if self.rate > 0:
+                self._tokens -= 1
+            self.in_flight += 1
+            self.requests += 1
+            self.wait_seconds += time.monotonic() - start
+
+    def release(self, latency: float, retry_after: Optional[float] = None, succeeded: bool = True):
+        """
+        Returns the slot and adapts the window: a throttle pauses the provider and cuts the
+        window, a fast success widens it, and other failures leave it unchanged.
+        """
+        if not self.enabled:
+            return
+        with self._cond:
+            self.in_flight -= 1
+            now = time.monotonic()
+            if retry_after is not None:
+                self.throttled += 1
+                self._paused_until = max(self._paused_until, now + retry_after)
+                self._tokens = 0.0 # Restart slowly once the pause is over
+                self._decrease(now)
+            elif succeeded:
+                self._latency = latency if self._latency is None else 0.8 * self._latency + 0.2 * latency
+                if self.latency_target and latency > self.latency_target:
+                    self._decrease(now)
+                else:
+                    self.limit = min(float(self.max_concurrency), self.limit + 1 / self.limit)
+            self._cond.notify_all()
+
+    def _decrease(self, now: float):
+        # Responses to requests sent before the last cut carry no new information: cut at most once per round trip
+        if now - self._last_decrease < (self._latency or _DEFAULT_PAUSE_SECONDS):
+            return
+        self._last_decrease = now
+        self.limit = max(float(self.min_concurrency), self.limit * self.decrease_factor)
+
+    @contextmanager
+    def request(self):
+        """
+        Holds a slot for one provider call. Usage:
+
+            with limiter.request() as permit:
+                response = session.post(...)
+                if response.status_code == 429:
+                    permit.throttle(retry_after_seconds(response.headers.get("Retry-After")))
+        """
+        wait_start = time.perf_counter()
+        self.acquire()
+        tracer.record("ratelimit.wait", time.perf_counter() - wait_start, provider=self.name)
+        permit = Permit()
+        start = time.perf_counter()
+        succeeded = False
+        try:
+            yield permit
+            succeeded = True
+        finally:
+            self.release(time.perf_counter() - start, permit.retry_after, succeeded and not permit.failed)
+            if permit.retry_after is not None:
+                tracer.count("upsc_throttled_total", provider=self.name)
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "limit": round(self.limit, 2),
+                "in_flight": self.in_flight,
+                "requests": self.requests,
+                "throttled": self.throttled,
+                "wait_s": round(self.wait_seconds, 3),
+            }
+
+
+def limited_call(
+    limiter: AdaptiveLimiter,
+    fn: Callable[[], T],
+    max_retries: int,
+    retryable: Tuple[Type[BaseException], ...] = (),
+    backoff_seconds: float = 1.0,
+) -> T:
+    """
+    Calls `fn` under `limiter`, retrying throttling errors after the provider's
+    Retry-After pause and `retryable` errors after exponential backoff with jitter.
+    """
+    for attempt in range(max_retries + 1):
+        with limiter.request() as permit:
+            try:
+                return fn()
+            except Exception as e:
+                if attempt == max_retries:
+                    raise
+                delay = throttle_delay(e)
+                if delay is not None:
+                    permit.throttle(delay) # The limiter's pause replaces our own backoff
+                    continue
+                if not isinstance(e, retryable):
+                    raise
+                permit.fail()
+        delay = backoff_seconds * (2 ** attempt)
+        time.sleep(delay + random.uniform(0, delay))
+    raise AssertionError("unreachable")
+
+
+def limited_stream(
+    limiter: AdaptiveLimiter,
+    open_stream: Callable[[], Iterator[T]],
+    max_retries: int,
+    retryable: Tuple[Type[BaseException], ...] = (),
+    backoff_seconds: float = 1.0,
+) -> Iterator[T]:
+    """
+    limited_call() for a streamed response: one slot is held until the stream ends.
+    Errors before the first chunk are retried like limited_call(); later ones propagate,
+    since chunks have already been handed to the caller.
+    """
+    for attempt in range(max_retries + 1):
+        started = False
+        with limiter.request() as permit:
+            try:
+                for chunk in open_stream():
+                    started = True
+                    yield chunk
+                return
+            except Exception as e:
+                if started or attempt == max_retries:
+                    raise
+                delay = throttle_delay(e)
+                if delay is not None:
+                    permit.throttle(delay)
+                    continue
+                if not isinstance(e, retryable):
+                    raise
+                permit.fail()
+        delay = backoff_seconds * (2 ** attempt)
+        time.sleep(delay + random.uniform(0, delay))
+
+
+# Shared budgets, one per provider
+PROVIDER_LIMITS = {
+    "serper": dict(rate=SERPER_RATE_LIMIT_RPS, max_concurrency=SERPER_MAX_WORKERS, latency_target=SERPER_LATENCY_TARGET_SECONDS),
+    "anthropic": dict(rate=ANTHROPIC_RATE_LIMIT_RPM / 60, max_concurrency=ANTHROPIC_MAX_CONCURRENCY, latency_target=LLM_LATENCY_TARGET_SECONDS),
+}
+_limiters: Dict[str, AdaptiveLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(provider: str) -> AdaptiveLimiter:
+    """Returns the process-wide limiter for "serper" or "anthropic"."""
+    with _limiters_lock:
+        if provider not in _limiters:
+            _limiters[provider] = AdaptiveLimiter(provider, enabled=RATE_LIMIT_ENABLED, **PROVIDER_LIMITS[provider])
+        return _limiters[provider]
+
+
+def limiter_stats() -> Dict[str, dict]:
+    """Window size, throttles and time spent waiting, per provider used so far."""
+    with _limiters_lock:
+        limiters = dict(_limiters)
+    return {name: limiter.stats() for name, limiter in limiters.items()}
@@ -0,0 +1,229 @@
+# tools/schemas.py
+import json
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Type, TypeVar
+
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, field_validator
+
+try:
+    import orjson
+    _loads = orjson.loads
+    _JSONError = (orjson.JSONDecodeError, ValueError)
+except ImportError:
+    _loads = json.loads
+    _JSONError = (ValueError,)
+
+from knowledge.topic_codes import decode_topics
+
+
+class NewsArticle(BaseModel):
+    """One news article as exchanged between the search tool and the agents."""
+    # Extra keys (e.g. Alternate_Sources) are kept; numbers the model emits for text fields are accepted
+    model_config = ConfigDict(populate_by_name=True, extra="allow", coerce_numbers_to_str=True)
+
+    title: str = Field(default="N/A", alias="Title")
+    source: str = Field(default="N/A", alias="Source")
+    date: str = Field(default="", alias="Date")
+    description: str = Field(default="", alias="Description")
+    url: str = Field(default="", alias="URL")
+
+    @field_validator("title", "source", "date", "description", "url", mode="before")
+    @classmethod
+    def _null_to_empty(cls, value):
+        return "" if value is None else value
+
+    @classmethod
+    def from_serper(cls, article: dict) -> "NewsArticle":
+        """Builds an article from one entry of Serper's 'news' list."""
+        return cls(
+            title=article.get('title') or 'No title available',
+            source=article.get('source') or 'Source not available',
+            date=article.get('date') or 'Date not available',
+            description=article.get('snippet') or 'No description available',
+            url=article.get('link') or 'No URL available',
+        )
+
+    def to_record(self) -> Dict[str, Any]:
+        """Dict with the pipeline's 'Title'/'Source'/... keys."""
+        return self.model_dump(by_alias=True)
+
+
+_CONFIDENCE_WORDS = {"high": 0.9, "medium": 0.6, "low": 0.3}
+
+
+class TaggedArticle(NewsArticle):
+    """Tagger output: topics may arrive as codes, names, or a bare string and are normalized to names."""
+    upsc_topics: List[str] = Field(default_factory=list, alias="UPSC_Topics")
+    confidence: Optional[float] = Field(default=None, alias="Confidence") # Model's self-reported 0-1 confidence, if given
+
+    @field_validator("confidence", mode="before")
+    @classmethod
+    def _parse_confidence(cls, value):
+        if isinstance(value, str):
+            value = _CONFIDENCE_WORDS.get(value.strip().lower(), value.strip().rstrip("%"))
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            return None
+        return value / 100 if value > 1 else value
+
+    @field_validator("upsc_topics", mode="before")
+    @classmethod
+    def _normalize_topics(cls, value):
+        if value is None:
+            return []
+        if isinstance(value, str):
+            value = [part for part in re.split(r"[,;]", value) if part.strip()]
+        return decode_topics(value)
+
+
+class ArticleSummary(BaseModel):
+    """Summarizer output for one article."""
+    model_config = ConfigDict(populate_by_name=True, extra="allow", coerce_numbers_to_str=True)
+
+    title: str = Field(default="N/A", alias="Title")
+    url: str = Field(default="", alias="URL")
+    summary: str = Field(default="", alias="Summary")
+
+    @field_validator("title", "url", "summary", mode="before")
+    @classmethod
+    def _null_to_empty(cls, value):
+        return "" if value is None else value
+
+    def to_record(self) -> Dict[str, Any]:
+        return self.model_dump(by_alias=True)
+
+
+Model = TypeVar("Model", bound=BaseModel)
+
+_FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)```", re.DOTALL)
+_TRAILING_COMMA_RE = re.compile(r",\s*([\]}])")
+_SMART_QUOTES = str.maketrans({"“": '"', "”": '"', "‘": "'", "’": "'"})
+
+
+def _repair(payload: str) -> str:
+    """Fixes the usual LLM JSON slips: smart quotes, trailing commas and a truncated array."""
+    payload = _TRAILING_COMMA_RE.sub(r"\1", payload.translate(_SMART_QUOTES))
+    if payload.startswith("[") and not payload.rstrip().endswith("]"):
+        last_object = payload.rfind("}")
+        payload = (payload[:last_object + 1] if last_object != -1 else "[") + "]"
+    return payload
+
+
+def load_json_payload(text: str) -> Optional[Any]:
+    """
+    Finds and decodes the JSON array (or object) in an LLM response or tool output.
+    Tolerates code fences, surrounding prose and common formatting slips.
+    Returns None when the text contains no JSON.
+    """
+    fenced = _FENCE_RE.search(text)
+    if fenced:
+        text = fenced.group(1)
+    starts = [i for i in (text.find("["), text.find("{")) if i != -1]
+    if not starts:
+        return None
+    start = min(starts)
+    end = text.rfind("]" if text[start] == "[" else "}")
+    payload = text[start:end + 1] if end > start else text[start:]
+    try:
+        return _loads(payload)
+    except _JSONError:
+        pass
+    try:
+        return _loads(_repair(payload))
+    except _JSONError:
+        # Last resort: the first well-formed JSON value anywhere in the text
+        decoder = json.JSONDecoder()
+        for match in re.finditer(r"[\[{]", text):
+            try:
+                return decoder.raw_decode(text, match.start())[0]
+            except json.JSONDecodeError:
+                continue
+    return None
+
+
+def parse_records(text: str, model: Type[Model]) -> List[Model]:
+    """
+    Parses and validates a list of records of `model` from text in one pass.
+    Items that fail validation are skipped rather than failing the whole batch.
+    """
+    payload = load_json_payload(text)
+    if payload is None:
+        return []
+    if isinstance(payload, dict):
+        # Some responses wrap the list, e.g. {"articles": [...]}
+        lists = [value for value in payload.values() if isinstance(value, list)]
+        payload = lists[0] if len(lists) == 1 else [payload]
+    records = []
+    for item in payload:
+        if not isinstance(item, dict):
+            continue
+        try:
+            records.append(model.model_validate(item))
+        except ValidationError:
+            continue
+    return records
+
+
+def match_outputs(inputs: List[Dict], outputs: List[Dict]) -> List[Optional[Dict]]:
+    """
+    Aligns LLM output records with the input articles, matching on URL. An output is
+    taken by position only when it cannot belong to another article (it has no URL, or
+    a URL none of the inputs have), so a dropped or reordered item never attaches one
+    article's result to another.
+
+    Returns:
+        One output per input, or None where the model returned nothing for that article
+    """
+    input_urls = {article.get("URL") for article in inputs if article.get("URL")}
+    by_url = {}
+    for output in outputs:
+        if output.get("URL") in input_urls:
+            by_url.setdefault(output["URL"], output)
+    matched = []
+    for i, article in enumerate(inputs):
+        output = by_url.get(article.get("URL"))
+        if output is None and i < len(outputs) and outputs[i].get("URL") not in input_urls:
+            output = outputs[i]
+        matched.append(output)
+    return matched
+
+
+def iter_streamed_records(chunks: Iterable[str], model: Type[Model]) -> Iterator[Model]:
+    """
+    Like parse_records(), but over a streamed response: each record of `model` is
+    yielded as soon as its JSON object closes, long before the array is complete.
+    A wrapping object (e.g. {"articles": [...]}) only yields its records once it closes.
+    """
+    buffer: List[str] = []
+    depth, in_string, escaped = 0, False, False
+    for chunk in chunks:
+        for char in chunk:
+            if depth:
+                buffer.append(char)
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif char == "\\":
+                    escaped = True
+                elif char == '"':
+                    in_string = False
+            elif char == '"':
+                in_string = depth > 0 # Quotes in prose between objects are not tracked
+            elif char == "{":
+                if not depth:
+                    buffer = ["{"]
+                depth += 1
+            elif char == "}" and depth:
+                depth -= 1
+                if depth:
+                    continue
+                payload = load_json_payload("".join(buffer))
+                if not isinstance(payload, dict):
+                    continue
+                wrapped = [value for value in payload.values() if isinstance(value, list) and value and all(isinstance(item, dict) for item in value)]
+                for item in wrapped[0] if len(wrapped) == 1 else [payload]:
+                    try:
+                        yield model.model_validate(item)
+                    except ValidationError:
+                        continue
@@ -1,13 +1,26 @@
 # tools/search_tools.py
 from crewai.tools import BaseTool
-from typing import Type
+from typing import Dict, List, Optional, Tuple, Type
 from pydantic import BaseModel, Field
-import requests
-import json
-import os
-from dotenv import load_dotenv
+from concurrent.futures import ThreadPoolExecutor
+
+from config.settings import SERPER_MAX_WORKERS, NEWS_SOURCES
+from knowledge.query_planner import planned_articles
+from tools.feed_collector import collect_feeds
+from tools.schemas import NewsArticle
+# The HTTP client lives in tools.serper_client; names are re-exported for existing imports
+from tools.serper_client import (
+    RETRYABLE_STATUS_CODES,
+    SerperRequestError,
+    format_articles,
+    format_news_results,
+    get_serper_session,
+    normalize_query,
+    search_articles,
+    search_news,
+    serper_cache,
+)
 
-load_dotenv()
 
 class NewsSearchInput(BaseModel):
     """Input schema for NewsSearchTool."""
@@ -27,80 +40,113 @@ class NewsSearchTool(BaseTool):
     def _run(self, query: str, country: str = "in", language: str = "en") -> str:
         """
         Search for news articles using Serper API.
-        
+
         Args:
             query: Search query for news articles
             country: Country code (default: "in" for India)
             language: Language code (default: "en" for English)
-            
+
         Returns:
-            Formatted string with news articles information
+            Formatted string with news articles information, followed by the
+            same articles as a JSON list for lossless parsing downstream
         """
         try:
-            # Get API key from environment
-            serper_api_key = os.getenv('SERPER_API_KEY')
-            if not serper_api_key:
-                return "Error: SERPER_API_KEY not found in environment variables."
-
-            # Serper News API endpoint
-            url = "https://google.serper.dev/news"
-            
-            # Headers for the request
-            headers = {
-                'X-API-KEY': serper_api_key,
-                'Content-Type': 'application/json'
-            }
-            
-            # Payload for the request
-            payload = {
-                'q': query,
-                'gl': country,  # Geographic location
-                'hl': language,  # Language
-                'num': 10  # Number of results
-            }
-            
-            # Make the API request
-            response = requests.post(url, headers=headers, data=json.dumps(payload))
-            
-            if response.status_code == 200:
-                data = response.json()
-                return self._format_news_results(data)
-            else:
-                return f"Error: API request failed with status code {response.status_code}"
-                
+            return format_news_results(search_news(query, country, language))
+        except SerperRequestError as e:
+            return f"Error: {e}"
         except Exception as e:
             return f"Error occurred while searching for news: {str(e)}"
 
-    def _format_news_results(self, data: dict) -> str:
+    def search_articles(self, query: str, country: str = "in", language: str = "en") -> List[Dict]:
+        """
+        Search for news articles and return them as structured records.
+
+        Returns:
+            List of dicts with 'Title', 'Source', 'Date', 'Description' and 'URL' keys
+            (the same shape parse_news_result produces); empty on errors
+        """
+        return search_articles(query, country, language)
+
+    def search_many(self, queries: List[Tuple[str, str, str]], max_workers: Optional[int] = None) -> List[str]:
         """
-        Format the news search results into a readable string.
-        
+        Run several news searches concurrently over the pooled session.
+
         Args:
-            data: Raw API response data
-            
+            queries: List of (query, country, language) tuples
+            max_workers: Number of concurrent requests (default: SERPER_MAX_WORKERS)
+
         Returns:
-            Formatted string with news articles
+            Formatted result strings, in the same order as the input queries
         """
-        if 'news' not in data or not data['news']:
-            return "No news articles found for the given query."
-        
-        formatted_results = "UPSC Relevant News Articles:\n" + "="*50 + "\n\n"
-        
-        for i, article in enumerate(data['news'][:10], 1):
-            title = article.get('title', 'No title available')
-            snippet = article.get('snippet', 'No description available')
-            link = article.get('link', 'No URL available')
-            date = article.get('date', 'Date not available')
-            source = article.get('source', 'Source not available')
-            
-            formatted_results += f"{i}. {title}\n"
-            formatted_results += f"   Source: {source}\n"
-            formatted_results += f"   Date: {date}\n"
-            formatted_results += f"   Description: {snippet}\n"
-            formatted_results += f"   URL: {link}\n"
-            formatted_results += "-" * 50 + "\n\n"
-        
-        return formatted_results
-
-# Create an instance of the tool to be used by agents
-upsc_news_search_tool = NewsSearchTool()
\ No newline at end of file
+        if not queries:
+            return []
+        workers = max(1, min(max_workers or SERPER_MAX_WORKERS, len(queries)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(lambda args: self._run(*args), queries))
+
+class NewsFeedInput(BaseModel):
+    """Input schema for NewsFeedTool."""
+    source: str = Field(default="", description=f"Only this source's feeds, one of: {', '.join(NEWS_SOURCES)} (default: all)")
+
+class NewsFeedTool(BaseTool):
+    name: str = "UPSC_News_Feeds"
+    description: str = (
+        "Read the latest articles from the RSS/Atom feeds of the trusted news sources "
+        "(The Hindu, The Indian Express, PIB and others). Returns only articles published "
+        "since the feeds were last read, and costs no search requests, so check it before searching."
+    )
+    args_schema: Type[BaseModel] = NewsFeedInput
+
+    def _run(self, source: str = "") -> str:
+        """
+        Poll the configured news feeds.
+
+        Args:
+            source: Restrict to one source from NEWS_SOURCES (default: all feeds)
+
+        Returns:
+            Formatted string with the new feed articles, in the same format as UPSC_News_Search
+        """
+        try:
+            articles = collect_feeds([source] if source else None)
+        except Exception as e:
+            return f"Error occurred while reading news feeds: {str(e)}"
+        if not articles:
+            return "No new articles in the news feeds since they were last read."
+        return format_articles([NewsArticle.model_validate(article) for article in articles])
+
+class PlannedSearchInput(BaseModel):
+    """Input schema for PlannedSearchTool."""
+    time_range: str = Field(default="", description="Optional recency filter: 'h', 'd', 'w', 'm' or 'y' (default: none)")
+
+class PlannedSearchTool(BaseTool):
+    name: str = "UPSC_Syllabus_Search"
+    description: str = (
+        "Run today's planned news searches over the UPSC syllabus: a fixed budget of queries "
+        "chosen from past results to find the most new articles per search. Use it instead of "
+        "composing your own queries; use UPSC_News_Search only for a specific story it missed."
+    )
+    args_schema: Type[BaseModel] = PlannedSearchInput
+
+    def _run(self, time_range: str = "") -> str:
+        """
+        Plan and run the syllabus searches (knowledge.query_planner).
+
+        Args:
+            time_range: Optional Serper recency filter
+
+        Returns:
+            Formatted string with the found articles, in the same format as UPSC_News_Search
+        """
+        try:
+            articles = planned_articles(time_range=time_range or None)
+        except Exception as e:
+            return f"Error occurred while running the planned searches: {str(e)}"
+        if not articles:
+            return "No news articles found by the planned searches."
+        return format_articles([NewsArticle.model_validate(article) for article in articles])
+
+# Create instances of the tools to be used by agents
+upsc_news_search_tool = NewsSearchTool()
+upsc_news_feed_tool = NewsFeedTool()
+upsc_planned_search_tool = PlannedSearchTool()
@@ -0,0 +1,216 @@
+# tools/serper_client.py
+"""
+Serper news search over a pooled keep-alive session, with retries and an on-disk cache.
+Kept free of agent-framework imports so headless commands can search without loading CrewAI.
+"""
+import json
+import os
+import random
+import threading
+import time
+from typing import Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from dotenv import load_dotenv
+
+from config.settings import (
+    SERPER_API_URL,
+    SERPER_TIMEOUT,
+    SERPER_MAX_RETRIES,
+    SERPER_BACKOFF_SECONDS,
+    SERPER_MAX_WORKERS,
+    SERPER_NUM_RESULTS,
+    CACHE_DIR,
+    SERPER_CACHE_TTL_SECONDS,
+    SERPER_CACHE_MAX_ENTRIES,
+)
+from tools.cache import DiskCache, make_cache_key
+from tools.rate_limit import get_limiter, retry_after_seconds
+from tools.schemas import NewsArticle
+from tools.tracing import tracer
+
+load_dotenv()
+
+# Status codes worth retrying: rate limiting and transient server-side failures
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+_session = None
+_session_lock = threading.Lock()
+
+# Shared across tool instances so every caller benefits from earlier queries
+serper_cache = DiskCache(
+    os.path.join(CACHE_DIR, "serper.sqlite3"),
+    ttl_seconds=SERPER_CACHE_TTL_SECONDS,
+    max_entries=SERPER_CACHE_MAX_ENTRIES,
+)
+
+
+def normalize_query(query: str) -> str:
+    """Lower-cases and collapses whitespace so trivially different queries share a cache entry."""
+    return " ".join(query.lower().split())
+
+
+def get_serper_session() -> requests.Session:
+    """
+    Return the process-wide keep-alive session used for Serper requests.
+
+    The connection pool is sized for SERPER_MAX_WORKERS so batch searches reuse
+    warm TLS connections instead of opening a new one per query.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=SERPER_MAX_WORKERS)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+
+def _cache_key(query: str, country: str, language: str, num_results: int, time_range: Optional[str]) -> str:
+    return make_cache_key("serper-news", normalize_query(query), country, language, num_results, time_range)
+
+
+def is_cached(query: str, country: str = "in", language: str = "en", num_results: int = SERPER_NUM_RESULTS, time_range: Optional[str] = None) -> bool:
+    """True when search_news would answer from the on-disk cache, without a Serper request."""
+    return serper_cache.contains(_cache_key(query, country, language, num_results, time_range))
+
+
+class SerperRequestError(Exception):
+    """Raised when a Serper request fails after all retries."""
+
+
+def search_news(query: str, country: str = "in", language: str = "en", num_results: int = SERPER_NUM_RESULTS, time_range: Optional[str] = None) -> dict:
+    """
+    Fetch the raw Serper response for a query, retrying transient failures.
+    Successful responses are served from the on-disk cache until they expire.
+
+    Args:
+        query: Search query for news articles
+        country: Country code (default: "in" for India)
+        language: Language code (default: "en" for English)
+        num_results: Number of articles to request
+        time_range: Optional recency filter: "h" (past hour), "d" (day), "w" (week), "m" (month) or "y" (year)
+
+    Returns:
+        Parsed JSON response from the Serper API
+
+    Raises:
+        SerperRequestError: If the API key is missing or every attempt failed
+    """
+    with tracer.span("serper.request", query=query) as span:
+        cache_key = _cache_key(query, country, language, num_results, time_range)
+        cached = serper_cache.get(cache_key)
+        span.set(cache_hit=cached is not None)
+        if cached is not None:
+            return cached
+
+        # Get API key from environment
+        serper_api_key = os.getenv('SERPER_API_KEY')
+        if not serper_api_key:
+            raise SerperRequestError("SERPER_API_KEY not found in environment variables.")
+
+        # Headers for the request
+        headers = {
+            'X-API-KEY': serper_api_key,
+            'Content-Type': 'application/json'
+        }
+
+        # Payload for the request
+        payload = {
+            'q': query,
+            'gl': country,  # Geographic location
+            'hl': language,  # Language
+            'num': num_results  # Number of results
+        }
+        if time_range:
+            payload['tbs'] = f"qdr:{time_range}" # Only articles published within the range
+
+        session = get_serper_session()
+        limiter = get_limiter("serper")
+        last_error = "unknown error"
+        throttled = False
+        for attempt in range(SERPER_MAX_RETRIES + 1):
+            if attempt:
+                span.set(retries=attempt)
+                if not throttled:
+                    # Exponential backoff with jitter so concurrent workers don't retry in lockstep;
+                    # after a 429 the limiter already pauses every caller for Retry-After
+                    delay = SERPER_BACKOFF_SECONDS * (2 ** (attempt - 1))
+                    time.sleep(delay + random.uniform(0, delay))
+            throttled = False
+            with limiter.request() as permit:
+                try:
+                    response = session.post(SERPER_API_URL, headers=headers, data=json.dumps(payload), timeout=SERPER_TIMEOUT)
+                except (requests.Timeout, requests.ConnectionError) as e:
+                    permit.fail()
+                    last_error = str(e)
+                    continue
+                if response.status_code == 429:
+                    throttled = True
+                    permit.throttle(retry_after_seconds(response.headers.get("Retry-After")))
+                elif response.status_code != 200:
+                    permit.fail()
+
+            span.set(status=str(response.status_code))
+            if response.status_code == 200:
+                data = response.json()
+                serper_cache.set(cache_key, data)
+                span.set(articles=len(data.get('news') or []))
+                return data
+            last_error = f"API request failed with status code {response.status_code}"
+            if response.status_code not in RETRYABLE_STATUS_CODES:
+                break
+
+        raise SerperRequestError(last_error)
+
+def search_articles(query: str, country: str = "in", language: str = "en", num_results: int = SERPER_NUM_RESULTS, time_range: Optional[str] = None) -> List[Dict]:
+    """
+    Search for news articles and return them as structured records.
+
+    Returns:
+        List of dicts with 'Title', 'Source', 'Date', 'Description' and 'URL' keys
+        (the same shape parse_news_result produces); empty on errors
+    """
+    try:
+        data = search_news(query, country, language, num_results, time_range)
+    except Exception as e:
+        print(f"❌ News search failed for '{query}': {e}")
+        return []
+    return [NewsArticle.from_serper(article).to_record() for article in data.get('news') or []]
+
+
+def format_news_results(data: dict) -> str:
+    """
+    Format the news search results into a readable string.
+
+    Args:
+        data: Raw API response data
+
+    Returns:
+        Formatted string with news articles
+    """
+    if 'news' not in data or not data['news']:
+        return "No news articles found for the given query."
+    return format_articles([NewsArticle.from_serper(article) for article in data['news']])
+
+
+def format_articles(articles: List[NewsArticle]) -> str:
+    """Formats articles (from search or feeds) the way the search tool reports them to the agent."""
+    formatted_results = "UPSC Relevant News Articles:\n" + "="*50 + "\n\n"
+
+    for i, article in enumerate(articles, 1):
+        formatted_results += f"{i}. {article.title}\n"
+        formatted_results += f"   Source: {article.source}\n"
+        formatted_results += f"   Date: {article.date}\n"
+        formatted_results += f"   Description: {article.description}\n"
+        formatted_results += f"   URL: {article.url}\n"
+        formatted_results += "-" * 50 + "\n\n"
+
+    # Machine-readable copy: pass this list on verbatim so later agents get typed records
+    records = json.dumps([article.to_record() for article in articles], ensure_ascii=False)
+    formatted_results += f"Structured results (JSON):\n```json\n{records}\n```\n"
+    return formatted_results
@@ -0,0 +1,206 @@
+# tools/tracing.py
+"""
+Lightweight spans and metrics for the pipeline's hot paths (Serper requests, LLM calls,
+pipeline stages and queue waits).
+
+Spans are buffered in memory and written as JSON lines by flush(); every finished span
+also feeds Prometheus-style counters and latency histograms (prometheus_snapshot()).
+When tracing is disabled, span() returns a shared no-op object, so instrumented code
+pays one attribute check per call.
+"""
+import json
+import os
+import threading
+import time
+import uuid
+from collections import defaultdict
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+
+from config.settings import TRACING_ENABLED, TRACE_DIR
+
+# Latency histogram buckets, in seconds
+_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+_MAX_BUFFERED_SPANS = 10000 # Beyond this the buffer is flushed to the trace file automatically
+# String attributes that become metric labels (besides the span name)
+_LABEL_KEYS = ("agent", "stage", "task", "provider")
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+
+class Span:
+    """One timed operation. Use as a context manager; add attributes with set()."""
+
+    __slots__ = ("tracer", "name", "attributes", "span_id", "parent_id", "start", "duration", "error", "_token", "_t0")
+
+    def __init__(self, tracer: "Tracer", name: str, attributes: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.attributes = attributes
+        self.span_id = uuid.uuid4().hex[:16]
+        parent = _current_span.get()
+        self.parent_id = parent.span_id if parent is not None else None
+        self.error: Optional[str] = None
+        self.duration = 0.0
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+        return self
+
+    def __enter__(self):
+        self._token = _current_span.set(self)
+        self.start = time.time()
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration = time.perf_counter() - self._t0
+        _current_span.reset(self._token)
+        if exc is not None:
+            self.error = f"{exc_type.__name__}: {exc}"
+        self.tracer._finish(self)
+        return False
+
+
+class _NoopSpan:
+    """Returned by a disabled tracer: every operation is a no-op."""
+
+    __slots__ = ()
+
+    def set(self, **attributes):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Tracer:
+    """Collects spans and the metrics derived from them. Thread-safe."""
+
+    def __init__(self, enabled: bool = TRACING_ENABLED, trace_dir: str = TRACE_DIR):
+        self.enabled = enabled
+        self.trace_dir = trace_dir
+        self.path: Optional[str] = None # This process's trace file, created on the first flush
+        self._lock = threading.Lock()
+        self._spans: List[Dict[str, Any]] = []
+        self._histograms: Dict[Tuple, List[float]] = {} # (span, labels) -> [bucket counts..., count, sum]
+        self._counters: Dict[Tuple, float] = defaultdict(float) # (metric, labels) -> value
+
+    def span(self, name: str, **attributes):
+        """Starts a span; returns a no-op when tracing is disabled."""
+        if not self.enabled:
+            return NOOP_SPAN
+        return Span(self, name, attributes)
+
+    def record(self, name: str, duration: float, **attributes):
+        """Records an already measured operation (e.g. a queue wait) as a span."""
+        if not self.enabled:
+            return
+        span = Span(self, name, attributes)
+        span.start = time.time() - duration
+        span.duration = duration
+        self._finish(span)
+
+    def count(self, metric: str, value: float = 1.0, **labels):
+        """Increments a counter that is not tied to a span (e.g. cache lookups)."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[(metric, tuple(sorted(labels.items())))] += value
+
+    def _finish(self, span: Span):
+        labels = tuple((key, span.attributes[key]) for key in _LABEL_KEYS if isinstance(span.attributes.get(key), str))
+        record = {
+            "name": span.name,
+            "span_id": span.span_id,
+            "parent_id": span.parent_id,
+            "start": round(span.start, 6),
+            "duration_ms": round(span.duration * 1000, 3),
+            "attributes": span.attributes,
+        }
+        if span.error:
+            record["error"] = span.error
+        with self._lock:
+            self._spans.append(record)
+            histogram = self._histograms.setdefault((span.name, labels), [0] * (len(_BUCKETS) + 2))
+            for i, bound in enumerate(_BUCKETS):
+                if span.duration <= bound:
+                    histogram[i] += 1
+            histogram[-2] += 1
+            histogram[-1] += span.duration
+            if span.error:
+                self._counters[("upsc_span_errors_total", (("span", span.name),) + labels)] += 1
+            # Numeric attributes (tokens, retries, ...) become counters; True flags count occurrences
+            for key, value in span.attributes.items():
+                if isinstance(value, bool):
+                    if value:
+                        self._counters[(f"upsc_{key}_total", (("span", span.name),) + labels)] += 1
+                elif isinstance(value, (int, float)):
+                    self._counters[(f"upsc_{key}_total", (("span", span.name),) + labels)] += value
+            buffered = len(self._spans)
+        if buffered >= _MAX_BUFFERED_SPANS:
+            self.flush()
+
+    def flush(self, path: Optional[str] = None) -> Optional[str]:
+        """
+        Appends the buffered spans to a JSON-lines trace file and clears the buffer.
+        Without `path`, every flush of this process goes to one timestamped file in the trace dir.
+
+        Returns:
+            The file written, or None when there was nothing to write
+        """
+        with self._lock:
+            spans, self._spans = self._spans, []
+        if not spans:
+            return None
+        if path is None:
+            if self.path is None:
+                os.makedirs(self.trace_dir, exist_ok=True)
+                self.path = os.path.join(self.trace_dir, f"trace-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.jsonl")
+            path = self.path
+        with open(path, "a", encoding="utf-8") as f:
+            for record in spans:
+                f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        return path
+
+    def prometheus_snapshot(self) -> str:
+        """Current metrics in the Prometheus text exposition format."""
+        def render(labels) -> str:
+            return ",".join(f'{key}="{str(value)}"' for key, value in labels)
+
+        lines = ["# TYPE upsc_span_duration_seconds histogram"]
+        with self._lock:
+            histograms = {key: list(values) for key, values in self._histograms.items()}
+            counters = dict(self._counters)
+        for (name, labels), values in sorted(histograms.items()):
+            base = render((("span", name),) + labels)
+            for bound, count in zip(_BUCKETS, values):
+                lines.append(f'upsc_span_duration_seconds_bucket{{{base},le="{bound}"}} {count}')
+            lines.append(f'upsc_span_duration_seconds_bucket{{{base},le="+Inf"}} {values[-2]}')
+            lines.append(f"upsc_span_duration_seconds_count{{{base}}} {values[-2]}")
+            lines.append(f"upsc_span_duration_seconds_sum{{{base}}} {values[-1]:.6f}")
+        typed = set()
+        for (metric, labels), value in sorted(counters.items()):
+            if metric not in typed:
+                lines.append(f"# TYPE {metric} counter")
+                typed.add(metric)
+            lines.append(f"{metric}{{{render(labels)}}} {value:g}")
+        return "\n".join(lines) + "\n"
+
+    def write_snapshot(self, path: Optional[str] = None) -> str:
+        """Writes prometheus_snapshot() to `path` (default: <trace dir>/metrics.prom)."""
+        path = path or os.path.join(self.trace_dir, "metrics.prom")
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.prometheus_snapshot())
+        return path
+
+
+# Process-wide tracer used by the instrumented modules
+tracer = Tracer()